@@ -10,6 +10,9 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
         DrawSlotsButton              matlab.ui.control.Button
         SaveSlotsButton              matlab.ui.control.Button
         RunDetectionButton           matlab.ui.control.Button
+        FastDetectionCheckBox        matlab.ui.control.CheckBox
+        DetectionStatusLabel         matlab.ui.control.Label
+        CancelDetectionButton        matlab.ui.control.Button
         ExportPanel                  matlab.ui.container.Panel
         SaveSnapshotpngButton        matlab.ui.control.Button
         ExportResultscsvButton       matlab.ui.control.Button
@@ -34,13 +37,41 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
     
     properties (Access = private)
         img % Property to store the loaded image
+        grayImg % Gray copy of img, converted once on load for detection
         slots % Property to store the slot coordinates
+        slotRotation % Rotation of each slot in degrees, clockwise
         
-        % Properties for storing intermediate images
-        cannyImage 
-        morphImage 
+        % Pixel lists of the slots (compileSlotMasks), compiled when
+        % rotated slots are loaded or drawn; empty for upright slots
+        slotMasks
+        
+        % Canny and closing maps at display resolution, built only when a
+        % diagnostic view is selected
+        diagnosticViews
         
         lastDetectionResults % Store results to redraw without re-calculating
+        
+        % Thresholds lastDetectionResults can be reclassified at without
+        % losing full-resolution accuracy: all of them after a full run,
+        % only the refined band around the run's threshold after a fast
+        % (pyramid) run, whose other densities are coarse estimates
+        exactRange = [-Inf Inf]
+        fastBand = 0.02 % UncertaintyBand of fast runs
+        
+        % Annotated RGB image of lastDetectionResults, rendered once per
+        % result and reused for redraws and snapshots
+        detectionOverlay
+        
+        % On-disk cache of slot densities, so re-running detection on the
+        % same image and slots skips Canny and closing
+        resultCache
+        
+        % Background detection: the running future, whether a newer
+        % request waits for it to end, and the ID of the newest request,
+        % which progress messages of older runs no longer match
+        detectionFuture
+        detectionPending = false
+        detectionId = 0
     end
     
     methods (Access = private)
@@ -51,31 +82,280 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
                 return;
             end
             
-            imshow(app.img, 'Parent', app.UIAxes);
-            hold(app.UIAxes, 'on');
+            % Outlines and labels are burned into one image, so the axes
+            % hold a single graphics object whatever the slot count
+            imshow(annotatedImage(app), 'Parent', app.UIAxes);
             app.UIAxes.Title.String = 'Detection Result';
+        end
+        
+        % Returns the annotated detection image, rendering it on first use
+        % after the results changed
+        function overlay = annotatedImage(app)
+            if isempty(app.detectionOverlay)
+                app.detectionOverlay = renderDetectionOverlay(app.img, app.lastDetectionResults, ...
+                    'Masks', app.slotMasks);
+            end
+            overlay = app.detectionOverlay;
+        end
+        
+        % Stores a slot layout and compiles the masks of rotated slots
+        % once, so every detection run scores them in a single pass.
+        % Results of the previous layout are dropped, so the threshold
+        % slider and the detection view never show them for the new one.
+        function setSlots(app, slots, rotation)
+            cancelDetection(app);
+            app.lastDetectionResults = [];
+            app.detectionOverlay = [];
+            app.slots = slots;
+            app.slotRotation = rotation;
+            if any(rotation ~= 0)
+                app.slotMasks = compileSlotMasks(slots, size(app.img), 'Rotation', rotation);
+            else
+                app.slotMasks = [];
+            end
+        end
+        
+        % Slots as passed to detectParkingSlots
+        function slots = detectionSlots(app)
+            if isempty(app.slotMasks)
+                slots = app.slots;
+            else
+                slots = app.slotMasks;
+            end
+        end
+        
+        % Name-value options of a detection run with the current settings
+        function options = detectionOptions(app)
+            % Fast detection runs Canny on a downscaled image and only
+            % re-scores slots near the threshold at full resolution;
+            % rotated slots always use the full-resolution masks
+            preprocess = 'full';
+            if app.FastDetectionCheckBox.Value && isempty(app.slotMasks)
+                preprocess = 'pyramid';
+            end
+            options = {'Threshold', app.ThresholdSlider.Value, 'Preprocess', preprocess, ...
+                'UncertaintyBand', app.fastBand};
+        end
+        
+        % Stores the thresholds the densities of a finished run classify
+        % exactly, from the run's threshold and INFO
+        function setExactRange(app, threshold, info)
+            app.exactRange = [-Inf Inf];
+            if isfield(info, 'pyramidScale') && info.pyramidScale < 1
+                app.exactRange = threshold + [-1 1] * app.fastBand;
+            end
+        end
+        
+        % Queues a detection run on a background worker. A request made
+        % while a run is in flight cancels that run, and only the newest
+        % request is started once it has ended, so repeated clicks never
+        % queue up stale runs. Without a worker pool the run blocks.
+        function requestDetection(app)
+            app.detectionId = app.detectionId + 1;
+            if isempty(detectionPool(app))
+                runDetectionInPlace(app);
+                return;
+            end
             
-            for i = 1:numel(app.lastDetectionResults)
-                res = app.lastDetectionResults(i);
-                rectangle(app.UIAxes, 'Position', res.rect, 'EdgeColor', res.color, 'LineWidth', 2.5);
-                
-                text(app.UIAxes, res.rect(1) + 5, res.rect(2) - 15, sprintf('Slot %d: %s', i, res.status), ...
-                    'Color', 'k', 'FontSize', 10, 'FontWeight', 'bold', 'BackgroundColor', res.color);
+            app.detectionPending = true;
+            if isempty(app.detectionFuture)
+                startDetection(app);
+            else
+                cancel(app.detectionFuture);
+                app.DetectionStatusLabel.Text = 'Restarting detection...';
+            end
+        end
+        
+        % Starts the newest requested run on the worker pool
+        function startDetection(app)
+            app.detectionPending = false;
+            [pool, cache] = detectionPool(app);
+            
+            % Stage and slot-batch progress is sent back from the worker
+            id = app.detectionId;
+            queue = parallel.pool.DataQueue;
+            afterEach(queue, @(progress) showDetectionProgress(app, id, progress));
+            progressFcn = @(stage, fraction) send(queue, struct('stage', stage, 'fraction', fraction));
+            
+            threshold = app.ThresholdSlider.Value;
+            options = detectionOptions(app);
+            app.detectionFuture = parfeval(pool, @detectParkingSlots, 3, app.grayImg, detectionSlots(app), ...
+                options{:}, 'Cache', cache, 'ProgressFcn', progressFcn);
+            afterAll(app.detectionFuture, @(future) detectionFinished(app, future, threshold), 0, 'PassFuture', true);
+            
+            app.CancelDetectionButton.Enable = 'on';
+            app.DetectionStatusLabel.Text = 'Detecting: starting (0%)';
+        end
+        
+        % Completion callback of a background run
+        function detectionFinished(app, future, threshold)
+            % Runs cancelled by a reset are no longer tracked
+            if isempty(app.detectionFuture) || app.detectionFuture.ID ~= future.ID
+                return;
+            end
+            app.detectionFuture = [];
+            
+            % A newer request supersedes this run, finished or cancelled
+            if app.detectionPending
+                startDetection(app);
+                return;
+            end
+            
+            app.CancelDetectionButton.Enable = 'off';
+            if ~isempty(future.Error)
+                app.DetectionStatusLabel.Text = 'Detection failed';
+                uialert(app.UIFigure, ['An error occurred during detection: ' future.Error.message], 'Processing Error');
+                return;
+            end
+            
+            % The slider may have moved while the run was in flight; past
+            % the exact range of a fast run, detect again at its value
+            [results, ~, info] = fetchOutputs(future);
+            setExactRange(app, threshold, info);
+            app.lastDetectionResults = results;
+            app.DetectionStatusLabel.Text = 'Detection done';
+            reclassifyDetection(app);
+        end
+        
+        % Shows a progress message of the current run
+        function showDetectionProgress(app, id, progress)
+            if id == app.detectionId && ~isempty(app.detectionFuture)
+                app.DetectionStatusLabel.Text = sprintf('Detecting: %s (%d%%)', ...
+                    progress.stage, round(100 * progress.fraction));
+            end
+        end
+        
+        % Cancels the running detection and any request waiting for it
+        function cancelDetection(app)
+            app.detectionPending = false;
+            app.detectionId = app.detectionId + 1;
+            if ~isempty(app.detectionFuture)
+                cancel(app.detectionFuture);
+                app.detectionFuture = [];
+            end
+            app.CancelDetectionButton.Enable = 'off';
+            app.DetectionStatusLabel.Text = '';
+        end
+        
+        % Pool detection runs on: a running process pool, which can use
+        % the result cache, or else backgroundPool, whose thread workers
+        % have no Java for the cache's hashing. Empty when neither exists.
+        function [pool, cache] = detectionPool(app)
+            pool = [];
+            cache = [];
+            if license('test', 'Distrib_Computing_Toolbox') && ~isempty(ver('parallel'))
+                pool = gcp('nocreate');
+            end
+            if ~isempty(pool) && ~isa(pool, 'parallel.ThreadPool')
+                cache = app.resultCache;
+            elseif exist('backgroundPool', 'file') > 0
+                pool = backgroundPool;
+            end
+        end
+        
+        % Runs detection in this session behind a cancellable progress
+        % dialog, for MATLAB releases without backgroundPool
+        function runDetectionInPlace(app)
+            d = uiprogressdlg(app.UIFigure, 'Title', 'Please Wait', ...
+                'Message', 'Processing Image...', 'Cancelable', 'on');
+            threshold = app.ThresholdSlider.Value;
+            options = detectionOptions(app);
+            
+            try
+                % --- Image Processing Pipeline ---
+                [results, summary, info] = detectParkingSlots(app.grayImg, detectionSlots(app), ...
+                    options{:}, 'Cache', app.resultCache, ...
+                    'ProgressFcn', @(stage, fraction) updateProgressDialog(d, stage, fraction));
 
-                text(app.UIAxes, res.rect(1) + 5, res.rect(2) + 15, sprintf('D: %.3f', res.density), ...
-                    'Color', 'k', 'FontSize', 9, 'FontWeight', 'bold', 'BackgroundColor', 'y');
+                setExactRange(app, threshold, info);
+                app.lastDetectionResults = results;
+                showDetectionResults(app, summary);
+
+            catch ME
+                if ~strcmp(ME.identifier, 'ParkingDetectorPro:cancelled')
+                    uialert(app.UIFigure, ['An error occurred during detection: ' ME.message], 'Processing Error');
+                end
             end
-            hold(app.UIAxes, 'off');
+            
+            % Close the progress bar
+            close(d);
+        end
+        
+        % Fills the results table, summary panel and pie chart from
+        % lastDetectionResults and switches to the final detection view
+        function showDetectionResults(app, summary)
+            % --- Populate Results Table ---
+            app.ResultsTable.Data = slotResultsTable(app.lastDetectionResults);
+
+            % --- Update Summary Panel ---
+            occupiedCount = summary.occupied;
+            emptyCount = summary.empty;
+            app.OccupiedSlotsLabel.Text = sprintf('Occupied Slots: %d', occupiedCount);
+            app.EmptySlotsLabel.Text = sprintf('Empty Slots: %d', emptyCount);
+            app.OccupancyRateLabel.Text = sprintf('Occupancy Rate: %.1f%%', summary.occupancyRate);
+
+            % --- Draw Pie Chart ---
+            pieData = [occupiedCount emptyCount];
+            if all(pieData == 0); pieData = [1 1]; end % Handle case with 0 slots
+            p = pie(app.SummaryPieAxes, pieData);
+            app.SummaryPieAxes.Title.String = 'Occupancy Summary';
+
+            % Make pie chart labels smaller
+            p(2).FontSize = 8;
+            p(4).FontSize = 8;
+
+            % --- Enable Export Buttons ---
+            app.SaveSnapshotpngButton.Enable = 'on';
+            app.ExportResultscsvButton.Enable = 'on';
+
+            % Switch view to show the result immediately
+            app.detectionOverlay = [];
+            app.ViewSelectorDropDown.Value = 'Final Detection';
+            updateDetectionDisplay(app);
+        end
+
+        % Re-applies the threshold to the cached slot densities without
+        % re-running Canny and closing, or detects again when the
+        % threshold left the range the densities are exact for
+        function reclassifyDetection(app)
+            threshold = app.ThresholdSlider.Value;
+            if threshold < app.exactRange(1) || threshold > app.exactRange(2)
+                requestDetection(app);
+                return;
+            end
+            res = app.lastDetectionResults;
+            [results, summary] = classifySlots(res.rect, res.density, threshold);
+            app.lastDetectionResults = results;
+            showDetectionResults(app, summary);
+        end
+        
+        % Returns the Canny or closing map of the loaded image for a
+        % diagnostic view. The maps are computed on first use and kept only
+        % at the resolution of the axes.
+        function view = diagnosticImage(app, name)
+            if isempty(app.diagnosticViews)
+                [~, cannyImage, morphImage] = parkingPreprocess(app.grayImg);
+                axesSize = app.UIAxes.InnerPosition([4 3]);
+                factor = max(1, floor(min(size(cannyImage) ./ axesSize)));
+                app.diagnosticViews.canny = downsampleEdgeMap(cannyImage, factor);
+                app.diagnosticViews.morph = downsampleEdgeMap(morphImage, factor);
+            end
+            view = app.diagnosticViews.(name);
         end
         
         % Resets all data and UI elements to initial state
         function resetAppState(app)
+            cancelDetection(app);
+            
             % Clear data properties
             app.img = [];
+            app.grayImg = [];
             app.slots = [];
-            app.cannyImage = [];
-            app.morphImage = [];
+            app.slotRotation = [];
+            app.slotMasks = [];
+            app.diagnosticViews = [];
             app.lastDetectionResults = [];
+            app.detectionOverlay = [];
 
             % Reset UI components
             cla(app.UIAxes);
@@ -92,6 +372,7 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
             app.DrawSlotsButton.Enable = 'off';
             app.LoadSlotsButton.Enable = 'off';
             app.RunDetectionButton.Enable = 'off';
+            app.FastDetectionCheckBox.Enable = 'off';
             app.SaveSlotsButton.Enable = 'off';
             app.ViewSelectorDropDown.Enable = 'off';
             app.SaveSnapshotpngButton.Enable = 'off';
@@ -108,6 +389,7 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
             app.ThresholdValueLabel.Text = num2str(app.ThresholdSlider.Value);
             cla(app.SummaryPieAxes); % Clear sample pie chart
             app.SummaryPieAxes.Title.String = 'Summary';
+            app.resultCache = ParkingResultCache(fullfile(tempdir, 'parking_cache'));
         end
 
         % Button pushed function: LoadImageButton
@@ -119,12 +401,18 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
             
             try
                 app.img = imread(fullfile(pathname, filename));
+                if size(app.img, 3) == 3
+                    app.grayImg = rgb2gray(app.img);
+                else
+                    app.grayImg = app.img;
+                end
                 imshow(app.img, 'Parent', app.UIAxes);
                 app.UIAxes.Title.String = 'Image Loaded';
                 
                 app.DrawSlotsButton.Enable = 'on';
                 app.LoadSlotsButton.Enable = 'on';
                 app.RunDetectionButton.Enable = 'on';
+                app.FastDetectionCheckBox.Enable = 'on';
                 app.ViewSelectorDropDown.Enable = 'on';
                 app.ViewSelectorDropDown.Value = 'Original Image';
 
@@ -138,17 +426,26 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
         function LoadSlotsButtonPushed(app, event)
             if isempty(app.img); uialert(app.UIFigure, 'Please load an image first.', 'Error'); return; end
             
-            [filename, pathname] = uigetfile({'*.mat'}, 'Select slots.mat file');
+            [filename, pathname] = uigetfile({'*.mat;*.pslot', 'Slot Files (*.mat, *.pslot)'}, 'Select slots file');
             if isequal(filename, 0); return; end
             
-            load(fullfile(pathname, filename), 'slots');
-            app.slots = slots;
+            try
+                [slots, rotation] = loadSlots(fullfile(pathname, filename)); %#ok<PROPLC>
+                setSlots(app, slots, rotation);
+            catch ME
+                uialert(app.UIFigure, ['Error loading slots: ' ME.message], 'Slots Error');
+                return;
+            end
             
             imshow(app.img, 'Parent', app.UIAxes);
             app.UIAxes.Title.String = 'Loaded Slots';
             hold(app.UIAxes, 'on');
-            for i = 1:size(app.slots, 1)
-                rectangle(app.UIAxes, 'Position', app.slots(i,:), 'EdgeColor', 'y', 'LineWidth', 2);
+            % All outlines as one patch object
+            if ~isempty(app.slots)
+                corners = slotPolygons(app.slots, app.slotRotation);
+                corners = cat(3, corners{:});
+                patch(app.UIAxes, squeeze(corners(:,1,:)), squeeze(corners(:,2,:)), 'y', ...
+                    'FaceColor', 'none', 'EdgeColor', 'y', 'LineWidth', 2);
             end
             hold(app.UIAxes, 'off');
             
@@ -166,16 +463,19 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
             nSlots = str2double(answer{1});
             if isnan(nSlots) || nSlots < 1; return; end
             
-            app.slots = zeros(nSlots, 4);
+            slots = zeros(nSlots, 4); %#ok<PROPLC>
+            rotation = zeros(nSlots, 1);
             
             hold(app.UIAxes, 'on');
             for i = 1:nSlots
                 app.UIAxes.Title.String = sprintf('Draw Slot %d of %d', i, nSlots);
-                h = drawrectangle(app.UIAxes, 'Color', 'y', 'LineWidth', 2);
+                h = drawrectangle(app.UIAxes, 'Color', 'y', 'LineWidth', 2, 'Rotatable', true);
                 wait(h);
-                app.slots(i,:) = h.Position;
+                slots(i,:) = h.Position;
+                rotation(i) = h.RotationAngle;
             end
             hold(app.UIAxes, 'off');
+            setSlots(app, slots, rotation);
             
             app.UIAxes.Title.String = 'Slots Defined';
             app.SaveSlotsButton.Enable = 'on';
@@ -185,11 +485,19 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
         function SaveSlotsButtonPushed(app, event)
             if isempty(app.slots); uialert(app.UIFigure, 'No slots to save.', 'Error'); return; end
             
-            [filename, pathname] = uiputfile('slots.mat', 'Save Slot Data');
+            [filename, pathname] = uiputfile({'*.mat', 'MAT-file (*.mat)'; ...
+                '*.pslot', 'Slot Layout (*.pslot)'}, 'Save Slot Data', 'slots.mat');
             if isequal(filename, 0); return; end
             
-            slots = app.slots; %#ok<PROPLC>
-            save(fullfile(pathname, filename), 'slots');
+            [~, lotID, ext] = fileparts(filename);
+            if strcmpi(ext, '.pslot')
+                saveSlotLayout(fullfile(pathname, filename), app.slots, 'Rotation', app.slotRotation, ...
+                    'LotID', lotID, 'ImageSize', [size(app.img, 1) size(app.img, 2)]);
+            else
+                slots = app.slots; %#ok<PROPLC>
+                rotation = app.slotRotation;
+                save(fullfile(pathname, filename), 'slots', 'rotation');
+            end
         end
 
         % Button pushed function: RunDetectionButton
@@ -199,81 +507,13 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
                 return;
             end
             
-            % --- Progress Bar ---
-            d = uiprogressdlg(app.UIFigure, 'Title', 'Please Wait', ...
-                'Message', 'Processing Image...', 'Indeterminate', 'on');
-            
-            try
-                % --- Image Processing Pipeline ---
-                gray = rgb2gray(app.img);
-                app.cannyImage = edge(gray, 'canny', [0.1 0.2], 'both');
-                se = strel('rectangle', [3 3]);
-                app.morphImage = imclose(app.cannyImage, se);
-                
-                occupiedCount = 0;
-                density_threshold = app.ThresholdSlider.Value;
-                results(size(app.slots, 1)) = struct('rect', [], 'density', [], 'status', '', 'color', '');
-                
-                for i = 1:size(app.slots, 1)
-                    rect = app.slots(i,:);
-                    ROI = imcrop(app.morphImage, rect);
-                    
-                    white_pixels = sum(ROI(:));
-                    slot_area = rect(3) * rect(4);
-                    edge_density = white_pixels / slot_area;
-                    
-                    if edge_density > density_threshold
-                        status = 'Occupied';
-                        color = 'r';
-                        occupiedCount = occupiedCount + 1;
-                    else
-                        status = 'Empty';
-                        color = 'g';
-                    end
-                    results(i) = struct('rect', rect, 'density', edge_density, 'status', status, 'color', color);
-                end
-                
-                app.lastDetectionResults = results;
-                
-                % --- Populate Results Table ---
-                slotID = (1:size(app.slots,1))';
-                status = {app.lastDetectionResults.status}';
-                density = [app.lastDetectionResults.density]';
-                T = table(slotID, status, density);
-                app.ResultsTable.Data = T;
-                
-                % --- Update Summary Panel ---
-                totalSlots = size(app.slots, 1);
-                emptyCount = totalSlots - occupiedCount;
-                occupancyRate = (occupiedCount / totalSlots) * 100;
-                app.OccupiedSlotsLabel.Text = sprintf('Occupied Slots: %d', occupiedCount);
-                app.EmptySlotsLabel.Text = sprintf('Empty Slots: %d', emptyCount);
-                app.OccupancyRateLabel.Text = sprintf('Occupancy Rate: %.1f%%', occupancyRate);
-                
-                % --- Draw Pie Chart ---
-                pieData = [occupiedCount emptyCount];
-                if all(pieData == 0); pieData = [1 1]; end % Handle case with 0 slots
-                p = pie(app.SummaryPieAxes, pieData);
-                app.SummaryPieAxes.Title.String = 'Occupancy Summary';
-                
-                % Make pie chart labels smaller
-                p(2).FontSize = 8;
-                p(4).FontSize = 8;
-                
-                % --- Enable Export Buttons ---
-                app.SaveSnapshotpngButton.Enable = 'on';
-                app.ExportResultscsvButton.Enable = 'on';
-
-                % Switch view to show the result immediately
-                app.ViewSelectorDropDown.Value = 'Final Detection';
-                updateDetectionDisplay(app);
+            requestDetection(app);
+        end
 
-            catch ME
-                uialert(app.UIFigure, ['An error occurred during detection: ' ME.message], 'Processing Error');
-            end
-            
-            % Close the progress bar
-            close(d);
+        % Button pushed function: CancelDetectionButton
+        function CancelDetectionButtonPushed(app, event)
+            cancelDetection(app);
+            app.DetectionStatusLabel.Text = 'Detection cancelled';
         end
 
         % Value changed function: ThresholdSlider
@@ -282,7 +522,7 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
             app.ThresholdValueLabel.Text = sprintf('%.3f', value);
             
             if ~isempty(app.lastDetectionResults)
-                RunDetectionButtonPushed(app, event);
+                reclassifyDetection(app);
             end
         end
 
@@ -294,9 +534,9 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
                 case 'Original Image'
                     if ~isempty(app.img); imshow(app.img, 'Parent', app.UIAxes); app.UIAxes.Title.String = 'Original Image'; end
                 case 'Canny Edges'
-                    if ~isempty(app.cannyImage); imshow(app.cannyImage, 'Parent', app.UIAxes); app.UIAxes.Title.String = 'Canny Edge Detection'; end
+                    if ~isempty(app.img); imshow(diagnosticImage(app, 'canny'), 'Parent', app.UIAxes); app.UIAxes.Title.String = 'Canny Edge Detection'; end
                 case 'Morphological Result'
-                    if ~isempty(app.morphImage); imshow(app.morphImage, 'Parent', app.UIAxes); app.UIAxes.Title.String = 'After Morphological Closing'; end
+                    if ~isempty(app.img); imshow(diagnosticImage(app, 'morph'), 'Parent', app.UIAxes); app.UIAxes.Title.String = 'After Morphological Closing'; end
                 case 'Final Detection'
                     if ~isempty(app.lastDetectionResults); updateDetectionDisplay(app); end
             end
@@ -308,7 +548,15 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
             if isequal(file, 0); return; end
             
             try
-                exportgraphics(app.UIAxes, fullfile(path, file));
+                % Write the shown image at full resolution; the detection
+                % view uses the same annotated image as the display
+                if strcmp(app.ViewSelectorDropDown.Value, 'Final Detection') && ~isempty(app.lastDetectionResults)
+                    snapshot = annotatedImage(app);
+                else
+                    shown = findobj(app.UIAxes, 'Type', 'image');
+                    snapshot = shown(1).CData;
+                end
+                imwrite(snapshot, fullfile(path, file));
             catch ME
                 uialert(app.UIFigure, ['Error saving image: ' ME.message], 'Export Error');
             end
@@ -396,6 +644,24 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
             app.RunDetectionButton.Position = [30 410 141 45];
             app.RunDetectionButton.Text = '4. Run Detection';
 
+            % Create FastDetectionCheckBox
+            app.FastDetectionCheckBox = uicheckbox(app.LeftPanel);
+            app.FastDetectionCheckBox.Enable = 'off';
+            app.FastDetectionCheckBox.Position = [30 375 150 22];
+            app.FastDetectionCheckBox.Text = 'Fast detection (pyramid)';
+
+            % Create DetectionStatusLabel
+            app.DetectionStatusLabel = uilabel(app.LeftPanel);
+            app.DetectionStatusLabel.Position = [15 340 170 22];
+            app.DetectionStatusLabel.Text = '';
+
+            % Create CancelDetectionButton
+            app.CancelDetectionButton = uibutton(app.LeftPanel, 'push');
+            app.CancelDetectionButton.ButtonPushedFcn = createCallbackFcn(app, @CancelDetectionButtonPushed, true);
+            app.CancelDetectionButton.Enable = 'off';
+            app.CancelDetectionButton.Position = [30 300 141 30];
+            app.CancelDetectionButton.Text = 'Cancel Detection';
+
             % Create ExportPanel
             app.ExportPanel = uipanel(app.LeftPanel);
             app.ExportPanel.Title = 'Export';
@@ -546,8 +812,21 @@ classdef ParkingDetectorPro < matlab.apps.AppBase
 
         % Code that executes before app deletion
         function delete(app)
+            % A running detection would call back into the deleted app
+            if ~isempty(app.detectionFuture)
+                cancel(app.detectionFuture);
+            end
             delete(app.UIFigure)
         end
     end
 end
 
+function updateProgressDialog(d, stage, fraction)
+    % ProgressFcn of runs in the app's own session
+    if d.CancelRequested
+        error('ParkingDetectorPro:cancelled', 'Detection cancelled.');
+    end
+    d.Value = fraction;
+    d.Message = sprintf('Processing Image: %s', stage);
+    drawnow;
+end
@@ -0,0 +1,253 @@
+classdef ParkingFrameReader < handle
+%PARKINGFRAMEREADER Decode image frames to gray ahead of detection.
+%   READER = PARKINGFRAMEREADER(SOURCES) creates a reader over the frames
+%   of SOURCES, a folder or a list of image files (see listFrameFiles).
+%   Each call to READ returns the next frame decoded straight to a gray
+%   uint8 image, the form every detection pipeline starts from, so the
+%   caller never holds the RGB copy.
+%
+%   With 'Prefetch' N the next N frames are decoded on a parallel pool
+%   (backgroundPool by default) while the caller works on the current
+%   one, so decoding overlaps with detection. The gray conversion then
+%   also runs on the pool and only the gray frame is handed back. At most
+%   N decoded frames are held at a time, whatever the sequence length.
+%
+%   With 'ReductionLevel' L frames are returned at 1/2^L of their size.
+%   JPEG 2000 files are decoded at that resolution directly, skipping the
+%   finer wavelet levels (see imread). Other formats are decoded in full
+%   and box-filtered after the gray conversion, since MATLAB's JPEG
+%   decoder has no reduced-resolution mode, so for JPEG and PNG the
+%   option saves no decoding and adds the resize. Slot rectangles map to
+%   a reduced frame as in pyramidSlotDensity: [(xy - 0.5) * s + 0.5,
+%   wh * s] with the scale s in the INFO output of READ.
+%
+%   The detection pipelines do not use reduced frames: detectParkingBatch
+%   and detectParkingStream read at full size, and 'Preprocess' 'pyramid'
+%   still needs the full frame to refine slots near the threshold, so it
+%   downscales that frame itself. ReductionLevel is for callers that only
+%   need a reduced view, such as previews or coarse-only scoring.
+%
+%   READER = PARKINGFRAMEREADER(SOURCES, Name, Value) sets the properties
+%   below.
+%
+%   PARKINGFRAMEREADER properties:
+%     Prefetch        - Frames decoded ahead on the pool; 0 decodes each
+%                       frame when it is read (default 0)
+%     ReductionLevel  - Decode at 1/2^ReductionLevel of the size
+%                       (default 0)
+%     Gray            - Convert RGB frames to gray (default true)
+%     Pool            - Parallel pool used for prefetching; empty uses
+%                       backgroundPool, and decodes in place when it is
+%                       unavailable (default [])
+%     Files           - Frame files in read order (read-only)
+%     FramesRead      - Frames returned since the last reset (read-only)
+%
+%   PARKINGFRAMEREADER methods:
+%     hasFrame    - True while frames are left
+%     read        - Return the next frame
+%     throughput  - I/O throughput of the frames read so far
+%     reset       - Start again from the first frame
+%     decode      - Decode one file (static)
+%
+%   Example:
+%     reader = ParkingFrameReader('frames', 'Prefetch', 4);
+%     while hasFrame(reader)
+%         results = detectParkingSlots(read(reader), slots);
+%     end
+%     throughput(reader)
+%
+%   See also detectParkingBatch, detectParkingStream, listFrameFiles.
+
+    properties
+        Prefetch = 0
+        ReductionLevel = 0
+        Gray = true
+        Pool = []
+    end
+
+    properties (SetAccess = private)
+        Files            % Frame files in read order
+        FramesRead = 0   % Frames returned since the last reset
+        BytesRead = 0    % File bytes of the frames returned
+        DecodeTime = 0   % Decode seconds of the frames returned, on the pool when prefetching
+        WaitTime = 0     % Seconds READ spent decoding or waiting for a prefetched frame
+    end
+
+    properties (Access = private)
+        pending = {}     % Futures of the prefetched frames, in read order
+        nextSubmit = 1   % Index of the next file not yet decoded or queued
+        startTime = []   % tic of the first read
+    end
+
+    methods
+        function reader = ParkingFrameReader(sources, opts)
+            arguments
+                sources
+                opts.Prefetch (1,1) double {mustBeNonnegative, mustBeInteger} = 0
+                opts.ReductionLevel (1,1) double {mustBeNonnegative, mustBeInteger} = 0
+                opts.Gray (1,1) logical = true
+                opts.Pool = []
+            end
+
+            reader.Files = listFrameFiles(sources);
+            reader.Prefetch = opts.Prefetch;
+            reader.ReductionLevel = opts.ReductionLevel;
+            reader.Gray = opts.Gray;
+            reader.Pool = opts.Pool;
+            if reader.Prefetch > 0 && isempty(reader.Pool) && canUseBackgroundPool()
+                reader.Pool = backgroundPool;
+            end
+        end
+
+        function tf = hasFrame(reader)
+            %HASFRAME True while frames are left.
+            tf = reader.FramesRead < numel(reader.Files);
+        end
+
+        function [frame, info] = read(reader)
+            %READ Return the next frame.
+            %   [FRAME, INFO] = READ(READER) returns the next frame and INFO
+            %   with its file, bytes, decodeTime, the scale it was decoded
+            %   at and waitTime, the seconds READ blocked for it.
+            if ~hasFrame(reader)
+                error('ParkingFrameReader:end', 'No frames left to read.');
+            end
+            if isempty(reader.startTime)
+                reader.startTime = tic;
+            end
+
+            tWait = tic;
+            k = reader.FramesRead + 1;
+            if isempty(reader.pending) && (reader.Prefetch == 0 || isempty(reader.Pool))
+                [frame, info] = ParkingFrameReader.decode(reader.Files{k}, ...
+                    'Gray', reader.Gray, 'ReductionLevel', reader.ReductionLevel);
+                reader.nextSubmit = k + 1;
+            else
+                submit(reader);
+                future = reader.pending{1};
+                reader.pending(1) = [];
+                try
+                    [frame, info] = fetchOutputs(future);
+                catch ME
+                    error('ParkingFrameReader:decode', 'Could not decode %s: %s', ...
+                        reader.Files{k}, ME.message);
+                end
+                % Queue the frame after the window before handing this one back
+                submit(reader);
+            end
+            info.waitTime = toc(tWait);
+
+            reader.FramesRead = k;
+            reader.BytesRead = reader.BytesRead + info.bytes;
+            reader.DecodeTime = reader.DecodeTime + info.decodeTime;
+            reader.WaitTime = reader.WaitTime + info.waitTime;
+        end
+
+        function T = throughput(reader)
+            %THROUGHPUT I/O throughput of the frames read so far.
+            %   T = THROUGHPUT(READER) returns a one-row table with the
+            %   frames and megabytes read, the seconds since the first
+            %   read, framesPerSecond, megabytesPerSecond, and the summed
+            %   decodeTime and waitTime. A waitTime well below decodeTime
+            %   means prefetching hid the decoding behind the caller's work.
+            frames = reader.FramesRead;
+            megabytes = reader.BytesRead / 2^20;
+            elapsed = 0;
+            if ~isempty(reader.startTime)
+                elapsed = toc(reader.startTime);
+            end
+            framesPerSecond = frames / max(elapsed, eps);
+            megabytesPerSecond = megabytes / max(elapsed, eps);
+            decodeTime = reader.DecodeTime;
+            waitTime = reader.WaitTime;
+            T = table(frames, megabytes, elapsed, framesPerSecond, megabytesPerSecond, ...
+                decodeTime, waitTime);
+        end
+
+        function reset(reader)
+            %RESET Start again from the first frame.
+            cancelPending(reader);
+            reader.nextSubmit = 1;
+            reader.FramesRead = 0;
+            reader.BytesRead = 0;
+            reader.DecodeTime = 0;
+            reader.WaitTime = 0;
+            reader.startTime = [];
+        end
+
+        function delete(reader)
+            cancelPending(reader);
+        end
+    end
+
+    methods (Static)
+        function [frame, info] = decode(file, opts)
+            %DECODE Decode one file.
+            %   [FRAME, INFO] = PARKINGFRAMEREADER.DECODE(FILE) reads FILE
+            %   and returns it as a gray image, and INFO with the file,
+            %   its bytes, the decodeTime and the scale of FRAME. Indexed
+            %   images are expanded with their colormap first.
+            %
+            %   Name-value options:
+            %     'Gray'            Convert RGB to gray (default true)
+            %     'ReductionLevel'  Return FRAME at 1/2^L of the size;
+            %                       only JPEG 2000 decodes less (default 0)
+            arguments
+                file {mustBeTextScalar}
+                opts.Gray (1,1) logical = true
+                opts.ReductionLevel (1,1) double {mustBeNonnegative, mustBeInteger} = 0
+            end
+
+            t0 = tic;
+            file = char(file);
+            [~, ~, ext] = fileparts(file);
+            level = opts.ReductionLevel;
+            if level > 0 && any(strcmpi(ext, {'.jp2', '.j2k', '.jpf', '.jpx'}))
+                % JPEG 2000 skips the finer wavelet levels
+                [frame, map] = imread(file, 'ReductionLevel', level);
+                level = 0;
+            else
+                [frame, map] = imread(file);
+            end
+            if ~isempty(map)
+                frame = im2uint8(ind2rgb(frame, map));
+            end
+            if opts.Gray && size(frame, 3) == 3
+                frame = rgb2gray(frame);
+            end
+            if level > 0
+                frame = imresize(frame, 2^-level, 'box');
+            end
+
+            listing = dir(file);
+            info.file = file;
+            info.bytes = listing.bytes;
+            info.decodeTime = toc(t0);
+            info.scale = 2^-opts.ReductionLevel;
+        end
+    end
+
+    methods (Access = private)
+        function submit(reader)
+            % Keeps Prefetch frames queued on the pool; pending always
+            % holds files FramesRead+1 to nextSubmit-1, in order
+            while numel(reader.pending) < reader.Prefetch && reader.nextSubmit <= numel(reader.Files)
+                reader.pending{end+1} = parfeval(reader.Pool, @ParkingFrameReader.decode, 2, ...
+                    reader.Files{reader.nextSubmit}, 'Gray', reader.Gray, ...
+                    'ReductionLevel', reader.ReductionLevel);
+                reader.nextSubmit = reader.nextSubmit + 1;
+            end
+        end
+
+        function cancelPending(reader)
+            for k = 1:numel(reader.pending)
+                cancel(reader.pending{k});
+            end
+            reader.pending = {};
+        end
+    end
+end
+
+function tf = canUseBackgroundPool()
+    tf = exist('backgroundPool', 'file') > 0;
+end
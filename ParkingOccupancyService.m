@@ -0,0 +1,320 @@
+classdef ParkingOccupancyService < handle
+%PARKINGOCCUPANCYSERVICE Local TCP service answering live occupancy queries.
+%   SVC = PARKINGOCCUPANCYSERVICE creates a service that keeps the latest
+%   detection result of each registered lot in an in-memory snapshot and
+%   serves it to local clients over TCP. Register lots with addLot, then
+%   call start.
+%
+%   Clients connect to Address:Port and send one request line per query,
+%   terminated by a line feed; each is answered by one line of JSON:
+%     GET /lots              Summary of every lot
+%     GET /lots/NAME         Summary of one lot: lot, timestamp (UTC),
+%                            occupied, empty, total, occupancyRate and
+%                            detectionTime (seconds)
+%     GET /lots/NAME/slots   The summary plus slots, the id, status and
+%                            density of every slot
+%   A trailing protocol token, as in 'GET /lots HTTP/1.1', is ignored, but
+%   the reply is a bare JSON line rather than an HTTP response. Unknown
+%   requests are answered with {"error": MESSAGE}. tcpserver serves one
+%   client connection at a time, so a backend should keep its connection
+%   open and send its requests over it.
+%
+%   Every Interval seconds each lot whose previous detection has finished
+%   is detected again on backgroundPool: the frame is read from the lot's
+%   source, classified with detectParkingSlots and its replies encoded to
+%   JSON, all on the background worker. The finished replies then replace
+%   the lot's entry with a single assignment of the whole snapshot.
+%   Requests are answered from the current snapshot by a table lookup and
+%   a write, so they never wait for detection and never see a lot half
+%   updated. A lot whose detection fails keeps its previous reply, and the
+%   error is kept in LastError. Where backgroundPool is not available
+%   detection runs in the refresh timer itself, and requests wait while it
+%   does.
+%
+%   PARKINGOCCUPANCYSERVICE properties:
+%     Address          - Address to listen on (default '127.0.0.1')
+%     Port             - TCP port (default 8080)
+%     Interval         - Seconds between detections of a lot (default 5)
+%                        The three are read by start.
+%     Lots             - Registered lot names (read-only)
+%     LastError        - Last detection error of each lot (read-only)
+%     RequestsServed   - Requests answered since start (read-only)
+%     Running          - True between start and stop (read-only)
+%
+%   PARKINGOCCUPANCYSERVICE methods:
+%     addLot         - Register a lot and its frame source
+%     start          - Start listening and detecting
+%     stop           - Stop listening and detecting
+%     refresh        - Start a detection of every idle lot now
+%     handleRequest  - Reply to one request line
+%
+%   Example:
+%     svc = ParkingOccupancyService('Port', 8080, 'Interval', 2);
+%     addLot(svc, 'north', 'cameras/north', 'north.pslot');
+%     start(svc);
+%     % From another process:
+%     %   printf 'GET /lots/north\n' | nc 127.0.0.1 8080
+%
+%   See also detectParkingSlots, loadOccupancyService.
+
+    properties
+        Address = '127.0.0.1'
+        Port = 8080
+        Interval = 5
+    end
+
+    properties (SetAccess = private)
+        Lots = cell(1, 0)
+        LastError = cell(1, 0)
+        RequestsServed = 0
+        Running = false
+    end
+
+    properties (Access = private)
+        sources = cell(1, 0)     % Frame source of each lot
+        slotSets = cell(1, 0)    % Slots (or compileSlotMasks masks) of each lot
+        thresholds = zeros(1, 0)
+        pending = cell(1, 0)     % Future of each lot's running detection
+        snapshot                 % Encoded replies; replaced, never edited
+        server                   % tcpserver
+        refreshTimer             % timer
+        pool                     % backgroundPool, or [] to detect in place
+    end
+
+    methods
+        function svc = ParkingOccupancyService(opts)
+            arguments
+                opts.Address {mustBeTextScalar} = '127.0.0.1'
+                opts.Port (1,1) double {mustBeInteger, mustBeNonnegative} = 8080
+                opts.Interval (1,1) double {mustBePositive} = 5
+            end
+
+            svc.Address = char(opts.Address);
+            svc.Port = opts.Port;
+            svc.Interval = opts.Interval;
+            svc.snapshot = struct('summary', {cell(1, 0)}, 'slots', {cell(1, 0)}, ...
+                'all', '{"lots":[]}');
+        end
+
+        function addLot(svc, name, source, slots, opts)
+            %ADDLOT Register a lot and its frame source.
+            %   ADDLOT(SVC, NAME, SOURCE, SLOTS) adds the lot NAME. SOURCE
+            %   is an image file, read again for every detection, a folder
+            %   whose most recently modified image is used, or a function
+            %   handle returning a frame; it must run on a background
+            %   worker. SLOTS is anything loadSlots accepts or a
+            %   compileSlotMasks struct. ADDLOT(..., 'Threshold', T) sets
+            %   the density threshold (default 0.07).
+            arguments
+                svc
+                name {mustBeTextScalar}
+                source
+                slots
+                opts.Threshold (1,1) double = 0.07
+            end
+
+            name = char(name);
+            if any(strcmp(svc.Lots, name))
+                error('ParkingOccupancyService:lot', 'Lot %s is already registered.', name);
+            end
+            if ~isstruct(slots)
+                slots = loadSlots(slots);
+            end
+
+            svc.Lots{end+1} = name;
+            svc.LastError{end+1} = '';
+            svc.sources{end+1} = source;
+            svc.slotSets{end+1} = slots;
+            svc.thresholds(end+1) = opts.Threshold;
+            svc.pending{end+1} = [];
+
+            next = svc.snapshot;
+            next.summary{end+1} = jsonencode(struct('lot', name, 'error', 'No detection yet'));
+            next.slots{end+1} = next.summary{end};
+            next.all = allReply(next.summary);
+            svc.snapshot = next;
+        end
+
+        function start(svc)
+            %START Start listening and detecting.
+            if svc.Running
+                return;
+            end
+
+            svc.pool = [];
+            if canUseBackgroundPool()
+                svc.pool = backgroundPool;
+            end
+
+            svc.server = tcpserver(svc.Address, svc.Port);
+            configureTerminator(svc.server, 'LF');
+            configureCallback(svc.server, 'terminator', @(src, ~) serve(svc, src));
+
+            svc.refreshTimer = timer('ExecutionMode', 'fixedSpacing', 'Period', svc.Interval, ...
+                'BusyMode', 'drop', 'TimerFcn', @(~, ~) refresh(svc), ...
+                'Name', 'ParkingOccupancyService');
+            svc.Running = true;
+            svc.RequestsServed = 0;
+            start(svc.refreshTimer);
+        end
+
+        function stop(svc)
+            %STOP Stop listening and detecting.
+            if ~isempty(svc.refreshTimer) && isvalid(svc.refreshTimer)
+                stop(svc.refreshTimer);
+                delete(svc.refreshTimer);
+            end
+            svc.refreshTimer = [];
+            svc.server = [];   % Deleting the tcpserver closes the port
+            for k = 1:numel(svc.pending)
+                if ~isempty(svc.pending{k})
+                    cancel(svc.pending{k});
+                end
+            end
+            svc.pending(:) = {[]};
+            svc.Running = false;
+        end
+
+        function refresh(svc)
+            %REFRESH Start a detection of every idle lot now.
+            for k = 1:numel(svc.Lots)
+                if ~isempty(svc.pending{k})
+                    continue;
+                end
+                name = svc.Lots{k};
+                args = {name, svc.sources{k}, svc.slotSets{k}, svc.thresholds(k)};
+                if isempty(svc.pool)
+                    try
+                        install(svc, name, detectLot(args{:}), '');
+                    catch ME
+                        install(svc, name, [], ME.message);
+                    end
+                else
+                    future = parfeval(svc.pool, @detectLot, 1, args{:});
+                    svc.pending{k} = future;
+                    afterEach(future, @(f) finished(svc, name, f), 0, 'PassFuture', true);
+                end
+            end
+        end
+
+        function reply = handleRequest(svc, line)
+            %HANDLEREQUEST Reply to one request line.
+            %   REPLY = HANDLEREQUEST(SVC, LINE) returns the JSON reply to
+            %   the request LINE, e.g. 'GET /lots/north', as the server
+            %   would send it.
+            tokens = strsplit(strtrim(char(line)));
+            if numel(tokens) < 2 || ~strcmpi(tokens{1}, 'GET')
+                reply = errorReply('Expected GET PATH');
+                return;
+            end
+
+            current = svc.snapshot;
+            segments = strsplit(strip(tokens{2}, '/'), '/');
+            if ~strcmp(segments{1}, 'lots') || numel(segments) > 3 ...
+                    || (numel(segments) == 3 && ~strcmp(segments{3}, 'slots'))
+                reply = errorReply(['Unknown path ' tokens{2}]);
+            elseif isscalar(segments)
+                reply = current.all;
+            else
+                name = char(java.net.URLDecoder.decode(segments{2}, 'UTF-8'));
+                k = find(strcmp(svc.Lots, name), 1);
+                if isempty(k)
+                    reply = errorReply(['Unknown lot ' name]);
+                elseif numel(segments) == 2
+                    reply = current.summary{k};
+                else
+                    reply = current.slots{k};
+                end
+            end
+        end
+
+        function delete(svc)
+            stop(svc);
+        end
+    end
+
+    methods (Access = private)
+        function serve(svc, src)
+            % tcpserver callback: answer one request line
+            line = readline(src);
+            if isempty(line)
+                return;
+            end
+            writeline(src, handleRequest(svc, line));
+            svc.RequestsServed = svc.RequestsServed + 1;
+        end
+
+        function finished(svc, name, future)
+            % afterEach callback of a lot's background detection
+            k = find(strcmp(svc.Lots, name), 1);
+            svc.pending{k} = [];
+            if isempty(future.Error)
+                install(svc, name, fetchOutputs(future), '');
+            elseif svc.Running
+                install(svc, name, [], future.Error.message);
+            end
+        end
+
+        function install(svc, name, replies, message)
+            % Swap a lot's new replies into a copy of the snapshot
+            k = find(strcmp(svc.Lots, name), 1);
+            svc.LastError{k} = message;
+            if isempty(replies)
+                return;
+            end
+            next = svc.snapshot;
+            next.summary{k} = replies.summary;
+            next.slots{k} = replies.slots;
+            next.all = allReply(next.summary);
+            svc.snapshot = next;
+        end
+    end
+end
+
+function replies = detectLot(name, source, slots, threshold)
+    % Detect one lot and encode its replies; runs on the background worker
+    t0 = tic;
+    [results, summary] = detectParkingSlots(latestFrame(source), slots, ...
+        'Threshold', threshold, 'Lot', name);
+
+    lotSummary = struct('lot', name, ...
+        'timestamp', char(datetime('now', 'TimeZone', 'UTC', ...
+            'Format', 'yyyy-MM-dd''T''HH:mm:ss.SSS''Z''')), ...
+        'occupied', summary.occupied, 'empty', summary.empty, 'total', summary.total, ...
+        'occupancyRate', summary.occupancyRate, 'detectionTime', toc(t0));
+    replies.summary = jsonencode(lotSummary);
+
+    n = numel(results.density);
+    lotSummary.slots = struct('id', num2cell((1:n)'), ...
+        'status', reshape(slotStatusNames(results.status), [], 1), ...
+        'density', num2cell(results.density(:)));
+    replies.slots = jsonencode(lotSummary);
+end
+
+function frame = latestFrame(source)
+    if isa(source, 'function_handle')
+        frame = source();
+    elseif isfolder(source)
+        files = listFrameFiles(source);
+        if isempty(files)
+            error('ParkingOccupancyService:source', 'No images in %s.', source);
+        end
+        listing = cellfun(@dir, files);
+        [~, newest] = max([listing.datenum]);
+        frame = imread(files{newest});
+    else
+        frame = imread(source);
+    end
+end
+
+function reply = allReply(summaries)
+    reply = ['{"lots":[' strjoin(summaries, ',') ']}'];
+end
+
+function reply = errorReply(message)
+    reply = jsonencode(struct('error', message));
+end
+
+function tf = canUseBackgroundPool()
+    tf = exist('backgroundPool', 'file') > 0;
+end
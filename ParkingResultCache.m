@@ -0,0 +1,225 @@
+classdef ParkingResultCache < handle
+%PARKINGRESULTCACHE On-disk cache of slot densities and edge maps.
+%   CACHE = PARKINGRESULTCACHE(FOLDER) opens, creating it if needed, a
+%   cache of detection results in FOLDER. detectParkingSlots uses it with
+%   the 'Cache' option: a run whose image, slots and pipeline parameters
+%   were seen before loads the per-slot densities (and, if stored, the
+%   Canny and closing maps) instead of recomputing them, so a warm rerun
+%   costs the hashing and one file read. The threshold is not part of
+%   the key; it is applied to the cached densities.
+%
+%   Entries are keyed by a SHA-256 digest (java.security.MessageDigest)
+%   of the image content, the slot layout and the parameters (see key).
+%   Image files are hashed from their encoded bytes, so a hit does not
+%   even decode the image.
+%
+%   Each entry is one .mat file. It is written to a temporary file in
+%   FOLDER and renamed into place, so concurrent readers, including other
+%   MATLAB sessions and pool workers sharing FOLDER, see either the whole
+%   entry or none. A hit refreshes the entry's modification time; when
+%   the cache grows past MaxBytes the least recently used entries are
+%   deleted. An entry deleted by another process while being read counts
+%   as a miss.
+%
+%   PARKINGRESULTCACHE properties:
+%     Folder    - Cache folder (read-only)
+%     MaxBytes  - Size above which old entries are evicted (default 1 GB)
+%     Hits      - Lookups served by this object (read-only)
+%     Misses    - Lookups not served by this object (read-only)
+%
+%   PARKINGRESULTCACHE methods:
+%     key     - Cache key of an image, slot layout and parameters (static)
+%     lookup  - Load an entry
+%     store   - Save an entry and evict old ones
+%     clear   - Delete every entry
+%
+%   Example:
+%     cache = ParkingResultCache(fullfile(tempdir, 'parking_cache'));
+%     [results, summary, info] = detectParkingSlots('lot.jpg', slots, 'Cache', cache);
+%     info.cacheHit
+%
+%   See also detectParkingSlots, detectParkingBatch.
+
+    properties (SetAccess = private)
+        Folder
+        Hits = 0
+        Misses = 0
+    end
+
+    properties
+        MaxBytes = 1e9
+    end
+
+    methods
+        function cache = ParkingResultCache(folder, opts)
+            arguments
+                folder {mustBeTextScalar} = fullfile(tempdir, 'parking_cache')
+                opts.MaxBytes (1,1) double {mustBePositive} = 1e9
+            end
+
+            if ~isfolder(folder)
+                [ok, message] = mkdir(folder);
+                if ~ok
+                    error('ParkingResultCache:folder', 'Cannot create %s: %s', folder, message);
+                end
+            end
+            cache.Folder = char(folder);
+            cache.MaxBytes = opts.MaxBytes;
+        end
+
+        function [entry, hit] = lookup(cache, key, variables)
+            %LOOKUP Load an entry.
+            %   [ENTRY, HIT] = LOOKUP(CACHE, KEY) returns the struct stored
+            %   under KEY and HIT true, or [] and false when there is none.
+            %   LOOKUP(CACHE, KEY, VARIABLES) loads only the fields named in
+            %   the cell array VARIABLES and is a miss unless all exist.
+            arguments
+                cache
+                key {mustBeTextScalar}
+                variables cell = {}
+            end
+
+            entry = [];
+            hit = false;
+            file = entryFile(cache, key);
+            if isfile(file)
+                state = warning('off', 'MATLAB:load:variableNotFound');
+                restore = onCleanup(@() warning(state));
+                try
+                    entry = load(file, variables{:});
+                    hit = all(isfield(entry, variables));
+                catch
+                    % Evicted or replaced by another process meanwhile
+                    entry = [];
+                end
+            end
+
+            if hit
+                cache.Hits = cache.Hits + 1;
+                java.io.File(file).setLastModified(java.lang.System.currentTimeMillis());
+            else
+                entry = [];
+                cache.Misses = cache.Misses + 1;
+            end
+        end
+
+        function store(cache, key, entry)
+            %STORE Save an entry and evict old ones.
+            %   STORE(CACHE, KEY, ENTRY) writes the fields of the struct
+            %   ENTRY under KEY, replacing any earlier entry, then deletes
+            %   the least recently used entries while the cache is larger
+            %   than MaxBytes.
+            temporary = [tempname(cache.Folder) '.tmp'];
+            try
+                save(temporary, '-struct', 'entry', '-mat');
+                movefile(temporary, entryFile(cache, key), 'f');
+            catch ME
+                java.io.File(temporary).delete();
+                rethrow(ME);
+            end
+            evict(cache);
+        end
+
+        function clear(cache)
+            %CLEAR Delete every entry, and temporary files of failed writes.
+            files = [dir(fullfile(cache.Folder, '*.mat')); dir(fullfile(cache.Folder, '*.tmp'))];
+            for k = 1:numel(files)
+                java.io.File(fullfile(files(k).folder, files(k).name)).delete();
+            end
+            cache.Hits = 0;
+            cache.Misses = 0;
+        end
+    end
+
+    methods (Static)
+        function key = key(img, slots, params)
+            %KEY Cache key of an image, slot layout and parameters.
+            %   KEY = PARKINGRESULTCACHE.KEY(IMG, SLOTS, PARAMS) returns a
+            %   64-character hex SHA-256 digest. IMG is an image array,
+            %   hashed with its class and size, or a file name, hashed
+            %   from the file's bytes. SLOTS is an N-by-4 matrix or
+            %   compileSlotMasks masks. PARAMS is a char vector describing
+            %   everything else the result depends on.
+            if ischar(img) || isStringScalar(img)
+                imageHash = hashFile(img);
+            else
+                imageHash = hashBytes([uint8(sprintf('%s %s|', class(img), mat2str(size(img)))), ...
+                    toBytes(img)]);
+            end
+
+            if isstruct(slots)
+                polygons = cellfun(@(p) reshape(p, 1, []), slots.polygons, 'UniformOutput', false);
+                slotData = [reshape(slots.rect, 1, []), reshape(slots.rotation, 1, []), [polygons{:}], ...
+                    slots.imageSize];
+            else
+                slotData = [reshape(double(slots), 1, []), size(slots)];
+            end
+            slotHash = hashBytes(toBytes(slotData));
+
+            key = hashBytes(uint8([imageHash '|' slotHash '|' char(params)]));
+        end
+    end
+
+    methods (Access = private)
+        function file = entryFile(cache, key)
+            file = fullfile(cache.Folder, [char(key) '.mat']);
+        end
+
+        function evict(cache)
+            files = dir(fullfile(cache.Folder, '*.mat'));
+            total = sum([files.bytes]);
+            if total <= cache.MaxBytes
+                return;
+            end
+
+            % Oldest modification time first: hits refresh it, so this is
+            % least recently used first
+            [~, order] = sort([files.datenum]);
+            for k = order
+                if total <= cache.MaxBytes
+                    break;
+                end
+                % Another process may have evicted it already
+                java.io.File(fullfile(files(k).folder, files(k).name)).delete();
+                total = total - files(k).bytes;
+            end
+        end
+    end
+end
+
+function digest = hashBytes(bytes)
+    % SHA-256 of a uint8 vector as lowercase hex, fed in 64 MB blocks
+    md = java.security.MessageDigest.getInstance('SHA-256');
+    block = 2^26;
+    for first = 1:block:numel(bytes)
+        md.update(bytes(first:min(first + block - 1, numel(bytes))));
+    end
+    digest = sprintf('%02x', typecast(md.digest(), 'uint8'));
+end
+
+function digest = hashFile(file)
+    % SHA-256 of a file's bytes, read in 64 MB blocks
+    fid = fopen(file, 'r');
+    if fid < 0
+        error('ParkingResultCache:open', 'Cannot open %s.', file);
+    end
+    cleanup = onCleanup(@() fclose(fid));
+
+    md = java.security.MessageDigest.getInstance('SHA-256');
+    while true
+        bytes = fread(fid, 2^26, '*uint8');
+        if isempty(bytes)
+            break;
+        end
+        md.update(bytes);
+    end
+    digest = sprintf('%02x', typecast(md.digest(), 'uint8'));
+end
+
+function bytes = toBytes(data)
+    % Raw bytes of a numeric or logical array as a uint8 row
+    if islogical(data)
+        data = uint8(data);
+    end
+    bytes = typecast(reshape(data, 1, []), 'uint8');
+end
@@ -0,0 +1,248 @@
+classdef ParkingResultWriter < handle
+%PARKINGRESULTWRITER Append-only export of per-frame slot results.
+%   W = PARKINGRESULTWRITER(BASENAME) creates a writer that appends one
+%   row per slot and frame, (timestamp, lot, slotID, status, density),
+%   to the files
+%     BASENAME.csv   Human-readable CSV with a header line
+%     BASENAME.pres  Columnar binary rows, in chunks
+%     BASENAME.pidx  Chunk index: 32-byte records of byte offset (uint64),
+%                    row count (uint32), lot code (uint32) and first and
+%                    last timestamp (double, POSIX seconds)
+%     BASENAME.lots  Lot names, one per line; the lot code is the line
+%   Lot names are quoted in the CSV file and cannot contain line breaks.
+%   Existing files are appended to, so a monitor can be restarted.
+%
+%   Rows are kept in a preallocated buffer of ChunkRows rows and written
+%   when it is full, when FlushInterval seconds have passed since the
+%   last write (checked on append), and on flush, close or deletion, so
+%   memory stays bounded however long the run. Each write sorts the
+%   buffer by lot and appends one binary chunk per lot, then its index
+%   records, so readResultRange can answer lot and time range queries by
+%   reading the small index and only the chunks that match. Files are
+%   opened and closed for every write, so the data on disk is always
+%   complete up to the last flush and can be read while the run goes on.
+%
+%   PARKINGRESULTWRITER properties:
+%     BaseName       - Output file name without extension (read-only)
+%     ChunkRows      - Rows buffered before a write (default 65536)
+%     FlushInterval  - Seconds between writes (default 10)
+%     WriteCSV       - Also append to BASENAME.csv (default true)
+%     RowsWritten    - Rows written so far by this writer (read-only)
+%
+%   PARKINGRESULTWRITER methods:
+%     append  - Buffer the slot results of one frame
+%     flush   - Write the buffered rows
+%     close   - Flush; the writer can still be appended to afterwards
+%
+%   Example:
+%     w = ParkingResultWriter('history/north');
+%     for k = 1:numel(files)
+%         results = detectParkingSlots(files{k}, slots);
+%         append(w, results, 'Lot', 'north');
+%     end
+%     close(w);
+%     T = readResultRange('history/north', 'Lot', 'north', ...
+%         'From', datetime(2025,1,1), 'To', datetime(2025,1,2));
+%
+%   See also readResultRange, detectParkingStream.
+
+    properties (SetAccess = private)
+        BaseName
+        RowsWritten = 0
+    end
+
+    properties
+        ChunkRows = 65536
+        FlushInterval = 10
+        WriteCSV = true
+    end
+
+    properties (Access = private)
+        time             % POSIX seconds of the buffered rows
+        lotCode          % Lot code of the buffered rows
+        slotID
+        status
+        density
+        nBuffered = 0
+        lots = {}        % Lot names; index is the lot code
+        lastFlush        % tic of the last write
+    end
+
+    methods
+        function w = ParkingResultWriter(baseName, opts)
+            arguments
+                baseName {mustBeTextScalar}
+                opts.ChunkRows (1,1) double {mustBePositive, mustBeInteger} = 65536
+                opts.FlushInterval (1,1) double {mustBeNonnegative} = 10
+                opts.WriteCSV (1,1) logical = true
+            end
+
+            w.BaseName = char(baseName);
+            w.ChunkRows = opts.ChunkRows;
+            w.FlushInterval = opts.FlushInterval;
+            w.WriteCSV = opts.WriteCSV;
+
+            folder = fileparts(w.BaseName);
+            if strlength(folder) > 0 && ~isfolder(folder)
+                mkdir(folder);
+            end
+            lotFile = [w.BaseName '.lots'];
+            if isfile(lotFile)
+                % Every name ends with a newline; '' is a valid lot name
+                names = splitlines(fileread(lotFile));
+                w.lots = reshape(names(1:end-1), 1, []);
+            end
+
+            w.time = zeros(w.ChunkRows, 1);
+            w.lotCode = zeros(w.ChunkRows, 1, 'uint32');
+            w.slotID = zeros(w.ChunkRows, 1, 'uint32');
+            w.status = zeros(w.ChunkRows, 1, 'uint8');
+            w.density = zeros(w.ChunkRows, 1);
+            w.lastFlush = tic;
+        end
+
+        function append(w, results, opts)
+            %APPEND Buffer the slot results of one frame.
+            %   APPEND(W, RESULTS) buffers one row per slot of the
+            %   classifySlots RESULTS, stamped with the current time.
+            %   APPEND(W, RESULTS, 'Lot', LOT, 'Timestamp', T) sets the
+            %   lot name and the frame time (a datetime, taken as UTC if
+            %   it has no time zone, or POSIX seconds).
+            arguments
+                w
+                results (1,1) struct
+                opts.Lot {mustBeTextScalar} = ''
+                opts.Timestamp = datetime('now', 'TimeZone', 'UTC')
+            end
+
+            t = opts.Timestamp;
+            if isdatetime(t)
+                if isempty(t.TimeZone)
+                    t.TimeZone = 'UTC';
+                end
+                t = posixtime(t);
+            end
+            code = lotCodeOf(w, char(opts.Lot));
+
+            n = numel(results.density);
+            first = 1;
+            while first <= n
+                count = min(n - first + 1, w.ChunkRows - w.nBuffered);
+                rows = w.nBuffered + (1:count);
+                slots = first:first + count - 1;
+                w.time(rows) = t;
+                w.lotCode(rows) = code;
+                w.slotID(rows) = slots;
+                w.status(rows) = results.status(slots);
+                w.density(rows) = results.density(slots);
+                w.nBuffered = w.nBuffered + count;
+                first = first + count;
+                if w.nBuffered == w.ChunkRows
+                    flush(w);
+                end
+            end
+
+            if toc(w.lastFlush) >= w.FlushInterval
+                flush(w);
+            end
+        end
+
+        function flush(w)
+            %FLUSH Write the buffered rows.
+            w.lastFlush = tic;
+            n = w.nBuffered;
+            if n == 0
+                return;
+            end
+
+            % Lot segments of the buffer, each written as one chunk
+            [code, order] = sort(w.lotCode(1:n));
+            time = w.time(order);
+            slotID = w.slotID(order);
+            status = w.status(order);
+            density = w.density(order);
+            segmentEnd = [find(diff(code)); n];
+            segmentStart = [1; segmentEnd(1:end-1) + 1];
+
+            % --- Binary Chunks, then their Index Records ---
+            fid = openFile([w.BaseName '.pres'], 'a', 'ieee-le');
+            fseek(fid, 0, 'eof');
+            records = zeros(32, numel(segmentStart), 'uint8');
+            for s = 1:numel(segmentStart)
+                rows = segmentStart(s):segmentEnd(s);
+                offset = ftell(fid);
+                fwrite(fid, time(rows), 'double');
+                fwrite(fid, slotID(rows), 'uint32');
+                fwrite(fid, status(rows), 'uint8');
+                fwrite(fid, density(rows), 'double');
+                records(:,s) = [typecast(uint64(offset), 'uint8'), ...
+                    typecast(uint32([numel(rows) code(rows(1))]), 'uint8'), ...
+                    typecast([min(time(rows)) max(time(rows))], 'uint8')]';
+            end
+            fclose(fid);
+
+            fid = openFile([w.BaseName '.pidx'], 'a', 'ieee-le');
+            fwrite(fid, records, 'uint8');
+            fclose(fid);
+
+            % --- CSV ---
+            if w.WriteCSV
+                csvFile = [w.BaseName '.csv'];
+                isNew = ~isfile(csvFile);
+                fid = openFile(csvFile, 'a', 'n', 'UTF-8');
+                if isNew
+                    fprintf(fid, 'timestamp,lot,slotID,status,density\n');
+                end
+                stamps = cellstr(datetime(time, 'ConvertFrom', 'posixtime', 'TimeZone', 'UTC', ...
+                    'Format', 'yyyy-MM-dd''T''HH:mm:ss.SSS''Z'''));
+                % Lot names are free text: quote them, doubling quotes
+                quotedLots = strcat('"', strrep(w.lots, '"', '""'), '"');
+                rowsOut = [stamps'; quotedLots(code)'; num2cell(double(slotID))'; ...
+                    slotStatusNames(status)'; num2cell(density)'];
+                fprintf(fid, '%s,%s,%d,%s,%.6f\n', rowsOut{:});
+                fclose(fid);
+            end
+
+            w.RowsWritten = w.RowsWritten + n;
+            w.nBuffered = 0;
+        end
+
+        function close(w)
+            %CLOSE Flush the buffered rows.
+            flush(w);
+        end
+
+        function delete(w)
+            try
+                flush(w);
+            catch
+                % Nothing more can be done from a destructor
+            end
+        end
+    end
+
+    methods (Access = private)
+        function code = lotCodeOf(w, lot)
+            % Code of LOT, registering it in BASENAME.lots when new
+            code = find(strcmp(w.lots, lot), 1);
+            if isempty(code)
+                if any(lot == newline | lot == char(13))
+                    error('ParkingResultWriter:lot', ...
+                        'Lot names cannot contain line breaks, since %s.lots stores one per line.', w.BaseName);
+                end
+                fid = openFile([w.BaseName '.lots'], 'a', 'n', 'UTF-8');
+                fprintf(fid, '%s\n', lot);
+                fclose(fid);
+                w.lots{end+1} = lot;
+                code = numel(w.lots);
+            end
+        end
+    end
+end
+
+function fid = openFile(file, varargin)
+    fid = fopen(file, varargin{:});
+    if fid < 0
+        error('ParkingResultWriter:open', 'Cannot open %s for writing.', file);
+    end
+end
@@ -0,0 +1,181 @@
+classdef ParkingStreamDetector < handle
+%PARKINGSTREAMDETECTOR Frame-by-frame slot detection that skips static slots.
+%   DET = PARKINGSTREAMDETECTOR(SLOTS) creates a detector for the N-by-4
+%   [x y width height] slot matrix SLOTS. Each call to STEP processes one
+%   frame of a video or image sequence and keeps the per-slot state of
+%   the previous frames.
+%
+%   The first frame (and every RefreshInterval-th frame) runs the full
+%   detectParkingSlots pipeline. On the other frames a slot is
+%   re-evaluated only when the mean absolute gray-level change of its
+%   pixels since its last evaluation exceeds ChangeDelta; its edge density
+%   is then recomputed on a padded crop (see roiSlotDensity). Unchanged
+%   slots keep their last density and status.
+%
+%   DET = PARKINGSTREAMDETECTOR(SLOTS, Name, Value) sets the properties
+%   below.
+%
+%   PARKINGSTREAMDETECTOR properties:
+%     Threshold        - Edge density threshold (default 0.07)
+%     ChangeDelta      - Mean absolute change, in gray levels of the
+%                        input (0-255 for uint8), that triggers a
+%                        re-evaluation (default 4)
+%     RefreshInterval  - Run the full pipeline every this many frames;
+%                        0 runs it on the first frame only (default 0)
+%     CannyThreshold   - Canny [low high] thresholds (default [0.1 0.2])
+%     StrelSize        - Closing rectangle size (default [3 3])
+%     Halo             - Crop padding for re-evaluated slots (default 16)
+%     Lot              - Lot name frames are recorded under in
+%                        ParkingTelemetry (default '')
+%
+%   PARKINGSTREAMDETECTOR methods:
+%     step   - Process the next frame
+%     reset  - Forget all per-slot state
+%
+%   Example:
+%     det = ParkingStreamDetector(slots, 'ChangeDelta', 6);
+%     v = VideoReader('lot.mp4');
+%     while hasFrame(v)
+%         [results, summary] = step(det, readFrame(v));
+%     end
+%
+%   When ParkingTelemetry.instance is enabled every frame is recorded
+%   there, with the slots skipped as unchanged counted as cache hits.
+%
+%   See also detectParkingStream, detectParkingSlots, roiSlotDensity,
+%   ParkingTelemetry.
+
+    properties
+        Slots
+        Threshold = 0.07
+        ChangeDelta = 4
+        RefreshInterval = 0
+        CannyThreshold = [0.1 0.2]
+        StrelSize = [3 3]
+        Halo = 16
+        Lot = ''
+    end
+
+    properties (SetAccess = private)
+        Density          % Last edge density of every slot
+        FrameCount = 0   % Frames processed since the last reset
+        SlotsEvaluated = 0 % Slot evaluations since the last reset
+    end
+
+    properties (Access = private)
+        referenceGray    % Gray levels each slot was last evaluated on
+        gradientMax      % Canny gradient scale of the last full frame
+    end
+
+    methods
+        function obj = ParkingStreamDetector(slots, opts)
+            arguments
+                slots (:,4) double
+                opts.Threshold (1,1) double = 0.07
+                opts.ChangeDelta (1,1) double {mustBeNonnegative} = 4
+                opts.RefreshInterval (1,1) double {mustBeNonnegative, mustBeInteger} = 0
+                opts.CannyThreshold (1,2) double = [0.1 0.2]
+                opts.StrelSize (1,2) double = [3 3]
+                opts.Halo (1,1) double {mustBeNonnegative, mustBeInteger} = 16
+                opts.Lot {mustBeTextScalar} = ''
+            end
+
+            obj.Slots = slots;
+            obj.Threshold = opts.Threshold;
+            obj.ChangeDelta = opts.ChangeDelta;
+            obj.RefreshInterval = opts.RefreshInterval;
+            obj.CannyThreshold = opts.CannyThreshold;
+            obj.StrelSize = opts.StrelSize;
+            obj.Halo = opts.Halo;
+            obj.Lot = char(opts.Lot);
+        end
+
+        function [results, summary, frameInfo] = step(obj, frame)
+            %STEP Process the next frame.
+            %   [RESULTS, SUMMARY, FRAMEINFO] = STEP(DET, FRAME) returns
+            %   the classifySlots RESULTS and SUMMARY for FRAME. FRAMEINFO
+            %   has fields fullRefresh, slotsEvaluated, elapsed and
+            %   stageTimes.
+            t0 = tic;
+
+            if size(frame, 3) == 3
+                gray = rgb2gray(frame);
+            else
+                gray = frame;
+            end
+            stageTimes.gray = toc(t0);
+
+            obj.FrameCount = obj.FrameCount + 1;
+            nSlots = size(obj.Slots, 1);
+
+            fullRefresh = isempty(obj.referenceGray) ...
+                || ~isequal(size(gray), size(obj.referenceGray)) ...
+                || numel(obj.Density) ~= nSlots ...
+                || (obj.RefreshInterval > 0 && mod(obj.FrameCount - 1, obj.RefreshInterval) == 0);
+
+            if fullRefresh
+                % --- Full Pipeline ---
+                [~, ~, morphImage, preprocessTimes] = parkingPreprocess(gray, ...
+                    'CannyThreshold', obj.CannyThreshold, 'StrelSize', obj.StrelSize);
+                stageTimes.canny = preprocessTimes.canny;
+                stageTimes.close = preprocessTimes.close;
+
+                tStage = tic;
+                obj.Density = slotEdgeDensity(morphImage, obj.Slots);
+                stageTimes.density = toc(tStage);
+
+                tStage = tic;
+                obj.gradientMax = cannyGradientMax(gray);
+                stageTimes.gradient = toc(tStage);
+                obj.referenceGray = gray;
+                changed = true(nSlots, 1);
+            else
+                % --- Change-Gated Re-evaluation ---
+                tStage = tic;
+                [deltaSum, pixelCounts] = slotPixelSums(imabsdiff(gray, obj.referenceGray), obj.Slots);
+                changed = deltaSum ./ max(pixelCounts, 1) > obj.ChangeDelta;
+                stageTimes.change = toc(tStage);
+
+                tStage = tic;
+                if any(changed)
+                    obj.Density(changed) = roiSlotDensity(gray, obj.Slots(changed,:), obj.gradientMax, ...
+                        'CannyThreshold', obj.CannyThreshold, 'StrelSize', obj.StrelSize, 'Halo', obj.Halo);
+
+                    bounds = slotPixelBounds(obj.Slots(changed,:), size(gray));
+                    for i = 1:size(bounds, 1)
+                        rows = bounds(i,1):bounds(i,2);
+                        cols = bounds(i,3):bounds(i,4);
+                        obj.referenceGray(rows, cols) = gray(rows, cols);
+                    end
+                end
+                stageTimes.roiDensity = toc(tStage);
+            end
+
+            obj.SlotsEvaluated = obj.SlotsEvaluated + nnz(changed);
+            tStage = tic;
+            [results, summary] = classifySlots(obj.Slots, obj.Density, obj.Threshold);
+            stageTimes.classify = toc(tStage);
+
+            frameInfo.fullRefresh = fullRefresh;
+            frameInfo.slotsEvaluated = nnz(changed);
+            frameInfo.elapsed = toc(t0);
+            frameInfo.stageTimes = stageTimes;
+
+            tel = ParkingTelemetry.instance();
+            if tel.Enabled
+                record(tel, struct('source', 'stream', 'lot', obj.Lot, ...
+                    'imageSize', size(frame), 'slots', nSlots, 'stages', stageTimes, ...
+                    'cacheHits', nSlots - nnz(changed), 'elapsed', frameInfo.elapsed));
+            end
+        end
+
+        function reset(obj)
+            %RESET Forget all per-slot state; the next frame runs in full.
+            obj.Density = [];
+            obj.FrameCount = 0;
+            obj.SlotsEvaluated = 0;
+            obj.referenceGray = [];
+            obj.gradientMax = [];
+        end
+    end
+end
@@ -0,0 +1,259 @@
+classdef ParkingTelemetry < handle
+%PARKINGTELEMETRY Per-stage timing telemetry of detection runs.
+%   TEL = PARKINGTELEMETRY.INSTANCE returns the telemetry recorder shared
+%   by detectParkingSlots and ParkingStreamDetector in this MATLAB
+%   process. It is disabled by default; while disabled a detection run
+%   only pays for one property read.
+%
+%   Once enabled, every run is recorded with its timestamp, source, lot,
+%   image size, slot count, cache hits, total elapsed time and the wall
+%   time of each pipeline stage (for example gray, canny, close, density
+%   and classify). The last WindowSize runs are kept in memory for
+%   stageSummary and stageHistogram, and every run can also be appended
+%   to a JSON-lines log file, one jsonencode'd run per line.
+%
+%   Telemetry is per process: runs made on parallel pool workers (see
+%   runParkingJobs) are recorded by the workers' own instances, so enable
+%   a log file on the workers, e.g. with parfevalOnAll, to collect them.
+%
+%   PARKINGTELEMETRY properties:
+%     Enabled     - Record runs (read-only, see enable and disable)
+%     WindowSize  - Runs kept in memory (default 1000)
+%     LogFile     - JSON-lines log file, '' for none (read-only)
+%
+%   PARKINGTELEMETRY methods:
+%     instance        - Shared recorder of this process (static)
+%     enable          - Start recording, optionally to a log file
+%     disable         - Stop recording and close the log file
+%     record          - Add one run
+%     recentRuns      - Runs in the window, oldest first
+%     stageSummary    - Count, mean and percentiles per stage
+%     stageHistogram  - Log-spaced histogram of one stage
+%     reset           - Forget the recorded runs
+%
+%   Example:
+%     tel = ParkingTelemetry.instance();
+%     enable(tel, 'LogFile', 'detection.jsonl');
+%     detectParkingSlots(img, slots, 'Lot', 'north');
+%     disp(stageSummary(tel));
+%
+%   See also detectParkingSlots, ParkingStreamDetector.
+
+    properties (SetAccess = private)
+        Enabled = false
+        LogFile = ''
+    end
+
+    properties
+        WindowSize = 1000
+    end
+
+    properties (Access = private)
+        runs             % Ring buffer of recorded runs
+        next = 1         % Ring slot of the next run
+        count = 0        % Runs in the ring
+        fid = -1         % Open log file
+    end
+
+    properties (Constant)
+        HistogramEdges = logspace(-5, 3, 41)  % Seconds, 5 bins per decade
+    end
+
+    methods (Access = private)
+        function tel = ParkingTelemetry()
+            tel.runs = cell(1, tel.WindowSize);
+        end
+    end
+
+    methods (Static)
+        function tel = instance()
+            %INSTANCE Shared recorder of this MATLAB process.
+            persistent shared
+            if isempty(shared) || ~isvalid(shared)
+                shared = ParkingTelemetry();
+            end
+            tel = shared;
+        end
+    end
+
+    methods
+        function enable(tel, opts)
+            %ENABLE Start recording runs.
+            %   ENABLE(TEL) records runs in memory. ENABLE(TEL, 'LogFile',
+            %   FILE) also appends every run to the JSON-lines FILE.
+            %   ENABLE(TEL, 'WindowSize', N) keeps the last N runs.
+            arguments
+                tel
+                opts.LogFile {mustBeTextScalar} = ''
+                opts.WindowSize double {mustBePositive, mustBeInteger} = []
+            end
+
+            closeLog(tel);
+            if ~isempty(opts.WindowSize)
+                tel.WindowSize = opts.WindowSize;
+            end
+            if strlength(opts.LogFile) > 0
+                tel.fid = fopen(opts.LogFile, 'a');
+                if tel.fid < 0
+                    error('ParkingTelemetry:logFile', 'Cannot open %s for writing.', opts.LogFile);
+                end
+                tel.LogFile = char(opts.LogFile);
+            end
+            tel.Enabled = true;
+        end
+
+        function disable(tel)
+            %DISABLE Stop recording and close the log file.
+            tel.Enabled = false;
+            closeLog(tel);
+        end
+
+        function set.WindowSize(tel, value)
+            arguments
+                tel
+                value (1,1) double {mustBePositive, mustBeInteger}
+            end
+            % Keep the most recent runs that still fit
+            kept = recentRuns(tel);
+            kept = kept(max(1, end - value + 1):end);
+            tel.WindowSize = value;
+            tel.runs = cell(1, value);
+            tel.runs(1:numel(kept)) = kept;
+            tel.count = numel(kept);
+            tel.next = mod(tel.count, value) + 1;
+        end
+
+        function record(tel, run)
+            %RECORD Add one run.
+            %   RECORD(TEL, RUN) stores the struct RUN, which has at least
+            %   the field stages, a struct of stage times in seconds.
+            %   Missing timestamp, source, lot, imageSize, slots,
+            %   cacheHits and elapsed fields are filled in.
+            if ~isfield(run, 'timestamp')
+                run.timestamp = char(datetime('now', 'Format', 'yyyy-MM-dd''T''HH:mm:ss.SSS'));
+            end
+            defaults = {'source', ''; 'lot', ''; 'imageSize', []; 'slots', 0; ...
+                'cacheHits', 0; 'elapsed', NaN};
+            for k = 1:size(defaults, 1)
+                if ~isfield(run, defaults{k,1})
+                    run.(defaults{k,1}) = defaults{k,2};
+                end
+            end
+
+            tel.runs{tel.next} = run;
+            tel.next = mod(tel.next, tel.WindowSize) + 1;
+            tel.count = min(tel.count + 1, tel.WindowSize);
+
+            if tel.fid > 0
+                fprintf(tel.fid, '%s\n', jsonencode(run));
+            end
+        end
+
+        function runs = recentRuns(tel)
+            %RECENTRUNS Runs in the window, oldest first, as a cell array.
+            if tel.count < numel(tel.runs)
+                runs = tel.runs(1:tel.count);
+            else
+                runs = tel.runs([tel.next:end, 1:tel.next-1]);
+            end
+        end
+
+        function T = stageSummary(tel, lot)
+            %STAGESUMMARY Timing statistics per stage.
+            %   T = STAGESUMMARY(TEL) returns a table with one row per
+            %   stage seen in the window and the variables count, mean,
+            %   p50, p95, p99 and max, in seconds. The total elapsed time
+            %   of the runs is the last row.
+            %
+            %   T = STAGESUMMARY(TEL, LOT) only uses the runs of LOT.
+            arguments
+                tel
+                lot {mustBeTextScalar} = ''
+            end
+
+            [times, stage] = stageTimes(tel, lot);
+            nStages = numel(stage);
+            count = zeros(nStages, 1);
+            stats = nan(nStages, 5);
+            for s = 1:nStages
+                t = times(~isnan(times(:,s)), s);
+                count(s) = numel(t);
+                if ~isempty(t)
+                    t = sort(t);
+                    % Nearest-rank percentiles
+                    rank = max(1, ceil([0.50 0.95 0.99] * numel(t)));
+                    stats(s,:) = [mean(t), t(rank)', t(end)];
+                end
+            end
+            stage = stage(:);
+            T = table(stage, count, stats(:,1), stats(:,2), stats(:,3), stats(:,4), stats(:,5), ...
+                'VariableNames', {'stage', 'count', 'mean', 'p50', 'p95', 'p99', 'max'});
+        end
+
+        function [counts, edges] = stageHistogram(tel, stage, lot)
+            %STAGEHISTOGRAM Histogram of one stage's times.
+            %   [COUNTS, EDGES] = STAGEHISTOGRAM(TEL, STAGE) counts the runs
+            %   of the window per log-spaced time bin from 10 us to 1000 s
+            %   (HistogramEdges). STAGE is a stage name or 'elapsed'.
+            %   STAGEHISTOGRAM(TEL, STAGE, LOT) only uses the runs of LOT.
+            arguments
+                tel
+                stage {mustBeTextScalar}
+                lot {mustBeTextScalar} = ''
+            end
+
+            [times, names] = stageTimes(tel, lot);
+            edges = ParkingTelemetry.HistogramEdges;
+            column = strcmp(names, stage);
+            if any(column)
+                counts = histcounts(times(:,column), edges);
+            else
+                counts = zeros(1, numel(edges) - 1);
+            end
+        end
+
+        function reset(tel)
+            %RESET Forget the recorded runs; the log file is kept.
+            tel.runs = cell(1, tel.WindowSize);
+            tel.next = 1;
+            tel.count = 0;
+        end
+
+        function delete(tel)
+            closeLog(tel);
+        end
+    end
+
+    methods (Access = private)
+        function [times, stage] = stageTimes(tel, lot)
+            % Runs-by-stages matrix of seconds, NaN where a run had no such
+            % stage; the total elapsed time is the last column
+            runs = recentRuns(tel);
+            if strlength(lot) > 0
+                runs = runs(cellfun(@(r) strcmp(r.lot, lot), runs));
+            end
+
+            stage = {};
+            for k = 1:numel(runs)
+                stage = [stage, setdiff(fieldnames(runs{k}.stages)', stage, 'stable')]; %#ok<AGROW>
+            end
+            stage{end+1} = 'elapsed';
+
+            times = nan(numel(runs), numel(stage));
+            for k = 1:numel(runs)
+                names = fieldnames(runs{k}.stages);
+                [~, column] = ismember(names, stage);
+                times(k, column) = cellfun(@(f) runs{k}.stages.(f), names);
+                times(k, end) = runs{k}.elapsed;
+            end
+        end
+
+        function closeLog(tel)
+            if tel.fid > 0
+                fclose(tel.fid);
+            end
+            tel.fid = -1;
+            tel.LogFile = '';
+        end
+    end
+end
@@ -0,0 +1,284 @@
+classdef SlotBackgroundModel < handle
+%SLOTBACKGROUNDMODEL Frame-by-frame slot detection against an empty-lot model.
+%   MODEL = SLOTBACKGROUNDMODEL(SLOTS) creates a detector for a fixed
+%   camera and the N-by-4 [x y width height] slot matrix SLOTS. It learns
+%   what each slot looks like when empty: a running mean of its gray
+%   levels and of its edge density, updated from every frame in which the
+%   slot is classified Empty. Each call to STEP classifies one frame.
+%
+%   The first frame runs the full detectParkingSlots pipeline. On later
+%   frames every slot is first compared with its empty reference by the
+%   mean absolute gray-level difference of its pixels, which costs one
+%   gather and one cumulative sum over the slot pixels:
+%     - a slot within EmptyDelta of its reference is Empty, with the
+%       edge density learned for it,
+%     - a slot at least OccupiedDelta away from its reference that was
+%       Occupied when last evaluated stays Occupied,
+%     - any other slot, and every slot not yet seen empty, is ambiguous
+%       and its edge density is computed with Canny on a padded crop
+%       (see roiSlotDensity).
+%   On a fixed view most slots are decided by the difference alone, so
+%   Canny runs on a small share of the slots. A global lighting change
+%   makes slots ambiguous rather than misclassified; the Canny fallback
+%   then finds the empty ones and their references adapt.
+%
+%   MODEL = SLOTBACKGROUNDMODEL(SLOTS, Name, Value) sets the properties
+%   below. Setting Slots or Threshold later resets the model: its pixel
+%   references belong to the old layout, and its empty densities were
+%   learned from slots classified at the old threshold.
+%
+%   SLOTBACKGROUNDMODEL properties:
+%     Threshold        - Edge density threshold (default 0.07)
+%     EmptyDelta       - Mean absolute difference, in gray levels of the
+%                        input (0-255 for uint8), up to which a slot
+%                        matches its empty reference (default 6)
+%     OccupiedDelta    - Difference from which a slot last seen Occupied
+%                        stays Occupied without Canny (default 25)
+%     LearningRate     - Weight of a new empty observation in the running
+%                        means (default 0.05)
+%     RefreshInterval  - Evaluate every slot with Canny every this many
+%                        frames; 0 only on the first frame (default 0)
+%     CannyThreshold   - Canny [low high] thresholds (default [0.1 0.2])
+%     StrelSize        - Closing rectangle size (default [3 3])
+%     Halo             - Crop padding for evaluated slots (default 16)
+%     Lot              - Lot name frames are recorded under in
+%                        ParkingTelemetry (default '')
+%     Density          - Last edge density of every slot (read-only)
+%     EmptyDensity     - Learned empty edge density, NaN until a slot is
+%                        seen empty (read-only)
+%     Trained          - Slots seen empty at least once (read-only)
+%
+%   SLOTBACKGROUNDMODEL methods:
+%     step             - Process the next frame
+%     backgroundImage  - The empty-lot reference as an image
+%     reset            - Forget the model
+%
+%   Example:
+%     model = SlotBackgroundModel(slots, 'EmptyDelta', 8);
+%     v = VideoReader('lot.mp4');
+%     while hasFrame(v)
+%         [results, summary, frameInfo] = step(model, readFrame(v));
+%     end
+%
+%   When ParkingTelemetry.instance is enabled every frame is recorded
+%   there, with the slots decided by the model counted as cache hits.
+%
+%   See also ParkingStreamDetector, detectParkingStream, roiSlotDensity.
+
+    properties
+        Slots
+        Threshold = 0.07
+        EmptyDelta = 6
+        OccupiedDelta = 25
+        LearningRate = 0.05
+        RefreshInterval = 0
+        CannyThreshold = [0.1 0.2]
+        StrelSize = [3 3]
+        Halo = 16
+        Lot = ''
+    end
+
+    properties (SetAccess = private)
+        Density          % Last edge density of every slot
+        EmptyDensity     % Running mean edge density of every slot when empty
+        Trained          % Slots seen empty at least once
+        FrameCount = 0   % Frames processed since the last reset
+        SlotsEvaluated = 0 % Canny slot evaluations since the last reset
+    end
+
+    properties (Access = private)
+        masks            % compileSlotMasks pixel lists of the slots
+        reference        % Running mean gray level of every slot pixel, as masks.pixelIdx
+        gradientMax      % Canny gradient scale of the last full frame
+    end
+
+    methods
+        function model = SlotBackgroundModel(slots, opts)
+            arguments
+                slots (:,4) double
+                opts.Threshold (1,1) double = 0.07
+                opts.EmptyDelta (1,1) double {mustBeNonnegative} = 6
+                opts.OccupiedDelta (1,1) double {mustBeNonnegative} = 25
+                opts.LearningRate (1,1) double {mustBeInRange(opts.LearningRate, 0, 1)} = 0.05
+                opts.RefreshInterval (1,1) double {mustBeNonnegative, mustBeInteger} = 0
+                opts.CannyThreshold (1,2) double = [0.1 0.2]
+                opts.StrelSize (1,2) double = [3 3]
+                opts.Halo (1,1) double {mustBeNonnegative, mustBeInteger} = 16
+                opts.Lot {mustBeTextScalar} = ''
+            end
+
+            model.Slots = slots;
+            model.Threshold = opts.Threshold;
+            model.EmptyDelta = opts.EmptyDelta;
+            model.OccupiedDelta = opts.OccupiedDelta;
+            model.LearningRate = opts.LearningRate;
+            model.RefreshInterval = opts.RefreshInterval;
+            model.CannyThreshold = opts.CannyThreshold;
+            model.StrelSize = opts.StrelSize;
+            model.Halo = opts.Halo;
+            model.Lot = char(opts.Lot);
+        end
+
+        function [results, summary, frameInfo] = step(model, frame)
+            %STEP Process the next frame.
+            %   [RESULTS, SUMMARY, FRAMEINFO] = STEP(MODEL, FRAME) returns
+            %   the classifySlots RESULTS and SUMMARY for FRAME and updates
+            %   the model from the slots found Empty. FRAMEINFO has fields
+            %   fullRefresh, slotsEvaluated (by Canny), slotsMatchedEmpty,
+            %   slotsKeptOccupied, elapsed and stageTimes.
+            t0 = tic;
+
+            if size(frame, 3) == 3
+                gray = rgb2gray(frame);
+            else
+                gray = frame;
+            end
+            stageTimes.gray = toc(t0);
+
+            model.FrameCount = model.FrameCount + 1;
+            nSlots = size(model.Slots, 1);
+
+            fullRefresh = isempty(model.masks) ...
+                || ~isequal(size(gray), model.masks.imageSize) ...
+                || numel(model.Density) ~= nSlots;
+            periodic = model.RefreshInterval > 0 && mod(model.FrameCount - 1, model.RefreshInterval) == 0;
+            matchesEmpty = false(nSlots, 1);
+            keptOccupied = false(nSlots, 1);
+
+            if fullRefresh
+                % --- Full Pipeline, Starting a New Model ---
+                [~, ~, morphImage, preprocessTimes] = parkingPreprocess(gray, ...
+                    'CannyThreshold', model.CannyThreshold, 'StrelSize', model.StrelSize);
+                stageTimes.canny = preprocessTimes.canny;
+                stageTimes.close = preprocessTimes.close;
+
+                tStage = tic;
+                model.Density = slotEdgeDensity(morphImage, model.Slots);
+                stageTimes.density = toc(tStage);
+
+                tStage = tic;
+                model.gradientMax = cannyGradientMax(gray);
+                model.masks = compileSlotMasks(model.Slots, size(gray));
+                model.reference = zeros(size(model.masks.pixelIdx), 'single');
+                model.EmptyDensity = nan(nSlots, 1);
+                model.Trained = false(nSlots, 1);
+                stageTimes.model = toc(tStage);
+                evaluated = true(nSlots, 1);
+            else
+                % --- Per-slot Difference Against the Empty Reference ---
+                tStage = tic;
+                start = model.masks.slotStart;
+                differences = abs(double(gray(model.masks.pixelIdx)) - double(model.reference));
+                counts = [0; cumsum(differences)];
+                difference = (counts(start(2:end)) - counts(start(1:end-1))) ./ max(diff(start), 1);
+                stageTimes.difference = toc(tStage);
+
+                if ~periodic
+                    matchesEmpty = model.Trained & difference <= model.EmptyDelta;
+                    keptOccupied = model.Trained & ~matchesEmpty & difference >= model.OccupiedDelta ...
+                        & model.Density > model.Threshold;
+                end
+                evaluated = ~(matchesEmpty | keptOccupied);
+                model.Density(matchesEmpty) = model.EmptyDensity(matchesEmpty);
+
+                % --- Canny Fallback for Ambiguous Slots ---
+                if periodic
+                    tStage = tic;
+                    model.gradientMax = cannyGradientMax(gray);
+                    stageTimes.gradient = toc(tStage);
+                end
+                tStage = tic;
+                if any(evaluated)
+                    model.Density(evaluated) = roiSlotDensity(gray, model.Slots(evaluated,:), model.gradientMax, ...
+                        'CannyThreshold', model.CannyThreshold, 'StrelSize', model.StrelSize, 'Halo', model.Halo);
+                end
+                stageTimes.roiDensity = toc(tStage);
+            end
+
+            model.SlotsEvaluated = model.SlotsEvaluated + nnz(evaluated);
+            tStage = tic;
+            [results, summary] = classifySlots(model.Slots, model.Density, model.Threshold);
+            stageTimes.classify = toc(tStage);
+
+            % --- Model Update from the Slots Seen Empty ---
+            tStage = tic;
+            empty = results.status == 0;
+            if any(empty)
+                rate = repmat(model.LearningRate, nSlots, 1);
+                rate(~model.Trained) = 1;
+
+                [positions, slotOf] = rangePositions(model.masks.slotStart, find(empty));
+                pixelRate = single(rate(slotOf));
+                observed = single(gray(model.masks.pixelIdx(positions)));
+                model.reference(positions) = model.reference(positions) ...
+                    + pixelRate .* (observed - model.reference(positions));
+
+                measured = empty & evaluated;
+                model.EmptyDensity(measured & ~model.Trained) = model.Density(measured & ~model.Trained);
+                learned = measured & model.Trained;
+                model.EmptyDensity(learned) = model.EmptyDensity(learned) ...
+                    + model.LearningRate * (model.Density(learned) - model.EmptyDensity(learned));
+                model.Trained(empty) = true;
+            end
+            stageTimes.update = toc(tStage);
+
+            frameInfo.fullRefresh = fullRefresh;
+            frameInfo.slotsEvaluated = nnz(evaluated);
+            frameInfo.slotsMatchedEmpty = nnz(matchesEmpty);
+            frameInfo.slotsKeptOccupied = nnz(keptOccupied);
+            frameInfo.elapsed = toc(t0);
+            frameInfo.stageTimes = stageTimes;
+
+            tel = ParkingTelemetry.instance();
+            if tel.Enabled
+                record(tel, struct('source', 'background', 'lot', model.Lot, ...
+                    'imageSize', size(frame), 'slots', nSlots, 'stages', stageTimes, ...
+                    'cacheHits', nSlots - nnz(evaluated), 'elapsed', frameInfo.elapsed));
+            end
+        end
+
+        function img = backgroundImage(model)
+            %BACKGROUNDIMAGE The empty-lot reference as an image.
+            %   IMG = BACKGROUNDIMAGE(MODEL) returns a uint8 gray image of
+            %   the frame size with the learned reference of every trained
+            %   slot and zeros elsewhere.
+            img = zeros(0, 0, 'uint8');
+            if isempty(model.masks)
+                return;
+            end
+            img = zeros(model.masks.imageSize, 'uint8');
+            positions = rangePositions(model.masks.slotStart, find(model.Trained));
+            img(model.masks.pixelIdx(positions)) = uint8(model.reference(positions));
+        end
+
+        function reset(model)
+            %RESET Forget the model; the next frame runs in full.
+            model.Density = [];
+            model.EmptyDensity = [];
+            model.Trained = [];
+            model.FrameCount = 0;
+            model.SlotsEvaluated = 0;
+            model.masks = [];
+            model.reference = [];
+            model.gradientMax = [];
+        end
+
+        function set.Slots(model, value)
+            arguments
+                model
+                value (:,4) double
+            end
+            model.Slots = value;
+            reset(model);
+        end
+
+        function set.Threshold(model, value)
+            arguments
+                model
+                value (1,1) double
+            end
+            model.Threshold = value;
+            reset(model);
+        end
+    end
+end
@@ -0,0 +1,228 @@
+classdef SlotDensityKernel < handle
+%SLOTDENSITYKERNEL Fused row-band slot edge density with a reusable workspace.
+%   KERNEL = SLOTDENSITYKERNEL(SLOTS, IMAGESIZE) prepares the slot edge
+%   density of the N-by-4 [x y width height] SLOTS on frames of size
+%   IMAGESIZE. RUN then computes the densities of a frame without ever
+%   holding a full-size gray, Canny or closed image: the frame is
+%   streamed in bands of BandHeight rows, padded by Halo rows, and each
+%   band is converted to gray, edge-detected, closed and counted into the
+%   slots it overlaps before the next band is read.
+%
+%   A frame takes two passes over the bands:
+%     1. The Canny gradient magnitude of every band is computed. The
+%        maximum over the band cores gives the global scale edge() would
+%        use on the whole frame, and the maximum over the whole band is
+%        kept for pass 2 (skipped if 'GradientMax' is given).
+%     2. Canny, with thresholds relative to the global scale, and
+%        closing run on the bands that overlap a slot, and the edge
+%        pixels of each slot are summed over the band cores.
+%   edge() in pass 2 computes the gradient of each slot band again, so a
+%   band with slots has its gradient computed twice per frame, and once
+%   when 'GradientMax' is given. Passing the band maximum of pass 1 to
+%   cannyEdgesScaled only saves the third computation it would otherwise
+%   make to rescale the thresholds.
+%
+%   Everything that only depends on the slots and frame size is built
+%   once by the constructor and reused for every frame: the band rows,
+%   the slots of each band and their pixel ranges in band coordinates,
+%   the structuring element and the count buffers. Peak memory per frame
+%   is that of one band rather than several full-size images.
+%
+%   Accuracy: the halo covers the Gaussian support of the gradient,
+%   non-maximum suppression and the closing, so every band core sees the
+%   same gradient and local maxima as in the full image. As with
+%   roiSlotDensity, only Canny hysteresis can differ from
+%   parkingPreprocess followed by slotEdgeDensity: a weak edge in a band
+%   core is kept only if it connects to a strong one inside the padded
+%   band, and the replicated band border can create or drop strong
+%   pixels in the outer halo rows. Each differing pixel moves a slot's
+%   density by 1 / (width * height), so there is no general bound: a slot
+%   whose weak edges all reach a strong edge only beyond the halo loses
+%   all of them. Tolerance (0.01) is the difference benchFusedKernel
+%   accepts on synthetic lots; its 'chains' scene builds that worst case
+%   and reports how far the densities move there.
+%
+%   KERNEL = SLOTDENSITYKERNEL(SLOTS, IMAGESIZE, Name, Value) sets:
+%     'BandHeight'      Rows per band (default 256)
+%     'Halo'            Rows of padding above and below (default 16)
+%     'CannyThreshold'  Canny [low high] thresholds (default [0.1 0.2])
+%     'StrelSize'       Closing rectangle size (default [3 3])
+%
+%   SLOTDENSITYKERNEL methods:
+%     run   - Slot edge densities of a frame
+%     fits  - True if the kernel was built for the given slots and frame
+%
+%   Example:
+%     kernel = SlotDensityKernel(slots, size(frame));
+%     density = run(kernel, frame);
+%     [results, summary] = classifySlots(slots, density, 0.07);
+%
+%   See also detectParkingSlots, tiledSlotDensity, roiSlotDensity,
+%   cannyEdgesScaled.
+
+    properties (Constant)
+        Tolerance = 0.01 % Density difference from the full-image pipeline accepted on synthetic lots
+    end
+
+    properties (SetAccess = private)
+        Slots
+        ImageSize
+        BandHeight = 256
+        Halo = 16
+        CannyThreshold = [0.1 0.2]
+        StrelSize = [3 3]
+        Bands            % Struct array of rows, cropRows, coreRows, slotIdx and localBounds
+    end
+
+    properties (Access = private)
+        se               % Closing structuring element
+        slotArea         % Density denominator of every slot
+        bandMax          % Gradient maximum of every band crop, from pass 1
+        counts           % Edge pixel count of every slot
+    end
+
+    methods
+        function kernel = SlotDensityKernel(slots, imageSize, opts)
+            arguments
+                slots (:,4) double
+                imageSize (1,:) double
+                opts.BandHeight (1,1) double {mustBePositive, mustBeInteger} = 256
+                opts.Halo (1,1) double {mustBeNonnegative, mustBeInteger} = 16
+                opts.CannyThreshold (1,2) double = [0.1 0.2]
+                opts.StrelSize (1,2) double = [3 3]
+            end
+
+            kernel.Slots = slots;
+            kernel.ImageSize = imageSize(1:2);
+            kernel.BandHeight = opts.BandHeight;
+            kernel.Halo = opts.Halo;
+            kernel.CannyThreshold = opts.CannyThreshold;
+            kernel.StrelSize = opts.StrelSize;
+
+            m = imageSize(1);
+            bounds = slotPixelBounds(slots, imageSize(1:2));
+            inImage = bounds(:,2) >= bounds(:,1) & bounds(:,4) >= bounds(:,3);
+
+            % --- Band Layout and the Slot Ranges of Every Band ---
+            first = 1:opts.BandHeight:m;
+            last = min(first + opts.BandHeight - 1, m);
+            bands = struct('rows', cell(numel(first), 1), 'cropRows', [], ...
+                'coreRows', [], 'slotIdx', [], 'localBounds', []);
+            for b = 1:numel(first)
+                cropRows = [max(first(b) - opts.Halo, 1), min(last(b) + opts.Halo, m)];
+                idx = find(inImage & bounds(:,1) <= last(b) & bounds(:,2) >= first(b));
+                localBounds = [max(bounds(idx,1), first(b)), min(bounds(idx,2), last(b)), ...
+                    bounds(idx,3), bounds(idx,4)];
+                localBounds(:,1:2) = localBounds(:,1:2) - first(b) + 1;
+
+                bands(b).rows = [first(b) last(b)];
+                bands(b).cropRows = cropRows;
+                bands(b).coreRows = (first(b):last(b)) - cropRows(1) + 1;
+                bands(b).slotIdx = idx;
+                bands(b).localBounds = localBounds;
+            end
+            kernel.Bands = bands;
+
+            kernel.se = strel('rectangle', opts.StrelSize);
+            kernel.slotArea = slots(:,3) .* slots(:,4);
+            kernel.bandMax = zeros(numel(bands), 1);
+            kernel.counts = zeros(size(slots, 1), 1);
+        end
+
+        function [density, info] = run(kernel, img, opts)
+            %RUN Slot edge densities of a frame.
+            %   DENSITY = RUN(KERNEL, IMG) returns the N-by-1 edge density
+            %   of every slot of the RGB or gray frame IMG.
+            %
+            %   [DENSITY, INFO] = RUN(...) also returns INFO with the
+            %   gradientMax used, the number of bands of each pass and the
+            %   seconds each pass took.
+            %
+            %   Name-value options:
+            %     'GradientMax'  Known Canny gradient scale, e.g. of an
+            %                    earlier frame of the same camera; skips
+            %                    pass 1 (default [])
+            %     'ProgressFcn'  Function called as FCN(FRACTION) after
+            %                    each band of pass 2 (default [])
+            arguments
+                kernel
+                img {mustBeNumericOrLogical}
+                opts.GradientMax double = []
+                opts.ProgressFcn = []
+            end
+
+            if ~isequal([size(img, 1) size(img, 2)], kernel.ImageSize)
+                error('SlotDensityKernel:size', ...
+                    'The frame is %d-by-%d but the kernel was built for %d-by-%d.', ...
+                    size(img, 1), size(img, 2), kernel.ImageSize);
+            end
+            bands = kernel.Bands;
+
+            % --- Pass 1: Global Canny Gradient Scale ---
+            tPass = tic;
+            gradientMax = opts.GradientMax;
+            gradientBands = 0;
+            if isempty(gradientMax)
+                coreMax = zeros(numel(bands), 1);
+                for b = 1:numel(bands)
+                    [~, magnitude] = cannyGradientMax(bandGray(img, bands(b).cropRows));
+                    coreMax(b) = max(magnitude(bands(b).coreRows, :), [], 'all');
+                    kernel.bandMax(b) = max(magnitude, [], 'all');
+                end
+                gradientMax = double(max(coreMax));
+                gradientBands = numel(bands);
+            end
+            gradientTime = toc(tPass);
+
+            % --- Pass 2: Gray, Canny, Closing and Slot Counts per Band ---
+            tPass = tic;
+            kernel.counts(:) = 0;
+            slotBands = find(~cellfun(@isempty, {bands.slotIdx}));
+            for k = 1:numel(slotBands)
+                band = bands(slotBands(k));
+                crop = bandGray(img, band.cropRows);
+                if gradientBands > 0
+                    cannyCrop = cannyEdgesScaled(crop, kernel.CannyThreshold, gradientMax, ...
+                        kernel.bandMax(slotBands(k)));
+                else
+                    cannyCrop = cannyEdgesScaled(crop, kernel.CannyThreshold, gradientMax);
+                end
+                morphCore = imclose(cannyCrop, kernel.se);
+                morphCore = morphCore(band.coreRows, :);
+                kernel.counts(band.slotIdx) = kernel.counts(band.slotIdx) ...
+                    + boundsPixelSums(morphCore, band.localBounds);
+
+                if ~isempty(opts.ProgressFcn)
+                    opts.ProgressFcn(k / numel(slotBands));
+                end
+            end
+            density = kernel.counts ./ kernel.slotArea;
+
+            info.gradientMax = gradientMax;
+            info.gradientBands = gradientBands;
+            info.slotBands = numel(slotBands);
+            info.gradientTime = gradientTime;
+            info.densityTime = toc(tPass);
+        end
+
+        function tf = fits(kernel, slots, imageSize, cannyThreshold, strelSize)
+            %FITS True if the kernel was built for the given slots and frame.
+            %   TF = FITS(KERNEL, SLOTS, IMAGESIZE, CANNYTHRESHOLD,
+            %   STRELSIZE) is true when RUN computes the densities of SLOTS
+            %   on frames of IMAGESIZE with those Canny thresholds and
+            %   closing size, so the kernel can be reused.
+            tf = isequal(kernel.Slots, slots) ...
+                && isequal(kernel.ImageSize, imageSize(1:2)) ...
+                && isequal(kernel.CannyThreshold, cannyThreshold) ...
+                && isequal(kernel.StrelSize, strelSize);
+        end
+    end
+end
+
+function gray = bandGray(img, rows)
+    % Gray copy of rows(1):rows(2) of the frame
+    gray = img(rows(1):rows(2), :, :);
+    if size(gray, 3) == 3
+        gray = rgb2gray(gray);
+    end
+end
@@ -0,0 +1,95 @@
+function T = benchBackgroundModel(megapixels, nSlots, nFrames, switchRate)
+%BENCHBACKGROUNDMODEL Frame rate and agreement of the streaming detectors.
+%   T = BENCHBACKGROUNDMODEL simulates 200 frames of a fixed 4 MP camera
+%   over a synthetic lot of 200 bays (see syntheticParkingLot). Every bay
+%   switches between empty and occupied with probability 0.02 per frame
+%   and every frame gets sensor noise of 2 gray levels. The sequence is
+%   processed with
+%     full        detectParkingSlots on every frame
+%     change      ParkingStreamDetector (default ChangeDelta)
+%     background  SlotBackgroundModel (default deltas)
+%   and T reports for each method the frames per second, the speedup over
+%   full, the mean share of slots evaluated with Canny per frame, and the
+%   fraction of slot statuses that agree with full detection and with the
+%   ground truth.
+%
+%   T = BENCHBACKGROUNDMODEL(MEGAPIXELS, NSLOTS, NFRAMES, SWITCHRATE) sets
+%   the frame size, the bay count, the frame count and the per-frame
+%   switching probability.
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchBackgroundModel
+%
+%   See also SlotBackgroundModel, ParkingStreamDetector, syntheticParkingLot.
+
+    arguments
+        megapixels (1,1) double {mustBePositive} = 4
+        nSlots (1,1) double {mustBePositive, mustBeInteger} = 200
+        nFrames (1,1) double {mustBePositive, mustBeInteger} = 200
+        switchRate (1,1) double {mustBeInRange(switchRate, 0, 1)} = 0.02
+    end
+
+    % --- Frame Sequence ---
+    [emptyLot, slots] = syntheticParkingLot(megapixels, nSlots, 0, false(nSlots, 1));
+    fullLot = syntheticParkingLot(megapixels, nSlots, 0, true(nSlots, 1));
+    emptyLot = emptyLot(:,:,1);
+    fullLot = fullLot(:,:,1);
+    bounds = slotPixelBounds(slots, size(emptyLot));
+
+    rng(1);
+    truth = false(nSlots, nFrames);
+    truth(:, 1) = rand(nSlots, 1) < 0.5;
+    for k = 2:nFrames
+        truth(:, k) = xor(truth(:, k-1), rand(nSlots, 1) < switchRate);
+    end
+
+    frames = cell(nFrames, 1);
+    for k = 1:nFrames
+        gray = emptyLot;
+        for i = find(truth(:, k))'
+            rows = bounds(i,1):bounds(i,2);
+            cols = bounds(i,3):bounds(i,4);
+            gray(rows, cols) = fullLot(rows, cols);
+        end
+        frames{k} = uint8(double(gray) + 2 * randn(size(gray)));
+    end
+
+    % --- Methods ---
+    names = {'full', 'change', 'background'};
+    status = cell(numel(names), 1);
+    evaluated = zeros(numel(names), 1);
+    framesPerSecond = zeros(numel(names), 1);
+    for m = 1:numel(names)
+        switch names{m}
+            case 'change'
+                detector = ParkingStreamDetector(slots);
+            case 'background'
+                detector = SlotBackgroundModel(slots);
+        end
+        status{m} = zeros(nSlots, nFrames, 'uint8');
+        nEvaluated = 0;
+        t0 = tic;
+        for k = 1:nFrames
+            if strcmp(names{m}, 'full')
+                results = detectParkingSlots(frames{k}, slots);
+                nEvaluated = nEvaluated + nSlots;
+            else
+                [results, ~, frameInfo] = step(detector, frames{k});
+                nEvaluated = nEvaluated + frameInfo.slotsEvaluated;
+            end
+            status{m}(:, k) = results.status;
+        end
+        framesPerSecond(m) = nFrames / toc(t0);
+        evaluated(m) = nEvaluated / (nSlots * nFrames);
+    end
+
+    method = names';
+    speedup = framesPerSecond / framesPerSecond(1);
+    agreement = cellfun(@(s) mean(s(:) == status{1}(:)), status);
+    accuracy = cellfun(@(s) mean((s(:) == 1) == truth(:)), status);
+    T = table(method, framesPerSecond, speedup, evaluated, agreement, accuracy);
+
+    if nargout == 0
+        disp(T);
+    end
+end
@@ -0,0 +1,126 @@
+function [T, decodeTable] = benchFrameIngest(megapixels, nFrames, prefetch)
+%BENCHFRAMEINGEST Frame decoding cost and the effect of prefetching.
+%   T = BENCHFRAMEINGEST writes 40 synthetic 8 MP lots of 200 bays (see
+%   syntheticParkingLot) as JPEG files to a temporary folder and runs
+%   detectParkingSlots with 'Preprocess' 'pyramid' over them, reading the
+%   frames
+%     imread      with imread, passing the RGB frame on
+%     reader      with a ParkingFrameReader decoding to gray in place
+%     prefetch    with a ParkingFrameReader decoding 4 frames ahead
+%   T reports for each the frames per second, the speedup over imread,
+%   and the reader's megabytes per second and summed decode and wait
+%   seconds.
+%
+%   Before timing, every frame a ParkingFrameReader returns with
+%   'Prefetch' 0, 1 and PREFETCH is compared with rgb2gray of imread of
+%   the same file, and the benchmark stops with an error if a frame is
+%   missing, repeated or out of order.
+%
+%   [T, DECODETABLE] = BENCHFRAMEINGEST also writes the frames as JPEG
+%   2000 and reports, for both formats and reduction levels 0 to 2, the
+%   median seconds ParkingFrameReader.decode takes per frame.
+%
+%   T = BENCHFRAMEINGEST(MEGAPIXELS, NFRAMES, PREFETCH) sets the frame
+%   size, the frame count and the prefetch depth.
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchFrameIngest
+%
+%   See also ParkingFrameReader, detectParkingBatch.
+
+    arguments
+        megapixels (1,1) double {mustBePositive} = 8
+        nFrames (1,1) double {mustBePositive, mustBeInteger} = 40
+        prefetch (1,1) double {mustBePositive, mustBeInteger} = 4
+    end
+
+    folder = tempname;
+    mkdir(folder);
+    cleanup = onCleanup(@() rmdir(folder, 's'));
+    files = cell(nFrames, 1);
+    for k = 1:nFrames
+        [img, slots] = syntheticParkingLot(megapixels, 200, k);
+        files{k} = fullfile(folder, sprintf('frame%04d.jpg', k));
+        imwrite(img, files{k}, 'Quality', 90);
+    end
+
+    % --- Frame Order and Content Check ---
+    for depth = unique([0 1 prefetch])
+        reader = ParkingFrameReader(files, 'Prefetch', depth);
+        k = 0;
+        while hasFrame(reader)
+            k = k + 1;
+            frame = read(reader);
+            if k > nFrames || ~isequal(frame, rgb2gray(imread(files{k})))
+                error('benchFrameIngest:frames', ...
+                    'With Prefetch %d, frame %d does not match %s.', depth, k, files{min(k, nFrames)});
+            end
+        end
+        if k ~= nFrames
+            error('benchFrameIngest:frames', 'With Prefetch %d, %d of %d frames were read.', ...
+                depth, k, nFrames);
+        end
+    end
+
+    % --- Decode and Detect ---
+    names = {'imread', 'reader', 'prefetch'};
+    framesPerSecond = zeros(numel(names), 1);
+    megabytesPerSecond = nan(numel(names), 1);
+    decodeTime = nan(numel(names), 1);
+    waitTime = nan(numel(names), 1);
+    for m = 1:numel(names)
+        reader = [];
+        if strcmp(names{m}, 'reader')
+            reader = ParkingFrameReader(files);
+        elseif strcmp(names{m}, 'prefetch')
+            reader = ParkingFrameReader(files, 'Prefetch', prefetch);
+        end
+
+        t0 = tic;
+        for k = 1:nFrames
+            if isempty(reader)
+                frame = imread(files{k});
+            else
+                frame = read(reader);
+            end
+            detectParkingSlots(frame, slots, 'Preprocess', 'pyramid');
+        end
+        framesPerSecond(m) = nFrames / toc(t0);
+
+        if ~isempty(reader)
+            io = throughput(reader);
+            megabytesPerSecond(m) = io.megabytesPerSecond;
+            decodeTime(m) = io.decodeTime;
+            waitTime(m) = io.waitTime;
+        end
+    end
+
+    method = names';
+    speedup = framesPerSecond / framesPerSecond(1);
+    T = table(method, framesPerSecond, speedup, megabytesPerSecond, decodeTime, waitTime);
+
+    % --- Reduced-Resolution Decode ---
+    if nargout ~= 1
+        jp2 = fullfile(folder, 'frame0001.jp2');
+        imwrite(imread(files{1}), jp2);
+        rows = cell(0, 1);
+        for file = {files{1}, jp2}
+            [~, ~, ext] = fileparts(file{1});
+            for level = 0:2
+                times = zeros(5, 1);
+                for r = 1:numel(times)
+                    [~, info] = ParkingFrameReader.decode(file{1}, 'ReductionLevel', level);
+                    times(r) = info.decodeTime;
+                end
+                rows{end+1, 1} = table({ext}, level, median(times), ...
+                    'VariableNames', {'format', 'reductionLevel', 'decodeTime'}); %#ok<AGROW>
+            end
+        end
+        decodeTable = vertcat(rows{:});
+    end
+
+    if nargout == 0
+        disp(T);
+        disp(decodeTable);
+    end
+end
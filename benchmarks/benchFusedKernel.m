@@ -0,0 +1,110 @@
+function T = benchFusedKernel(megapixels, nSlots, nRepeats, bandHeights)
+%BENCHFUSEDKERNEL Time, memory and accuracy of the fused row-band kernel.
+%   T = BENCHFUSEDKERNEL compares, on synthetic lots (see
+%   syntheticParkingLot) of 4, 12 and 24 MP with 500 bays,
+%     reference  parkingPreprocess followed by slotEdgeDensity, which
+%                holds full-size gray, Canny and closed images
+%     fused      one SlotDensityKernel per image size, reused for every
+%                repeat, at band heights 128 and 256
+%   and reports for every case the median seconds per frame, the speedup
+%   over reference, the measured peak resident memory above the starting
+%   point while the case ran (Linux only, NaN elsewhere), the largest
+%   density difference from the reference and whether it stays within
+%   SlotDensityKernel.Tolerance, and the fraction of slot statuses that
+%   agree at threshold 0.07.
+%
+%   A last scene, 'chains', is the kernel's worst case: weak vertical
+%   edges that reach the only strong edge of the image, at the top, far
+%   above the slots. The full pipeline keeps them through hysteresis;
+%   the bands around the slots never see the strong edge and drop them.
+%   Its rows show how far the densities can move and are expected to be
+%   outside the tolerance.
+%
+%   T = BENCHFUSEDKERNEL(MEGAPIXELS, NSLOTS, NREPEATS, BANDHEIGHTS) sets
+%   the image sizes, the bay count, the runs timed per case (default 5)
+%   and the band heights.
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchFusedKernel
+%
+%   See also SlotDensityKernel, runParkingBenchmarks.
+
+    arguments
+        megapixels (1,:) double {mustBePositive} = [4 12 24]
+        nSlots (1,1) double {mustBePositive, mustBeInteger} = 500
+        nRepeats (1,1) double {mustBePositive, mustBeInteger} = 5
+        bandHeights (1,:) double {mustBePositive, mustBeInteger} = [128 256]
+    end
+
+    scenes = [arrayfun(@(mp) sprintf('%g MP', mp), megapixels, 'UniformOutput', false), {'chains'}];
+    rows = cell(0, 1);
+    for k = 1:numel(scenes)
+        if k <= numel(megapixels)
+            [img, slots] = syntheticParkingLot(megapixels(k), nSlots);
+        else
+            [img, slots] = chainScene();
+        end
+
+        % --- Reference Pipeline ---
+        baseline = residentMemoryMB();
+        resetPeakMemory();
+        [reference, referenceTime] = timed(@() referenceDensity(img, slots), nRepeats);
+        referencePeak = peakMemoryMB() - baseline;
+        rows{end+1, 1} = caseRow(scenes{k}, 'reference', NaN, referenceTime, referenceTime, ...
+            referencePeak, reference, reference); %#ok<AGROW>
+
+        % --- Fused Kernel ---
+        for bandHeight = bandHeights
+            kernel = SlotDensityKernel(slots, size(img), 'BandHeight', bandHeight);
+            baseline = residentMemoryMB();
+            resetPeakMemory();
+            [density, fusedTime] = timed(@() run(kernel, img), nRepeats);
+            fusedPeak = peakMemoryMB() - baseline;
+            rows{end+1, 1} = caseRow(scenes{k}, 'fused', bandHeight, fusedTime, referenceTime, ...
+                fusedPeak, density, reference); %#ok<AGROW>
+        end
+    end
+    T = vertcat(rows{:});
+
+    if nargout == 0
+        disp(T);
+    end
+end
+
+function density = referenceDensity(img, slots)
+    [~, ~, morphImage] = parkingPreprocess(img);
+    density = slotEdgeDensity(morphImage, slots);
+end
+
+function [result, t] = timed(fcn, nRepeats)
+    times = zeros(nRepeats, 1);
+    for r = 1:nRepeats
+        t0 = tic;
+        result = fcn();
+        times(r) = toc(t0);
+    end
+    t = median(times);
+end
+
+function [img, slots] = chainScene()
+    % Gray 1024-by-1536 scene: a strong step at the top and 16-pixel
+    % stripes below it whose edges have 0.15 of its contrast, i.e. weak
+    % edges at the default thresholds, with slots from row 600 down
+    img = repmat(uint8(100), 1024, 1536);
+    img(1:10, :) = 250;
+    for c = 24:32:1536 - 16
+        img(11:end, c:c+15) = 122;
+    end
+    [x, y] = meshgrid(100:300:1300, [600 800]);
+    slots = [x(:), y(:), repmat([200 150], numel(x), 1)];
+end
+
+function row = caseRow(scene, method, bandHeight, time, referenceTime, peakMB, density, reference)
+    maxError = max(abs(density - reference));
+    withinTolerance = maxError <= SlotDensityKernel.Tolerance;
+    agreement = mean((density > 0.07) == (reference > 0.07));
+    row = table({scene}, {method}, bandHeight, time, referenceTime / time, peakMB, ...
+        maxError, withinTolerance, agreement, ...
+        'VariableNames', {'scene', 'method', 'bandHeight', 'time', 'speedup', ...
+        'peakMemoryMB', 'maxDensityError', 'withinTolerance', 'agreement'});
+end
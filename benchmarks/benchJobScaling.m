@@ -0,0 +1,84 @@
+function T = benchJobScaling(workerCounts, nLots, nFrames, megapixels)
+%BENCHJOBSCALING Throughput of runParkingJobs over parallel pool sizes.
+%   T = BENCHJOBSCALING writes 8 synthetic lots of 20 frames each, 4 MP
+%   with 200 bays (see syntheticParkingLot), as JPEG folders with a .pslot
+%   layout to a temporary folder, and runs the manifest of those lots with
+%   runParkingJobs
+%     serially     with 'UseParallel' false
+%     on pools     of 1, 2 and 4 process workers and of the default
+%                  cluster's NumWorkers
+%   T reports for each run the workers, the jobs per second, the speedup
+%   over the serial run and the parallel efficiency (speedup per
+%   worker). Each pool runs one job before the timed run so worker
+%   startup is not counted.
+%
+%   T = BENCHJOBSCALING(WORKERCOUNTS, NLOTS, NFRAMES, MEGAPIXELS) sets
+%   the pool sizes, the lot count, the frames per lot and the frame size.
+%   Pool sizes above the cluster's NumWorkers are skipped.
+%
+%   The pool open when the benchmark starts is shut down, and the last
+%   pool it starts is left running.
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchJobScaling
+%
+%   See also runParkingJobs, runParkingBenchmarks.
+
+    arguments
+        workerCounts (1,:) double {mustBePositive, mustBeInteger} = []
+        nLots (1,1) double {mustBePositive, mustBeInteger} = 8
+        nFrames (1,1) double {mustBePositive, mustBeInteger} = 20
+        megapixels (1,1) double {mustBePositive} = 4
+    end
+
+    maxWorkers = parcluster('Processes').NumWorkers;
+    if isempty(workerCounts)
+        workerCounts = [1 2 4 maxWorkers];
+    end
+    workerCounts = unique(workerCounts(workerCounts <= maxWorkers));
+
+    % --- Lots and Manifest ---
+    folder = tempname;
+    mkdir(folder);
+    cleanup = onCleanup(@() rmdir(folder, 's'));
+    image = cell(nLots, 1);
+    slots = cell(nLots, 1);
+    lot = cell(nLots, 1);
+    for j = 1:nLots
+        lot{j} = sprintf('lot%02d', j);
+        image{j} = fullfile(folder, lot{j});
+        mkdir(image{j});
+        for k = 1:nFrames
+            [img, lotSlots] = syntheticParkingLot(megapixels, 200, 1000 * j + k);
+            imwrite(img, fullfile(image{j}, sprintf('frame%04d.jpg', k)), 'Quality', 90);
+        end
+        slots{j} = fullfile(folder, [lot{j} '.pslot']);
+        saveSlotLayout(slots{j}, lotSlots, 'LotID', lot{j}, 'ImageSize', size(img, [1 2]));
+    end
+    manifest = table(image, slots, lot);
+    warmup = table({fullfile(image{1}, 'frame0001.jpg')}, slots(1), lot(1), ...
+        'VariableNames', {'image', 'slots', 'lot'});
+
+    % --- Serial and Pool Runs ---
+    workers = [0, workerCounts]';
+    jobsPerSecond = zeros(numel(workers), 1);
+    for r = 1:numel(workers)
+        delete(gcp('nocreate'));
+        if workers(r) == 0
+            [~, ~, stats] = runParkingJobs(manifest, 'UseParallel', false, 'Verbose', false);
+        else
+            parpool('Processes', workers(r));
+            runParkingJobs(warmup, 'Verbose', false);
+            [~, ~, stats] = runParkingJobs(manifest, 'Verbose', false);
+        end
+        jobsPerSecond(r) = stats.jobsPerSecond;
+    end
+
+    speedup = jobsPerSecond / jobsPerSecond(1);
+    efficiency = speedup ./ max(workers, 1);
+    T = table(workers, jobsPerSecond, speedup, efficiency);
+
+    if nargout == 0
+        disp(T);
+    end
+end
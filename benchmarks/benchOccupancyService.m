@@ -0,0 +1,67 @@
+function T = benchOccupancyService(nRequests, interval, port)
+%BENCHOCCUPANCYSERVICE Occupancy service latency while detection runs.
+%   T = BENCHOCCUPANCYSERVICE starts a ParkingOccupancyService on
+%   127.0.0.1 with one lot per bundled image, each with a grid of 100
+%   slots, re-detected every second. It then sends 10000 requests,
+%   alternating between 'GET /lots' and one lot's slots, from a process
+%   pool worker with loadOccupancyService while the detections run, and
+%   returns the loadOccupancyService table (p50 and p99 latency).
+%
+%   The load generator needs a parallel pool with process workers (one is
+%   started if none is running). Without Parallel Computing Toolbox,
+%   start the service in one MATLAB session and run loadOccupancyService
+%   from another.
+%
+%   T = BENCHOCCUPANCYSERVICE(NREQUESTS, INTERVAL, PORT) sets the number
+%   of requests, the detection interval in seconds and the port (default
+%   8080).
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchOccupancyService
+%
+%   See also ParkingOccupancyService, loadOccupancyService.
+
+    arguments
+        nRequests (1,1) double {mustBePositive, mustBeInteger} = 10000
+        interval (1,1) double {mustBePositive} = 1
+        port (1,1) double = 8080
+    end
+
+    if ~(license('test', 'Distrib_Computing_Toolbox') && ~isempty(ver('parallel')))
+        error('benchOccupancyService:pool', ...
+            'The load generator runs on a process pool; run loadOccupancyService from another session instead.');
+    end
+
+    samples = {'back-parking.jpg', ...
+               'empty-parking-lots-aerial-view_56345-140.jpg', ...
+               'empty-parking-lots-aerial-view-3d-illustration-rendering_56345-1212.jpg'};
+    svc = ParkingOccupancyService('Port', port, 'Interval', interval);
+    cleanup = onCleanup(@() delete(svc));
+    for k = 1:numel(samples)
+        info = imfinfo(samples{k});
+        addLot(svc, sprintf('lot%d', k), samples{k}, slotGrid([info.Height info.Width], 100));
+    end
+    start(svc);
+
+    % Wait for the first snapshot of every lot
+    t0 = tic;
+    while contains(handleRequest(svc, 'GET /lots'), 'No detection yet')
+        if toc(t0) > 60
+            error('benchOccupancyService:detection', 'No detection finished within 60 s.');
+        end
+        pause(0.05);
+    end
+
+    % The service answers from this session's callbacks, which run while
+    % the client waits on the pool worker
+    future = parfeval(gcp(), @loadOccupancyService, 1, '127.0.0.1', port, ...
+        'Requests', nRequests, 'Path', {'/lots', '/lots/lot1/slots'});
+    while ~any(strcmp(future.State, {'finished', 'failed'}))
+        pause(0.01);
+    end
+    T = fetchOutputs(future);
+
+    if nargout == 0
+        disp(T);
+    end
+end
@@ -0,0 +1,73 @@
+function T = benchPyramidDetection(scales, nSlots, nRepeats)
+%BENCHPYRAMIDDETECTION Speed and agreement of pyramid against full detection.
+%   T = BENCHPYRAMIDDETECTION runs detectParkingSlots on each bundled
+%   image with 'Preprocess' 'full' and 'pyramid' at scales 1/2 and 1/4,
+%   using a grid of 50 slots over the middle 80% of the image, and
+%   reports for every image and scale:
+%     fullTime         Median seconds of the full-resolution run
+%     pyramidTime      Median seconds of the pyramid run
+%     speedup          fullTime / pyramidTime
+%     agreement        Fraction of slots with the same status
+%     refinedFraction  Fraction of slots re-scored at full resolution
+%     maxCoarseError   Largest density difference of the slots that
+%                      kept their coarse estimate
+%
+%   T = BENCHPYRAMIDDETECTION(SCALES, NSLOTS, NREPEATS) sets the pyramid
+%   scales, the slot count and the runs timed per case (default 5).
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchPyramidDetection
+%
+%   See also pyramidSlotDensity, detectParkingSlots, runParkingBenchmarks.
+
+    arguments
+        scales (1,:) double = [0.5 0.25]
+        nSlots (1,1) double {mustBePositive, mustBeInteger} = 50
+        nRepeats (1,1) double {mustBePositive, mustBeInteger} = 5
+    end
+
+    samples = {'back-parking.jpg', ...
+               'empty-parking-lots-aerial-view_56345-140.jpg', ...
+               'empty-parking-lots-aerial-view-3d-illustration-rendering_56345-1212.jpg'};
+
+    rows = cell(0, 1);
+    for k = 1:numel(samples)
+        img = imread(samples{k});
+        slots = slotGrid([size(img, 1) size(img, 2)], nSlots);
+        reference = detectParkingSlots(img, slots);
+        fullTime = medianTime(@() detectParkingSlots(img, slots), nRepeats);
+
+        for scale = scales
+            run = @() detectParkingSlots(img, slots, 'Preprocess', 'pyramid', 'PyramidScale', scale);
+            [pyramid, ~, info] = run();
+            pyramidTime = medianTime(run, nRepeats);
+
+            coarse = ~info.refined;
+            if any(coarse)
+                maxCoarseError = max(abs(pyramid.density(coarse) - reference.density(coarse)));
+            else
+                maxCoarseError = 0;
+            end
+            [~, name] = fileparts(samples{k});
+            rows{end+1, 1} = table({name}, scale, fullTime, pyramidTime, fullTime / pyramidTime, ...
+                mean(pyramid.status == reference.status), info.refinedFraction, maxCoarseError, ...
+                'VariableNames', {'image', 'scale', 'fullTime', 'pyramidTime', 'speedup', ...
+                'agreement', 'refinedFraction', 'maxCoarseError'}); %#ok<AGROW>
+        end
+    end
+    T = vertcat(rows{:});
+
+    if nargout == 0
+        disp(T);
+    end
+end
+
+function t = medianTime(fcn, nRepeats)
+    times = zeros(nRepeats, 1);
+    for r = 1:nRepeats
+        t0 = tic;
+        fcn();
+        times(r) = toc(t0);
+    end
+    t = median(times);
+end
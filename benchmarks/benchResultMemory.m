@@ -0,0 +1,75 @@
+function T = benchResultMemory(imageFile, slotCounts, axesSize)
+%BENCHRESULTMEMORY Memory kept per frame by the detector's results.
+%   T = BENCHRESULTMEMORY compares, per frame, the bytes kept by the
+%   original representation (a struct array with string status and color
+%   per slot, plus full-resolution cannyImage and morphImage maps) with
+%   the columnar classifySlots results and the display-resolution
+%   diagnostic maps ParkingDetectorPro now builds on demand.
+%
+%   T = BENCHRESULTMEMORY(IMAGEFILE, SLOTCOUNTS, AXESSIZE) uses another
+%   image (default 'back-parking.jpg'), slot counts (default
+%   [10 100 1000 5000]) and [height width] axes size in pixels (default
+%   [640 668], the app's UIAxes).
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchResultMemory
+%
+%   See also classifySlots, downsampleEdgeMap.
+
+    arguments
+        imageFile {mustBeTextScalar} = 'back-parking.jpg'
+        slotCounts (1,:) double = [10 100 1000 5000]
+        axesSize (1,2) double = [640 668]
+    end
+
+    img = imread(imageFile);
+    [~, cannyImage, morphImage] = parkingPreprocess(img);
+    factor = max(1, floor(min(size(cannyImage) ./ axesSize)));
+    cannySmall = downsampleEdgeMap(cannyImage, factor);
+    morphSmall = downsampleEdgeMap(morphImage, factor);
+    fullMapBytes = bytesOf(cannyImage) + bytesOf(morphImage);
+    displayMapBytes = bytesOf(cannySmall) + bytesOf(morphSmall);
+
+    nRuns = numel(slotCounts);
+    structBytes = zeros(nRuns, 1);
+    columnarBytes = zeros(nRuns, 1);
+    [m, n] = size(cannyImage);
+    for k = 1:nRuns
+        nSlots = slotCounts(k);
+        slots = [n * rand(nSlots, 1), m * rand(nSlots, 1), 20 + 60 * rand(nSlots, 2)];
+        density = 0.14 * rand(nSlots, 1);
+
+        structBytes(k) = bytesOf(legacyResults(slots, density, 0.07));
+        columnarBytes(k) = bytesOf(classifySlots(slots, density, 0.07));
+    end
+
+    slots = slotCounts(:);
+    legacyBytes = structBytes + fullMapBytes;
+    leanBytes = columnarBytes + displayMapBytes;
+    savedBytes = legacyBytes - leanBytes;
+    T = table(slots, structBytes, columnarBytes, ...
+        repmat(fullMapBytes, nRuns, 1), repmat(displayMapBytes, nRuns, 1), ...
+        legacyBytes, leanBytes, savedBytes, ...
+        'VariableNames', {'slots', 'structBytes', 'columnarBytes', 'fullMapBytes', ...
+        'displayMapBytes', 'legacyBytes', 'leanBytes', 'savedBytes'});
+
+    if nargout == 0
+        fprintf('%s: %dx%d image, display maps reduced %dx\n', imageFile, m, n, factor);
+        disp(T);
+    end
+end
+
+function results = legacyResults(slots, density, threshold)
+    % Result struct array as built by the original RunDetectionButtonPushed
+    results(size(slots, 1)) = struct('rect', [], 'density', [], 'status', '', 'color', '');
+    for i = 1:size(slots, 1)
+        if density(i) > threshold
+            status = 'Occupied';
+            color = 'r';
+        else
+            status = 'Empty';
+            color = 'g';
+        end
+        results(i) = struct('rect', slots(i,:), 'density', density(i), 'status', status, 'color', color);
+    end
+end
@@ -0,0 +1,93 @@
+function T = benchSlotDensity(slotCounts, imageSize)
+%BENCHSLOTDENSITY Check and time integral-image slot density scoring.
+%   T = BENCHSLOTDENSITY runs slotEdgeDensity and maskedSlotDensity
+%   (with upright slots compiled by compileSlotMasks) against the
+%   original per-slot imcrop loop of RunDetectionButtonPushed on a
+%   synthetic edge map, for 10 to 5000 slots. It errors if any density
+%   differs and returns a table with the time and slots/sec of each
+%   implementation and the one-off mask compile time.
+%
+%   T = BENCHSLOTDENSITY(SLOTCOUNTS, IMAGESIZE) uses the given slot counts
+%   and [rows cols] edge map size (default [2160 3840]).
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchSlotDensity
+%
+%   See also slotEdgeDensity, maskedSlotDensity, slotPixelBounds.
+
+    arguments
+        slotCounts (1,:) double = [10 100 600 2000 5000]
+        imageSize (1,2) double = [2160 3840]
+    end
+
+    rng(0);
+    morphImage = rand(imageSize) < 0.08;
+
+    nRuns = numel(slotCounts);
+    loopTime = zeros(nRuns, 1);
+    integralTime = zeros(nRuns, 1);
+    maskedTime = zeros(nRuns, 1);
+    compileTime = zeros(nRuns, 1);
+    maxAbsDiff = zeros(nRuns, 1);
+
+    for k = 1:nRuns
+        slots = randomSlots(slotCounts(k), imageSize);
+
+        t0 = tic;
+        expected = referenceDensity(morphImage, slots);
+        loopTime(k) = toc(t0);
+
+        t0 = tic;
+        density = slotEdgeDensity(morphImage, slots);
+        integralTime(k) = toc(t0);
+
+        t0 = tic;
+        masks = compileSlotMasks(slots, imageSize);
+        compileTime(k) = toc(t0);
+
+        t0 = tic;
+        maskedDensity = maskedSlotDensity(morphImage, masks);
+        maskedTime(k) = toc(t0);
+
+        maxAbsDiff(k) = max(abs([density; maskedDensity] - [expected; expected]), [], 'all');
+        if maxAbsDiff(k) > 1e-12
+            error('benchSlotDensity:mismatch', ...
+                'Density mismatch for %d slots (max abs diff %g).', slotCounts(k), maxAbsDiff(k));
+        end
+    end
+
+    slots = slotCounts(:);
+    loopSlotsPerSec = slots ./ loopTime;
+    integralSlotsPerSec = slots ./ integralTime;
+    maskedSlotsPerSec = slots ./ maskedTime;
+    speedup = loopTime ./ integralTime;
+    T = table(slots, loopTime, integralTime, maskedTime, compileTime, ...
+        loopSlotsPerSec, integralSlotsPerSec, maskedSlotsPerSec, speedup, maxAbsDiff);
+
+    if nargout == 0
+        disp(T);
+    end
+end
+
+function slots = randomSlots(nSlots, imageSize)
+    % Fractional positions and sizes exercise imcrop's rounding; a few
+    % slots hang over or lie outside the image border.
+    w = 20 + 100 * rand(nSlots, 1);
+    h = 20 + 100 * rand(nSlots, 1);
+    x = -50 + (imageSize(2) + 50) * rand(nSlots, 1);
+    y = -50 + (imageSize(1) + 50) * rand(nSlots, 1);
+    slots = [x y w h];
+end
+
+function density = referenceDensity(morphImage, slots)
+    % Per-slot loop from the original RunDetectionButtonPushed
+    density = zeros(size(slots, 1), 1);
+    for i = 1:size(slots, 1)
+        rect = slots(i,:);
+        ROI = imcrop(morphImage, rect);
+
+        white_pixels = sum(ROI(:));
+        slot_area = rect(3) * rect(4);
+        density(i) = white_pixels / slot_area;
+    end
+end
@@ -0,0 +1,102 @@
+function T = benchSlotLayout(nLayouts, slotCounts, imageSize)
+%BENCHSLOTLAYOUT Layout loading and slot-region query speed.
+%   T = BENCHSLOTLAYOUT writes 200 random layouts for each slot count in
+%   [100 1000 10000] to a temporary folder, both as .mat files holding a
+%   'slots' variable and as .pslot slot layouts, and reports for each
+%   slot count:
+%     matLoadTime     Seconds to load all .mat layouts
+%     pslotLoadTime   Seconds to read all .pslot layouts (readSlotLayout)
+%     matBytes        Size of one .mat layout on disk
+%     pslotBytes      Size of one .pslot layout on disk
+%     scanQueryTime   Seconds for 1000 tile queries testing every slot
+%     indexQueryTime  Seconds for the same queries with querySlotIndex
+%     indexBuildTime  Seconds to build the index (buildSlotIndex)
+%
+%   T = BENCHSLOTLAYOUT(NLAYOUTS, SLOTCOUNTS, IMAGESIZE) sets the number
+%   of layouts, the slot counts and the [height width] image size
+%   (default [8000 8000]).
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchSlotLayout
+%
+%   See also readSlotLayout, saveSlotLayout, buildSlotIndex, querySlotIndex.
+
+    arguments
+        nLayouts (1,1) double {mustBePositive, mustBeInteger} = 200
+        slotCounts (1,:) double = [100 1000 10000]
+        imageSize (1,2) double = [8000 8000]
+    end
+
+    folder = tempname;
+    mkdir(folder);
+    cleanup = onCleanup(@() rmdir(folder, 's'));
+
+    nRuns = numel(slotCounts);
+    [matLoadTime, pslotLoadTime, matBytes, pslotBytes, ...
+        scanQueryTime, indexQueryTime, indexBuildTime] = deal(zeros(nRuns, 1));
+    nQueries = 1000;
+    tileSize = 512;
+
+    for k = 1:nRuns
+        nSlots = slotCounts(k);
+        matFiles = cell(nLayouts, 1);
+        pslotFiles = cell(nLayouts, 1);
+        for j = 1:nLayouts
+            slots = [imageSize(2) * rand(nSlots, 1), imageSize(1) * rand(nSlots, 1), ...
+                     20 + 60 * rand(nSlots, 2)];
+            matFiles{j} = fullfile(folder, sprintf('layout_%d_%d.mat', nSlots, j));
+            pslotFiles{j} = fullfile(folder, sprintf('layout_%d_%d.pslot', nSlots, j));
+            save(matFiles{j}, 'slots');
+            saveSlotLayout(pslotFiles{j}, slots, 'ImageSize', imageSize);
+        end
+
+        % --- Loading ---
+        t0 = tic;
+        for j = 1:nLayouts
+            data = load(matFiles{j}, 'slots'); %#ok<NASGU>
+        end
+        matLoadTime(k) = toc(t0);
+
+        t0 = tic;
+        layouts = readSlotLayout(pslotFiles);
+        pslotLoadTime(k) = toc(t0);
+
+        info = dir(matFiles{1});
+        matBytes(k) = info.bytes;
+        info = dir(pslotFiles{1});
+        pslotBytes(k) = info.bytes;
+
+        % --- Region Queries ---
+        slots = layouts(1).slots;
+        rows = 1 + floor(rand(nQueries, 1) * (imageSize(1) - tileSize));
+        cols = 1 + floor(rand(nQueries, 1) * (imageSize(2) - tileSize));
+
+        t0 = tic;
+        bounds = slotPixelBounds(slots, imageSize);
+        for q = 1:nQueries
+            hit = find(bounds(:,1) <= rows(q) + tileSize - 1 & bounds(:,2) >= rows(q) ...
+                & bounds(:,3) <= cols(q) + tileSize - 1 & bounds(:,4) >= cols(q)); %#ok<NASGU>
+        end
+        scanQueryTime(k) = toc(t0);
+
+        t0 = tic;
+        index = buildSlotIndex(slots, imageSize);
+        indexBuildTime(k) = toc(t0);
+
+        t0 = tic;
+        for q = 1:nQueries
+            hit = querySlotIndex(index, rows(q) + [0 tileSize-1], cols(q) + [0 tileSize-1]); %#ok<NASGU>
+        end
+        indexQueryTime(k) = toc(t0);
+    end
+
+    slots = slotCounts(:);
+    T = table(slots, matLoadTime, pslotLoadTime, matBytes, pslotBytes, ...
+        scanQueryTime, indexQueryTime, indexBuildTime);
+
+    if nargout == 0
+        fprintf('%d layouts per slot count, %d queries of %dx%d tiles on a %dx%d image\n', ...
+            nLayouts, nQueries, tileSize, tileSize, imageSize(1), imageSize(2));
+        disp(T);
+    end
+end
@@ -0,0 +1,52 @@
+function T = benchThresholdSweep(nSlots, nFrames, nThresholds)
+%BENCHTHRESHOLDSWEEP Time the threshold sweep against per-threshold scoring.
+%   T = BENCHTHRESHOLDSWEEP scores 401 thresholds on a synthetic
+%   1000-slot by 1000-frame density matrix with sweepThresholds and with
+%   a loop that classifies every density at every threshold, as
+%   re-running detection for each slider position amounts to. It errors
+%   if the confusion counts differ and returns the time of both.
+%
+%   T = BENCHTHRESHOLDSWEEP(NSLOTS, NFRAMES, NTHRESHOLDS) sets the sizes.
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); benchThresholdSweep
+%
+%   See also sweepThresholds, calibrateThreshold.
+
+    arguments
+        nSlots (1,1) double {mustBePositive, mustBeInteger} = 1000
+        nFrames (1,1) double {mustBePositive, mustBeInteger} = 1000
+        nThresholds (1,1) double {mustBePositive, mustBeInteger} = 401
+    end
+
+    rng(0);
+    occupied = rand(nSlots, nFrames) < 0.5;
+    density = 0.04 + 0.06 * occupied + 0.03 * randn(nSlots, nFrames);
+    thresholds = linspace(0, 0.2, nThresholds);
+
+    t0 = tic;
+    curves = sweepThresholds(density, occupied, thresholds);
+    sweepTime = toc(t0);
+
+    t0 = tic;
+    tp = zeros(nThresholds, 1);
+    fp = zeros(nThresholds, 1);
+    for k = 1:nThresholds
+        predicted = density > thresholds(k);
+        tp(k) = nnz(predicted & occupied);
+        fp(k) = nnz(predicted & ~occupied);
+    end
+    loopTime = toc(t0);
+
+    if ~isequal(tp, curves.tp) || ~isequal(fp, curves.fp)
+        error('benchThresholdSweep:mismatch', 'Sweep and loop confusion counts differ.');
+    end
+
+    densities = nSlots * nFrames;
+    speedup = loopTime / sweepTime;
+    T = table(densities, nThresholds, loopTime, sweepTime, speedup);
+
+    if nargout == 0
+        disp(T);
+    end
+end
@@ -0,0 +1,56 @@
+function T = compareParkingBenchmarks(baselineFile, currentFile, tolerance)
+%COMPAREPARKINGBENCHMARKS Compare two runParkingBenchmarks reports.
+%   T = COMPAREPARKINGBENCHMARKS(BASELINEFILE, CURRENTFILE) reads two
+%   JSON reports written by runParkingBenchmarks and returns, for every
+%   case present in both, the baseline and current total time, the
+%   current/baseline ratio of every stage and of the total, and the peak
+%   memory of both runs. Cases whose total time grew by more than 10% are
+%   flagged in the regression column.
+%
+%   T = COMPAREPARKINGBENCHMARKS(..., TOLERANCE) flags a regression when
+%   the total time grows by more than TOLERANCE (a fraction, default 0.1).
+%
+%   See also runParkingBenchmarks.
+
+    arguments
+        baselineFile {mustBeTextScalar}
+        currentFile {mustBeTextScalar}
+        tolerance (1,1) double {mustBeNonnegative} = 0.1
+    end
+
+    baseline = jsondecode(fileread(baselineFile));
+    current = jsondecode(fileread(currentFile));
+
+    [name, ib, ic] = intersect({baseline.cases.name}, {current.cases.name}, 'stable');
+    name = name(:);
+    base = baseline.cases(ib);
+    curr = current.cases(ic);
+
+    stageNames = fieldnames(curr(1).stages);
+    T = table(name);
+    T.baselineTotal = arrayfun(@(c) c.total, base(:));
+    T.currentTotal = arrayfun(@(c) c.total, curr(:));
+    for s = 1:numel(stageNames)
+        stage = stageNames{s};
+        b = arrayfun(@(c) valueOrNaN(c.stages.(stage)), base);
+        c = arrayfun(@(c) valueOrNaN(c.stages.(stage)), curr);
+        T.([stage 'Ratio']) = c(:) ./ b(:);
+    end
+    T.totalRatio = T.currentTotal ./ T.baselineTotal;
+    T.baselinePeakMB = arrayfun(@(c) valueOrNaN(c.peakMemoryMB), base(:));
+    T.currentPeakMB = arrayfun(@(c) valueOrNaN(c.peakMemoryMB), curr(:));
+    T.regression = T.totalRatio > 1 + tolerance;
+
+    if nargout == 0
+        disp(T);
+        fprintf('%d of %d cases regressed by more than %.0f%%\n', ...
+            nnz(T.regression), height(T), 100 * tolerance);
+    end
+end
+
+function v = valueOrNaN(v)
+    % jsonencode writes NaN (stage not timed, memory not measured) as null
+    if isempty(v)
+        v = NaN;
+    end
+end
@@ -0,0 +1,62 @@
+function T = loadOccupancyService(host, port, opts)
+%LOADOCCUPANCYSERVICE Request latency of a ParkingOccupancyService.
+%   T = LOADOCCUPANCYSERVICE(HOST, PORT) connects to the service at
+%   HOST:PORT, sends 10000 'GET /lots' requests over one connection, each
+%   after the previous reply arrived, and returns a table with the
+%   request count, requests per second and the mean, p50, p99 and max
+%   round-trip latency in seconds (nearest-rank percentiles). The first
+%   100 requests warm up the connection and are not counted.
+%
+%   The service answers from callbacks of the MATLAB session that runs
+%   it, so run this from another session or a process pool worker, as
+%   benchOccupancyService does.
+%
+%   Name-value options:
+%     'Requests'  Timed requests (default 10000)
+%     'Warmup'    Untimed requests sent first (default 100)
+%     'Path'      Path requested, or a cell array of paths used in turn,
+%                 e.g. {'/lots', '/lots/north/slots'} (default '/lots')
+%
+%   See also ParkingOccupancyService, benchOccupancyService.
+
+    arguments
+        host {mustBeTextScalar} = '127.0.0.1'
+        port (1,1) double = 8080
+        opts.Requests (1,1) double {mustBePositive, mustBeInteger} = 10000
+        opts.Warmup (1,1) double {mustBeNonnegative, mustBeInteger} = 100
+        opts.Path = '/lots'
+    end
+
+    paths = cellstr(opts.Path);
+    client = tcpclient(host, port, 'Timeout', 10);
+    configureTerminator(client, 'LF');
+
+    for k = 1:opts.Warmup
+        writeline(client, ['GET ' paths{mod(k - 1, numel(paths)) + 1}]);
+        readline(client);
+    end
+
+    latency = zeros(opts.Requests, 1);
+    t0 = tic;
+    for k = 1:opts.Requests
+        request = ['GET ' paths{mod(k - 1, numel(paths)) + 1}];
+        tRequest = tic;
+        writeline(client, request);
+        reply = readline(client);
+        latency(k) = toc(tRequest);
+        if isempty(reply)
+            error('loadOccupancyService:timeout', 'No reply to request %d (%s).', k, request);
+        end
+    end
+    totalTime = toc(t0);
+
+    latency = sort(latency);
+    rank = max(1, ceil([0.50 0.99] * numel(latency)));
+    requests = opts.Requests;
+    requestsPerSecond = requests / totalTime;
+    meanLatency = mean(latency);
+    p50 = latency(rank(1));
+    p99 = latency(rank(2));
+    maxLatency = latency(end);
+    T = table(requests, requestsPerSecond, meanLatency, p50, p99, maxLatency);
+end
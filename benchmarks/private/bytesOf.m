@@ -0,0 +1,7 @@
+function b = bytesOf(x) %#ok<INUSD>
+%BYTESOF Bytes of a variable as reported by whos.
+%   B = BYTESOF(X) returns the bytes of X.
+
+    w = whos('x');
+    b = w.bytes;
+end
@@ -0,0 +1,8 @@
+function mb = peakMemoryMB()
+%PEAKMEMORYMB Peak resident memory of this MATLAB process in MB.
+%   MB = PEAKMEMORYMB() reads VmHWM from /proc/self/status (Linux), the
+%   peak since the process started or since the last resetPeakMemory;
+%   NaN elsewhere.
+
+    mb = procStatusMB('VmHWM');
+end
@@ -0,0 +1,15 @@
+function mb = procStatusMB(field)
+%PROCSTATUSMB Memory field of /proc/self/status in MB.
+%   MB = PROCSTATUSMB(FIELD) returns the kB value of FIELD, e.g. 'VmRSS',
+%   in MB, or NaN when it is missing or not on Linux.
+
+    mb = NaN;
+    if ~isunix || ismac
+        return;
+    end
+    text = fileread('/proc/self/status');
+    tokens = regexp(text, [field ':\s*(\d+)\s*kB'], 'tokens', 'once');
+    if ~isempty(tokens)
+        mb = str2double(tokens{1}) / 1024;
+    end
+end
@@ -0,0 +1,11 @@
+function resetPeakMemory()
+%RESETPEAKMEMORY Reset the peak reported by peakMemoryMB.
+%   RESETPEAKMEMORY() sets VmHWM to the current resident memory by writing
+%   5 to /proc/self/clear_refs (Linux); does nothing elsewhere.
+
+    fid = fopen('/proc/self/clear_refs', 'w');
+    if fid > 0
+        fprintf(fid, '5');
+        fclose(fid);
+    end
+end
@@ -0,0 +1,7 @@
+function mb = residentMemoryMB()
+%RESIDENTMEMORYMB Resident memory of this MATLAB process in MB.
+%   MB = RESIDENTMEMORYMB() reads VmRSS from /proc/self/status (Linux);
+%   NaN elsewhere.
+
+    mb = procStatusMB('VmRSS');
+end
@@ -0,0 +1,15 @@
+function slots = slotGrid(imageSize, nSlots)
+%SLOTGRID Evenly spaced slot-sized boxes over the middle 80% of an image.
+%   SLOTS = SLOTGRID(IMAGESIZE, NSLOTS) returns NSLOTS [x y width height]
+%   boxes in a near-square grid over the middle 80% of an image of
+%   [height width] IMAGESIZE, for images without a slot layout.
+
+    nCols = ceil(sqrt(nSlots));
+    nRows = ceil(nSlots / nCols);
+    cellW = 0.8 * imageSize(2) / nCols;
+    cellH = 0.8 * imageSize(1) / nRows;
+    [c, r] = meshgrid(0:nCols-1, 0:nRows-1);
+    slots = [0.1 * imageSize(2) + c(:) * cellW + 1, 0.1 * imageSize(1) + r(:) * cellH + 1, ...
+             repmat(0.8 * cellW, numel(c), 1), repmat(0.8 * cellH, numel(c), 1)];
+    slots = slots(1:nSlots, :);
+end
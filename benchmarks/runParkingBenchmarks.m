@@ -0,0 +1,169 @@
+function report = runParkingBenchmarks(opts)
+%RUNPARKINGBENCHMARKS Per-stage timing and memory of the detection pipeline.
+%   REPORT = RUNPARKINGBENCHMARKS runs the RunDetectionButtonPushed
+%   pipeline stage by stage on the bundled images (back-parking.jpg and
+%   the two aerial views, with a generated slot grid) and on synthetic
+%   lots from 1 to 50 megapixels with 10 to 5000 slots, and reports for
+%   each case the median wall time of every stage:
+%     gray      rgb2gray
+%     canny     edge(gray, 'canny', [0.1 0.2])
+%     close     imclose with a 3x3 rectangle
+%     density   slotEdgeDensity
+%     classify  classifySlots
+%     render    renderDetectionOverlay shown with imshow, as in
+%               updateDetectionDisplay, in an invisible figure
+%   plus the peak resident memory above the starting point (Linux only,
+%   NaN elsewhere).
+%
+%   REPORT is a struct with the run metadata (date, MATLAB version,
+%   computer, git commit) and a cases struct array. It is also written as
+%   JSON to 'OutputFile', so two runs can be compared with
+%   compareParkingBenchmarks.
+%
+%   Name-value options:
+%     'Megapixels'  Synthetic image sizes (default [1 5 12 25 50])
+%     'SlotCounts'  Synthetic slot counts (default [10 100 1000 5000])
+%     'Repeats'     Timed repetitions per case; the median is kept
+%                   (default 3)
+%     'Render'      Time the render stage (default true)
+%     'OutputFile'  JSON report file (default
+%                   'benchmarks/results/benchmark_<timestamp>.json')
+%
+%   Run from the repository root:
+%     addpath('benchmarks'); runParkingBenchmarks
+%     runParkingBenchmarks('Megapixels', [1 5], 'SlotCounts', [10 100])
+%
+%   See also compareParkingBenchmarks, syntheticParkingLot.
+
+    arguments
+        opts.Megapixels (1,:) double = [1 5 12 25 50]
+        opts.SlotCounts (1,:) double = [10 100 1000 5000]
+        opts.Repeats (1,1) double {mustBePositive, mustBeInteger} = 3
+        opts.Render (1,1) logical = true
+        opts.OutputFile {mustBeTextScalar} = ''
+    end
+
+    if strlength(opts.OutputFile) == 0
+        opts.OutputFile = fullfile('benchmarks', 'results', ...
+            sprintf('benchmark_%s.json', char(datetime('now', 'Format', 'yyyyMMdd_HHmmss'))));
+    end
+
+    cases = struct('name', {}, 'imageSize', {}, 'megapixels', {}, 'slots', {}, ...
+        'stages', {}, 'total', {}, 'peakMemoryMB', {});
+
+    % --- Bundled Sample Images ---
+    samples = {'back-parking.jpg', ...
+               'empty-parking-lots-aerial-view_56345-140.jpg', ...
+               'empty-parking-lots-aerial-view-3d-illustration-rendering_56345-1212.jpg'};
+    for k = 1:numel(samples)
+        img = imread(samples{k});
+        slots = slotGrid(size(img), 40);
+        cases(end+1) = benchmarkCase(samples{k}, img, slots, opts); %#ok<AGROW>
+    end
+
+    % --- Synthetic Lots ---
+    for mp = opts.Megapixels
+        for nSlots = opts.SlotCounts
+            [img, slots] = syntheticParkingLot(mp, nSlots);
+            name = sprintf('synthetic_%gMP_%dslots', mp, nSlots);
+            cases(end+1) = benchmarkCase(name, img, slots, opts); %#ok<AGROW>
+            clear img
+        end
+    end
+
+    % --- Report ---
+    report.date = char(datetime('now', 'Format', 'yyyy-MM-dd''T''HH:mm:ss'));
+    report.matlab = version;
+    report.computer = computer;
+    report.commit = gitCommit();
+    report.repeats = opts.Repeats;
+    report.cases = cases;
+
+    outputFolder = fileparts(opts.OutputFile);
+    if strlength(outputFolder) > 0 && ~isfolder(outputFolder)
+        mkdir(outputFolder);
+    end
+    fid = fopen(opts.OutputFile, 'w');
+    fprintf(fid, '%s', jsonencode(report, 'PrettyPrint', true));
+    fclose(fid);
+
+    printReport(cases);
+    fprintf('Saved %s\n', opts.OutputFile);
+end
+
+function result = benchmarkCase(name, img, slots, opts)
+    stageNames = {'gray', 'canny', 'close', 'density', 'classify', 'render'};
+    times = nan(opts.Repeats, numel(stageNames));
+
+    baseline = residentMemoryMB();
+    resetPeakMemory();
+
+    for r = 1:opts.Repeats
+        t0 = tic;
+        gray = rgb2gray(img);
+        times(r,1) = toc(t0);
+
+        t0 = tic;
+        cannyImage = edge(gray, 'canny', [0.1 0.2], 'both');
+        times(r,2) = toc(t0);
+
+        t0 = tic;
+        morphImage = imclose(cannyImage, strel('rectangle', [3 3]));
+        times(r,3) = toc(t0);
+
+        t0 = tic;
+        density = slotEdgeDensity(morphImage, slots);
+        times(r,4) = toc(t0);
+
+        t0 = tic;
+        results = classifySlots(slots, density, 0.07);
+        times(r,5) = toc(t0);
+
+        if opts.Render
+            t0 = tic;
+            renderOverlay(img, results);
+            times(r,6) = toc(t0);
+        end
+    end
+
+    result.name = name;
+    result.imageSize = size(img);
+    result.megapixels = size(img, 1) * size(img, 2) / 1e6;
+    result.slots = size(slots, 1);
+    stageTimes = median(times, 1);
+    for s = 1:numel(stageNames)
+        result.stages.(stageNames{s}) = stageTimes(s);
+    end
+    result.total = sum(stageTimes, 'omitnan');
+    result.peakMemoryMB = peakMemoryMB() - baseline;
+end
+
+function renderOverlay(img, results)
+    % Same calls as ParkingDetectorPro.updateDetectionDisplay
+    fig = figure('Visible', 'off');
+    cleanup = onCleanup(@() close(fig));
+    ax = axes(fig);
+    imshow(renderDetectionOverlay(img, results), 'Parent', ax);
+    drawnow;
+end
+
+function printReport(cases)
+    fprintf('\n%-60s %7s %6s %8s %8s %8s %8s %8s %8s %8s %9s\n', 'case', 'MP', 'slots', ...
+        'gray', 'canny', 'close', 'density', 'classify', 'render', 'total', 'peak MB');
+    for k = 1:numel(cases)
+        c = cases(k);
+        s = c.stages;
+        fprintf('%-60s %7.2f %6d %8.4f %8.4f %8.4f %8.4f %8.4f %8.4f %8.4f %9.1f\n', c.name, ...
+            c.megapixels, c.slots, s.gray, s.canny, s.close, s.density, s.classify, s.render, ...
+            c.total, c.peakMemoryMB);
+    end
+end
+
+function commit = gitCommit()
+    [status, out] = system('git rev-parse HEAD');
+    if status == 0
+        commit = strtrim(out);
+    else
+        commit = '';
+    end
+end
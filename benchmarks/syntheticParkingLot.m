@@ -0,0 +1,68 @@
+function [img, slots, occupied] = syntheticParkingLot(megapixels, nSlots, seed, occupied)
+%SYNTHETICPARKINGLOT Generated aerial lot image with a known slot layout.
+%   [IMG, SLOTS, OCCUPIED] = SYNTHETICPARKINGLOT(MEGAPIXELS, NSLOTS)
+%   returns a 4:3 RGB uint8 image of about MEGAPIXELS million pixels
+%   showing NSLOTS parking bays laid out in rows, the N-by-4 [x y width
+%   height] SLOTS matrix and the logical ground truth OCCUPIED. About half
+%   of the bays hold a car: a textured rectangle with a windshield, which
+%   gives Canny plenty of edges, while empty bays are plain asphalt with
+%   mild noise.
+%
+%   SYNTHETICPARKINGLOT(..., SEED) seeds the random number generator
+%   (default 0) so runs are reproducible.
+%
+%   SYNTHETICPARKINGLOT(..., SEED, OCCUPIED) places cars in the bays
+%   where the logical N-by-1 OCCUPIED is true instead of at random. The
+%   asphalt and bay lines are the same as for any other OCCUPIED with the
+%   same SEED, so frames of one camera can be composed from two calls.
+%
+%   See also runParkingBenchmarks.
+
+    arguments
+        megapixels (1,1) double {mustBePositive}
+        nSlots (1,1) double {mustBePositive, mustBeInteger}
+        seed (1,1) double = 0
+        occupied logical = []
+    end
+
+    rng(seed);
+    height = round(sqrt(megapixels * 1e6 * 3 / 4));
+    width = round(height * 4 / 3);
+
+    % --- Slot Grid: as square as possible, with a 10% aisle margin ---
+    nCols = ceil(sqrt(nSlots * width / height));
+    nRows = ceil(nSlots / nCols);
+    cellW = width / nCols;
+    cellH = height / nRows;
+    [c, r] = meshgrid(0:nCols-1, 0:nRows-1);
+    c = c'; r = r';
+    slots = [c(:) * cellW + 0.1 * cellW + 1, r(:) * cellH + 0.1 * cellH + 1, ...
+             repmat(0.8 * cellW, numel(c), 1), repmat(0.8 * cellH, numel(c), 1)];
+    slots = slots(1:nSlots, :);
+    drawn = rand(nSlots, 1) < 0.5;
+    if isempty(occupied)
+        occupied = drawn;
+    end
+    occupied = occupied(:);
+
+    % --- Asphalt Background with Painted Bay Lines ---
+    gray = uint8(90 + 8 * randn(height, width));
+    bounds = slotPixelBounds(slots, [height width]);
+    for i = 1:nSlots
+        rows = bounds(i,1):bounds(i,2);
+        cols = bounds(i,3):bounds(i,4);
+        gray(rows, cols([1 end])) = 230;
+
+        if occupied(i)
+            % Car body with a darker windshield and roof texture
+            carRows = rows(round(end*0.15)+1 : round(end*0.85));
+            carCols = cols(round(end*0.2)+1 : round(end*0.8));
+            body = uint8(40 + 170 * rand + 25 * randn(numel(carRows), numel(carCols)));
+            glass = max(1, round(size(body, 1) * 0.25)) : round(size(body, 1) * 0.45);
+            body(glass, :) = 30;
+            gray(carRows, carCols) = body;
+        end
+    end
+
+    img = repmat(gray, 1, 1, 3);
+end
@@ -0,0 +1,27 @@
+function sums = boundsPixelSums(image, bounds)
+%BOUNDSPIXELSUMS Sum of image values inside inclusive pixel ranges.
+%   SUMS = BOUNDSPIXELSUMS(IMAGE, BOUNDS) adds up the values of the 2-D
+%   IMAGE inside each row [r1 r2 c1 c2] of BOUNDS, using a single
+%   summed-area table so each row costs four lookups. The ranges must lie
+%   inside the image; rows with r2 < r1 or c2 < c1 sum to zero.
+%
+%   See also slotPixelSums, slotPixelBounds.
+
+    [m, n] = size(image);
+
+    % --- Summed-Area Table (zero-padded first row and column) ---
+    S = zeros(m + 1, n + 1);
+    S(2:end, 2:end) = cumsum(cumsum(double(image), 1), 2);
+
+    % --- Four Lookups per Range ---
+    isEmpty = bounds(:,2) < bounds(:,1) | bounds(:,4) < bounds(:,3);
+    bounds(isEmpty,:) = repmat([1 0 1 0], nnz(isEmpty), 1);
+
+    r1 = bounds(:,1);
+    r2 = bounds(:,2) + 1;
+    c1 = bounds(:,3);
+    c2 = bounds(:,4) + 1;
+
+    sums = S(r2 + (c2 - 1) * (m + 1)) - S(r1 + (c2 - 1) * (m + 1)) ...
+         - S(r2 + (c1 - 1) * (m + 1)) + S(r1 + (c1 - 1) * (m + 1));
+end
@@ -0,0 +1,67 @@
+function index = buildSlotIndex(slots, imageSize, cellSize)
+%BUILDSLOTINDEX Uniform grid index of the slots covering each image cell.
+%   INDEX = BUILDSLOTINDEX(SLOTS, IMAGESIZE) buckets the N-by-4
+%   [x y width height] slot rectangles SLOTS into a grid of 256-by-256
+%   pixel cells over an image of size IMAGESIZE, so querySlotIndex can
+%   find the slots that intersect a tile or region by looking only at the
+%   cells it covers instead of at every slot.
+%
+%   INDEX = BUILDSLOTINDEX(SLOTS, IMAGESIZE, CELLSIZE) uses CELLSIZE-by-
+%   CELLSIZE cells. With CELLSIZE equal to the tile size, the slots of
+%   each tile are read directly from its cell (see slotTileGrid).
+%
+%   Slots are placed by the pixels they cover (see slotPixelBounds), so a
+%   slot belongs to a cell when it has at least one pixel in it. INDEX is
+%   a struct with fields
+%     cellSize   Cell side in pixels
+%     imageSize  [height width] of the image
+%     gridSize   Number of cell [rows columns]
+%     bounds     N-by-4 [r1 r2 c1 c2] pixel bounds of the slots
+%     valid      N-by-1, false for slots outside the image
+%     cellStart  Slots of cell c are cellSlots(cellStart(c):cellStart(c+1)-1),
+%                cells numbered column-major over gridSize
+%     cellSlots  Slot indices, ascending within each cell
+%
+%   See also querySlotIndex, slotTileGrid, readSlotLayout.
+
+    arguments
+        slots (:,4) double
+        imageSize (1,:) double
+        cellSize (1,1) double {mustBePositive, mustBeInteger} = 256
+    end
+
+    m = imageSize(1);
+    n = imageSize(2);
+    gridSize = [ceil(m / cellSize), ceil(n / cellSize)];
+    [bounds, valid] = slotPixelBounds(slots, [m n]);
+
+    % --- Cell Range of Every Slot ---
+    idx = find(valid);
+    cr1 = floor((bounds(idx,1) - 1) / cellSize) + 1;
+    cr2 = floor((bounds(idx,2) - 1) / cellSize) + 1;
+    cc1 = floor((bounds(idx,3) - 1) / cellSize) + 1;
+    cc2 = floor((bounds(idx,4) - 1) / cellSize) + 1;
+    nr = cr2 - cr1 + 1;
+    perSlot = nr .* (cc2 - cc1 + 1);
+
+    % --- One (cell, slot) Pair per Covered Cell, without Looping ---
+    slotOf = repelem(idx, perSlot);
+    offset = (0:sum(perSlot) - 1)' - repelem(cumsum(perSlot) - perSlot, perSlot);
+    nrOf = repelem(nr, perSlot);
+    cellRow = repelem(cr1, perSlot) + mod(offset, nrOf);
+    cellCol = repelem(cc1, perSlot) + floor(offset ./ nrOf);
+    cellOf = sub2ind(gridSize, cellRow, cellCol);
+
+    % --- Compressed Cell Lists (stable sort keeps slots ascending) ---
+    [cellOf, order] = sort(cellOf);
+    nCells = prod(gridSize);
+    counts = accumarray(cellOf, 1, [nCells 1]);
+
+    index.cellSize = cellSize;
+    index.imageSize = [m n];
+    index.gridSize = gridSize;
+    index.bounds = bounds;
+    index.valid = valid;
+    index.cellStart = [1; cumsum(counts) + 1];
+    index.cellSlots = slotOf(order);
+end
@@ -0,0 +1,101 @@
+function [best, curves, density] = calibrateThreshold(frames, slots, occupied, opts)
+%CALIBRATETHRESHOLD Choose the density threshold from labelled frames.
+%   [BEST, CURVES] = CALIBRATETHRESHOLD(FRAMES, SLOTS, OCCUPIED) computes
+%   the edge density of every slot in every frame once, then scores all
+%   candidate thresholds against the ground truth and returns the best
+%   one. FRAMES is a folder or list of image files (see listFrameFiles)
+%   of one lot, SLOTS its slot layout (see loadSlots) and OCCUPIED the
+%   N-slots-by-F-frames ground truth, true for Occupied, NaN where a slot
+%   is not labelled.
+%
+%   FRAMES can also be an N-by-F density matrix computed earlier, e.g.
+%   the DENSITY output of a previous call, in which case SLOTS is not
+%   used and the sweep alone takes a fraction of a second.
+%
+%   BEST is a struct with the chosen threshold and its accuracy,
+%   precision, recall and f1. When several thresholds reach the best
+%   score the middle one of the first such run is chosen, so the result
+%   sits away from the edges of the plateau. CURVES is the
+%   sweepThresholds table of every candidate. DENSITY is the N-by-F
+%   density matrix.
+%
+%   With 'PerSlot' true, BEST also has slotThreshold, the best threshold
+%   of each slot on its own, and slotScore, the metric it reaches.
+%
+%   Name-value options:
+%     'Thresholds'  Candidate thresholds (default linspace(0, 0.2, 401))
+%     'Metric'      Score to maximize: 'accuracy', 'f1', 'precision' or
+%                   'recall' (default 'accuracy')
+%     'PerSlot'     Also calibrate every slot separately (default false)
+%     'Lot'         Lot name copied into BEST (default '')
+%     'CannyThreshold', 'StrelSize', 'Preprocess', 'Cache'
+%                   Passed to detectParkingBatch
+%
+%   Example:
+%     load('labels.mat', 'occupied');   % N-by-F logical
+%     [best, curves] = calibrateThreshold('frames', 'slots.mat', occupied, ...
+%         'Metric', 'f1', 'Cache', 'cache');
+%     plot(curves.recall, curves.precision)
+%
+%   See also sweepThresholds, detectParkingBatch, classifySlots.
+
+    arguments
+        frames
+        slots
+        occupied
+        opts.Thresholds (1,:) double = linspace(0, 0.2, 401)
+        opts.Metric {mustBeMember(opts.Metric, {'accuracy', 'f1', 'precision', 'recall'})} = 'accuracy'
+        opts.PerSlot (1,1) logical = false
+        opts.Lot {mustBeTextScalar} = ''
+        opts.CannyThreshold (1,2) double = [0.1 0.2]
+        opts.StrelSize (1,2) double = [3 3]
+        opts.Preprocess {mustBeMember(opts.Preprocess, {'full', 'roi'})} = 'full'
+        opts.Cache = []
+    end
+
+    % --- Densities, Once per Frame ---
+    if isnumeric(frames)
+        density = frames;
+    else
+        [~, slotTable, stats] = detectParkingBatch(frames, slots, ...
+            'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize, ...
+            'Preprocess', opts.Preprocess, 'Cache', opts.Cache, 'Verbose', false);
+        density = reshape(slotTable.density, stats.slots, stats.frames);
+    end
+
+    % --- Sweep ---
+    curves = sweepThresholds(density, occupied, opts.Thresholds);
+    best = bestRow(curves, opts.Metric);
+    best.lot = char(opts.Lot);
+    best.metric = opts.Metric;
+
+    if opts.PerSlot
+        nSlots = size(density, 1);
+        best.slotThreshold = nan(nSlots, 1);
+        best.slotScore = nan(nSlots, 1);
+        for i = 1:nSlots
+            slotBest = bestRow(sweepThresholds(density(i,:), occupied(i,:), opts.Thresholds), opts.Metric);
+            best.slotThreshold(i) = slotBest.threshold;
+            best.slotScore(i) = slotBest.(opts.Metric);
+        end
+    end
+end
+
+function best = bestRow(curves, metric)
+    % Metrics at the middle threshold of the first best-scoring run
+    score = curves.(metric);
+    score(isnan(score)) = -Inf;
+    top = score == max(score);
+    first = find(top, 1);
+    last = first;
+    while last < numel(top) && top(last + 1)
+        last = last + 1;
+    end
+    k = floor((first + last) / 2);
+
+    best.threshold = curves.threshold(k);
+    best.accuracy = curves.accuracy(k);
+    best.precision = curves.precision(k);
+    best.recall = curves.recall(k);
+    best.f1 = curves.f1(k);
+end
@@ -0,0 +1,32 @@
+function cannyImage = cannyEdgesScaled(gray, cannyThreshold, gradientMax, localMax)
+%CANNYEDGESSCALED Canny edges of a crop with whole-image thresholds.
+%   CANNYIMAGE = CANNYEDGESSCALED(GRAY, CANNYTHRESHOLD, GRADIENTMAX) runs
+%   edge(GRAY, 'canny', ...) on a crop of a larger image, rescaling the
+%   [low high] CANNYTHRESHOLD so that they are relative to GRADIENTMAX,
+%   the cannyGradientMax of the whole image, instead of the crop's own
+%   maximum. Away from the crop border this gives the same edges as
+%   cropping the edge map of the whole image.
+%
+%   CANNYIMAGE = CANNYEDGESSCALED(GRAY, CANNYTHRESHOLD, GRADIENTMAX,
+%   LOCALMAX) uses LOCALMAX, the cannyGradientMax of GRAY itself, when the
+%   caller already computed it, instead of computing it again.
+%
+%   See also cannyGradientMax, roiSlotDensity, SlotDensityKernel, edge.
+
+    cannyImage = false(size(gray, 1), size(gray, 2));
+
+    if nargin < 4
+        localMax = cannyGradientMax(gray);
+    end
+    if localMax == 0 || gradientMax == 0
+        return;
+    end
+
+    scaled = cannyThreshold * gradientMax / localMax;
+    if scaled(2) >= 1
+        % No pixel of the crop reaches the high threshold
+        return;
+    end
+
+    cannyImage = edge(gray, 'canny', scaled, 'both');
+end
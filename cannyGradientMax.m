@@ -0,0 +1,46 @@
+function [gradientMax, magnitude] = cannyGradientMax(gray, sigma)
+%CANNYGRADIENTMAX Largest Canny gradient magnitude of an image.
+%   GRADIENTMAX = CANNYGRADIENTMAX(GRAY) returns the maximum of the
+%   derivative-of-Gaussian gradient magnitude that edge(GRAY, 'canny')
+%   computes internally (sigma = sqrt(2), replicated borders). edge
+%   divides the magnitude by this value before applying its thresholds,
+%   so it is what relates Canny thresholds on a crop to thresholds on the
+%   whole image.
+%
+%   GRADIENTMAX = CANNYGRADIENTMAX(GRAY, SIGMA) uses another Gaussian
+%   standard deviation.
+%
+%   [GRADIENTMAX, MAGNITUDE] = CANNYGRADIENTMAX(...) also returns the
+%   gradient magnitude image, so the maximum over part of a crop can be
+%   taken (see tiledSlotDensity).
+%
+%   See also cannyEdgesScaled, edge.
+
+    arguments
+        gray {mustBeNumericOrLogical}
+        sigma (1,1) double = sqrt(2)
+    end
+
+    I = im2single(gray);
+
+    % --- 1-D Gaussian and Derivative of Gaussian Kernels ---
+    filterExtent = ceil(4*sigma);
+    x = -filterExtent:filterExtent;
+    gaussKernel = exp(-(x.^2) / (2*sigma^2));
+    gaussKernel = gaussKernel / sum(gaussKernel);
+
+    derivGaussKernel = gradient(gaussKernel);
+    negVals = derivGaussKernel < 0;
+    posVals = derivGaussKernel > 0;
+    derivGaussKernel(posVals) = derivGaussKernel(posVals) / sum(derivGaussKernel(posVals));
+    derivGaussKernel(negVals) = derivGaussKernel(negVals) / abs(sum(derivGaussKernel(negVals)));
+
+    % --- Smoothed Gradient ---
+    GX = imfilter(I, gaussKernel', 'conv', 'replicate');
+    GX = imfilter(GX, derivGaussKernel, 'conv', 'replicate');
+    GY = imfilter(I, gaussKernel, 'conv', 'replicate');
+    GY = imfilter(GY, derivGaussKernel', 'conv', 'replicate');
+
+    magnitude = hypot(GX, GY);
+    gradientMax = double(max(magnitude, [], 'all'));
+end
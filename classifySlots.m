@@ -0,0 +1,31 @@
+function [results, summary] = classifySlots(slots, density, threshold)
+%CLASSIFYSLOTS Label parking slots as Occupied or Empty by edge density.
+%   [RESULTS, SUMMARY] = CLASSIFYSLOTS(SLOTS, DENSITY, THRESHOLD) marks a
+%   slot as Occupied when its DENSITY is strictly greater than THRESHOLD.
+%
+%   RESULTS is a scalar struct of columns, one row per slot:
+%     rect     N-by-4 [x y width height] slot rectangles
+%     density  N-by-1 edge densities
+%     status   N-by-1 uint8 status codes, 1 for Occupied and 0 for Empty
+%              (see slotStatusNames)
+%   SUMMARY is a struct with fields total, occupied, empty and
+%   occupancyRate (in percent).
+%
+%   See also detectParkingSlots, slotEdgeDensity, slotResultsTable.
+
+    nSlots = size(slots, 1);
+
+    results.rect = slots;
+    results.density = reshape(density, [], 1);
+    results.status = uint8(results.density > threshold);
+
+    occupiedCount = nnz(results.status);
+    summary.total = nSlots;
+    summary.occupied = occupiedCount;
+    summary.empty = nSlots - occupiedCount;
+    if nSlots > 0
+        summary.occupancyRate = (occupiedCount / nSlots) * 100;
+    else
+        summary.occupancyRate = 0;
+    end
+end
@@ -0,0 +1,118 @@
+function masks = compileSlotMasks(slots, imageSize, opts)
+%COMPILESLOTMASKS Rasterize slots once into pixel index lists.
+%   MASKS = COMPILESLOTMASKS(SLOTS, IMAGESIZE) rasterizes every slot of
+%   an image of size IMAGESIZE into the list of its pixels, so that
+%   maskedSlotDensity can score all slots of a frame in one pass. SLOTS
+%   is either
+%     - an N-by-4 [x y width height] matrix, optionally turned about each
+%       slot's center with 'Rotation', or
+%     - an N-by-1 cell array of K-by-2 [x y] polygon vertices, for bays
+%       of any shape.
+%
+%   Axis-aligned rectangles (rotation 0) cover exactly the pixels imcrop
+%   returns and are divided by width*height, so they score the same as
+%   slotEdgeDensity. Rotated rectangles and polygons are rasterized with
+%   poly2mask and divided by their pixel count, so angled bays are scored
+%   without the background around them.
+%
+%   MASKS is a struct with fields
+%     imageSize     [height width] the masks were compiled for
+%     rect          N-by-4 slot rectangle (the bounding box of polygons)
+%     rotation      N-by-1 rotation in degrees (0 for polygons)
+%     polygons      N-by-1 cell of slot outlines as [x y] vertices
+%     pixelIdx      Linear indices of the slot pixels, slot after slot
+%     slotStart     Pixels of slot i are pixelIdx(slotStart(i):slotStart(i+1)-1)
+%     area          N-by-1 density denominator
+%     outlineIdx    Linear indices of the slot boundary pixels
+%     outlineStart  Boundary pixels of slot i, as slotStart
+%
+%   Name-value options:
+%     'Rotation'  N-by-1 rotation in degrees, clockwise as displayed, for
+%                 an N-by-4 SLOTS (default 0 for every slot)
+%
+%   Example:
+%     [slots, rotation] = loadSlots('north.pslot');
+%     masks = compileSlotMasks(slots, size(img), 'Rotation', rotation);
+%     [results, summary] = detectParkingSlots(img, masks);
+%
+%   See also maskedSlotDensity, slotPolygons, detectParkingSlots.
+
+    arguments
+        slots
+        imageSize (1,:) double
+        opts.Rotation (:,1) double = []
+    end
+
+    m = imageSize(1);
+    n = imageSize(2);
+
+    % --- Slot Outlines ---
+    if iscell(slots)
+        polygons = slots(:);
+        nSlots = numel(polygons);
+        rotation = zeros(nSlots, 1);
+        isBox = false(nSlots, 1);
+        rect = zeros(nSlots, 4);
+        for i = 1:nSlots
+            lo = min(polygons{i}, [], 1);
+            hi = max(polygons{i}, [], 1);
+            rect(i,:) = [lo, hi - lo];
+        end
+    else
+        rect = slots;
+        nSlots = size(rect, 1);
+        rotation = opts.Rotation;
+        if isempty(rotation)
+            rotation = zeros(nSlots, 1);
+        end
+        polygons = slotPolygons(rect, rotation);
+        isBox = rotation == 0;
+    end
+
+    % --- Pixel Box of Every Slot ---
+    % Axis-aligned slots use the imcrop ranges; others the clipped
+    % bounding box of their polygon
+    [bounds, valid] = slotPixelBounds(rect, [m n]);
+    for i = find(~isBox & valid)'
+        lo = floor(min(polygons{i}, [], 1));
+        hi = ceil(max(polygons{i}, [], 1));
+        bounds(i,:) = [max(lo(2), 1), min(hi(2), m), max(lo(1), 1), min(hi(1), n)];
+    end
+
+    % --- Rasterize ---
+    pixelLists = cell(nSlots, 1);
+    outlineLists = cell(nSlots, 1);
+    area = rect(:,3) .* rect(:,4);
+    for i = 1:nSlots
+        r1 = bounds(i,1); r2 = bounds(i,2);
+        c1 = bounds(i,3); c2 = bounds(i,4);
+        if ~valid(i) || r1 > r2 || c1 > c2
+            pixelLists{i} = zeros(0, 1, 'uint32');
+            outlineLists{i} = zeros(0, 1, 'uint32');
+            continue;
+        end
+
+        if isBox(i)
+            local = true(r2 - r1 + 1, c2 - c1 + 1);
+        else
+            local = poly2mask(polygons{i}(:,1) - c1 + 1, polygons{i}(:,2) - r1 + 1, ...
+                r2 - r1 + 1, c2 - c1 + 1);
+            area(i) = nnz(local);
+        end
+
+        [rr, cc] = find(local);
+        pixelLists{i} = uint32((cc + c1 - 2) * m + rr + r1 - 1);
+        [rr, cc] = find(bwperim(local));
+        outlineLists{i} = uint32((cc + c1 - 2) * m + rr + r1 - 1);
+    end
+
+    masks.imageSize = [m n];
+    masks.rect = rect;
+    masks.rotation = rotation;
+    masks.polygons = polygons;
+    masks.pixelIdx = vertcat(pixelLists{:});
+    masks.slotStart = [1; cumsum(cellfun(@numel, pixelLists)) + 1];
+    masks.area = area;
+    masks.outlineIdx = vertcat(outlineLists{:});
+    masks.outlineStart = [1; cumsum(cellfun(@numel, outlineLists)) + 1];
+end
@@ -0,0 +1,376 @@
+function [results, summary, info] = detectParkingSlots(img, slots, opts)
+%DETECTPARKINGSLOTS Headless parking slot occupancy detection.
+%   [RESULTS, SUMMARY] = DETECTPARKINGSLOTS(IMG, SLOTS) runs the
+%   ParkingDetectorPro pipeline (grayscale, Canny, 3x3 closing, per-slot
+%   edge density, thresholding) on IMG without creating any UI objects.
+%   IMG is an image array or an image file name. SLOTS is an N-by-4
+%   matrix of [x y width height] rectangles, or the compileSlotMasks
+%   masks of rotated or polygon slots (only with 'Preprocess' 'full').
+%
+%   RESULTS is a struct of per-slot columns rect, density and status
+%   (uint8, 1 for Occupied, see classifySlots). SUMMARY has fields total,
+%   occupied, empty and occupancyRate.
+%
+%   [RESULTS, SUMMARY, INFO] = DETECTPARKINGSLOTS(...) also returns INFO
+%   with the elapsed time, the wall time of each pipeline stage in
+%   stageTimes, whether the densities came from the cache in cacheHit
+%   and, when 'KeepIntermediates' is true, the cannyImage and morphImage
+%   edge maps. 'pyramid' runs also report the pyramidScale used and which
+%   slots were refined at full resolution (refined, refinedFraction);
+%   pyramidScale is 1 when the slots were too small for a coarse level and
+%   the full pipeline ran instead.
+%
+%   When ParkingTelemetry.instance is enabled the run, with its stage
+%   times, image size and slot count, is recorded there.
+%
+%   Name-value options:
+%     'Threshold'          Edge density threshold (default 0.07)
+%     'CannyThreshold'     Canny [low high] thresholds (default [0.1 0.2])
+%     'StrelSize'          Closing rectangle size (default [3 3])
+%     'KeepIntermediates'  Return the full-resolution edge maps in INFO;
+%                          ignored for 'tiled', 'pyramid' and 'fused'
+%                          (default false)
+%     'Preprocess'         'full' runs Canny and closing on the whole
+%                          image; 'roi' only on the padded tiles that
+%                          cover the slots (see roiSlotDensity); 'tiled'
+%                          processes the image tile by tile with bounded
+%                          memory, reading TIFF and JPEG 2000 files in
+%                          regions (see tiledSlotDensity); 'pyramid'
+%                          runs it on a downscaled image and only
+%                          re-scores slots near the threshold at full
+%                          resolution (see pyramidSlotDensity); 'fused'
+%                          streams the image in row bands, running gray
+%                          conversion, Canny, closing and the slot counts
+%                          band by band (see SlotDensityKernel)
+%                          (default 'full')
+%     'TileSize', 'Halo'   Tile side and padding for 'roi', 'tiled' and
+%                          the 'pyramid' refinement, band height and
+%                          padding for 'fused'
+%                          (default 256 and 16 pixels; 'tiled' uses 1024
+%                          when TileSize is not given)
+%     'UseParallel'        Spread the 'tiled' tiles over the current
+%                          parallel pool (default false)
+%     'PyramidScale'       Downscale factor for 'pyramid'; empty picks
+%                          one from the slot size (default [])
+%     'UncertaintyBand'    Densities within this distance of the
+%                          threshold are re-scored at full resolution
+%                          by 'pyramid' (default 0.02)
+%     'GradientMax'        Canny gradient scale for 'roi', 'tiled',
+%                          'pyramid' and 'fused'. Empty computes it from
+%                          the whole image, which
+%                          keeps the edges identical to 'full'; pass
+%                          INFO.gradientMax of an earlier frame of the
+%                          same camera to skip that pass (default [])
+%     'Workspace'          SlotDensityKernel reused by 'fused' runs, so
+%                          frames of one camera skip its setup; a new
+%                          one is built when it does not fit the slots,
+%                          image size or parameters (default [])
+%     'Lot'                Lot name the run is recorded under in
+%                          ParkingTelemetry (default '')
+%     'Cache'              ParkingResultCache, or its folder, to reuse
+%                          the densities and edge maps of an earlier run
+%                          on the same image, slots and parameters
+%                          (default [], no cache)
+%     'ProgressFcn'        Function called as FCN(STAGE, FRACTION) as the
+%                          run proceeds: after each stage ('lookup',
+%                          'read', 'gray', 'canny', 'close', 'gradient',
+%                          'density', 'classify'), and in 'roi',
+%                          'pyramid' and 'fused' runs after each tile or
+%                          band of slots with STAGE 'density'. FRACTION
+%                          estimates the share of the run done, reaching
+%                          1 after 'classify'.
+%                          It is called from wherever the detection runs,
+%                          e.g. a worker, so it typically sends to a
+%                          parallel.pool.DataQueue (default [])
+%
+%   Example:
+%     img = imread('back-parking.jpg');
+%     load('slots.mat', 'slots');
+%     [results, summary] = detectParkingSlots(img, slots, 'Threshold', 0.05);
+%
+%   See also detectParkingBatch, parkingPreprocess, slotEdgeDensity,
+%   roiSlotDensity, tiledSlotDensity, pyramidSlotDensity, SlotDensityKernel,
+%   classifySlots, compileSlotMasks, ParkingTelemetry, ParkingResultCache.
+
+    arguments
+        img
+        slots
+        opts.Threshold (1,1) double = 0.07
+        opts.CannyThreshold (1,2) double = [0.1 0.2]
+        opts.StrelSize (1,2) double = [3 3]
+        opts.KeepIntermediates (1,1) logical = false
+        opts.Preprocess {mustBeMember(opts.Preprocess, {'full', 'roi', 'tiled', 'pyramid', 'fused'})} = 'full'
+        opts.TileSize double {mustBePositive, mustBeInteger} = []
+        opts.Halo (1,1) double {mustBeNonnegative, mustBeInteger} = 16
+        opts.UseParallel (1,1) logical = false
+        opts.PyramidScale double = []
+        opts.UncertaintyBand (1,1) double {mustBeNonnegative} = 0.02
+        opts.GradientMax double = []
+        opts.Workspace = []
+        opts.Lot {mustBeTextScalar} = ''
+        opts.Cache = []
+        opts.ProgressFcn = []
+    end
+
+    t0 = tic;
+
+    % Rotated and polygon slots come precompiled by compileSlotMasks
+    masks = [];
+    if isstruct(slots)
+        masks = slots;
+        slots = masks.rect;
+        if ~strcmp(opts.Preprocess, 'full')
+            error('detectParkingSlots:masks', ...
+                'Compiled slot masks can only be used with ''Preprocess'', ''full''.');
+        end
+    elseif ~isnumeric(slots) || size(slots, 2) ~= 4
+        error('detectParkingSlots:slots', ...
+            'SLOTS must be an N-by-4 matrix or masks from compileSlotMasks.');
+    end
+
+    source = '';
+    if ischar(img) || isStringScalar(img)
+        source = char(img);
+    end
+    if isempty(opts.TileSize)
+        if strcmp(opts.Preprocess, 'tiled')
+            opts.TileSize = 1024;
+        else
+            opts.TileSize = 256;
+        end
+    end
+    if any(strcmp(opts.Preprocess, {'tiled', 'pyramid', 'fused'}))
+        opts.KeepIntermediates = false;
+    end
+
+    % --- Cache Lookup ---
+    stageTimes = struct();
+    cacheHit = false;
+    if ~isempty(opts.Cache)
+        cache = opts.Cache;
+        if ~isa(cache, 'ParkingResultCache')
+            cache = ParkingResultCache(cache);
+        end
+
+        tStage = tic;
+        key = ParkingResultCache.key(img, cacheSlots(slots, masks), cacheParams(opts));
+        stageTimes.hash = toc(tStage);
+
+        tStage = tic;
+        variables = {'density', 'details'};
+        if opts.KeepIntermediates
+            variables = [variables, {'cannyImage', 'morphImage'}];
+        end
+        [entry, cacheHit] = lookup(cache, key, variables);
+        stageTimes.lookup = toc(tStage);
+        reportProgress(opts, 'lookup', 0.05);
+    end
+
+    if cacheHit
+        density = entry.density;
+        details = entry.details;
+        if opts.KeepIntermediates
+            cannyImage = entry.cannyImage;
+            morphImage = entry.morphImage;
+        end
+    else
+        [density, details, cannyImage, morphImage, computeTimes] = computeDensity(img, slots, masks, opts);
+        for f = fieldnames(computeTimes)'
+            stageTimes.(f{1}) = computeTimes.(f{1});
+        end
+
+        if ~isempty(opts.Cache)
+            entry = struct('density', density, 'details', details);
+            if opts.KeepIntermediates
+                entry.cannyImage = cannyImage;
+                entry.morphImage = morphImage;
+            end
+            tStage = tic;
+            store(cache, key, entry);
+            stageTimes.store = toc(tStage);
+        end
+    end
+
+    % --- Per-slot Classification ---
+    tStage = tic;
+    [results, summary] = classifySlots(slots, density, opts.Threshold);
+    stageTimes.classify = toc(tStage);
+    reportProgress(opts, 'classify', 1);
+
+    info = details;
+    info.elapsed = toc(t0);
+    info.stageTimes = stageTimes;
+    info.cacheHit = cacheHit;
+    if opts.KeepIntermediates
+        info.cannyImage = cannyImage;
+        info.morphImage = morphImage;
+    end
+
+    % --- Telemetry ---
+    tel = ParkingTelemetry.instance();
+    if tel.Enabled
+        record(tel, struct('source', source, 'lot', char(opts.Lot), ...
+            'imageSize', info.imageSize, 'slots', size(slots, 1), ...
+            'stages', stageTimes, 'cacheHits', cacheHit * size(slots, 1), 'elapsed', info.elapsed));
+    end
+end
+
+function [density, details, cannyImage, morphImage, stageTimes] = computeDensity(img, slots, masks, opts)
+    % Runs the selected pipeline; DETAILS holds the image size and the
+    % mode-specific INFO fields
+    cannyImage = [];
+    morphImage = [];
+    stageTimes = struct();
+
+    if (ischar(img) || isStringScalar(img)) && ~strcmp(opts.Preprocess, 'tiled')
+        tStage = tic;
+        img = imread(img);
+        stageTimes.read = toc(tStage);
+        reportProgress(opts, 'read', 0.1);
+    end
+    details.imageSize = size(img);
+
+    switch opts.Preprocess
+        case 'full'
+            % --- Image Processing Pipeline ---
+            stageDone = struct('gray', 0.15, 'canny', 0.75, 'close', 0.9);
+            preprocessProgress = [];
+            if ~isempty(opts.ProgressFcn)
+                preprocessProgress = @(stage) reportProgress(opts, stage, stageDone.(stage));
+            end
+            [~, cannyImage, morphImage, preprocessTimes] = parkingPreprocess(img, ...
+                'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize, ...
+                'ProgressFcn', preprocessProgress);
+            stageTimes.gray = preprocessTimes.gray;
+            stageTimes.canny = preprocessTimes.canny;
+            stageTimes.close = preprocessTimes.close;
+
+            tStage = tic;
+            if isempty(masks)
+                density = slotEdgeDensity(morphImage, slots);
+            else
+                density = maskedSlotDensity(morphImage, masks);
+            end
+            stageTimes.density = toc(tStage);
+            reportProgress(opts, 'density', 0.95);
+
+        case 'roi'
+            % --- Pipeline Restricted to the Tiles Covering the Slots ---
+            tStage = tic;
+            if size(img, 3) == 3
+                gray = rgb2gray(img);
+            else
+                gray = img;
+            end
+            stageTimes.gray = toc(tStage);
+            reportProgress(opts, 'gray', 0.15);
+            if isempty(opts.GradientMax)
+                tStage = tic;
+                opts.GradientMax = cannyGradientMax(gray);
+                stageTimes.gradient = toc(tStage);
+                reportProgress(opts, 'gradient', 0.3);
+            end
+
+            roiArgs = {gray, slots, opts.GradientMax, ...
+                'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize, ...
+                'TileSize', opts.TileSize, 'Halo', opts.Halo, ...
+                'ProgressFcn', densityProgress(opts, 0.3)};
+            tStage = tic;
+            if opts.KeepIntermediates
+                [density, roiInfo, cannyImage, morphImage] = roiSlotDensity(roiArgs{:});
+            else
+                [density, roiInfo] = roiSlotDensity(roiArgs{:});
+            end
+            stageTimes.roiDensity = toc(tStage);
+            details.gradientMax = opts.GradientMax;
+            details.processedFraction = roiInfo.processedFraction;
+
+        case 'pyramid'
+            % --- Coarse Pipeline, Refined Near the Threshold ---
+            tStage = tic;
+            if size(img, 3) == 3
+                gray = rgb2gray(img);
+            else
+                gray = img;
+            end
+            stageTimes.gray = toc(tStage);
+            reportProgress(opts, 'gray', 0.15);
+
+            tStage = tic;
+            [density, pyramidInfo] = pyramidSlotDensity(gray, slots, opts.Threshold, ...
+                'Scale', opts.PyramidScale, 'Band', opts.UncertaintyBand, ...
+                'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize, ...
+                'TileSize', opts.TileSize, 'Halo', opts.Halo, 'GradientMax', opts.GradientMax, ...
+                'ProgressFcn', densityProgress(opts, 0.15));
+            stageTimes.pyramidDensity = toc(tStage);
+            details.gradientMax = pyramidInfo.gradientMax;
+            details.pyramidScale = pyramidInfo.scale;
+            details.refined = pyramidInfo.refined;
+            details.refinedFraction = pyramidInfo.refinedFraction;
+            details.processedFraction = pyramidInfo.processedFraction;
+
+        case 'fused'
+            % --- Row-Band Kernel with a Reusable Workspace ---
+            kernel = opts.Workspace;
+            if isempty(kernel) || ~fits(kernel, slots, size(img), opts.CannyThreshold, opts.StrelSize) ...
+                    || kernel.BandHeight ~= opts.TileSize || kernel.Halo ~= opts.Halo
+                kernel = SlotDensityKernel(slots, size(img), ...
+                    'BandHeight', opts.TileSize, 'Halo', opts.Halo, ...
+                    'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize);
+            end
+
+            tStage = tic;
+            [density, kernelInfo] = run(kernel, img, 'GradientMax', opts.GradientMax, ...
+                'ProgressFcn', densityProgress(opts, 0.15));
+            stageTimes.fusedDensity = toc(tStage);
+            details.gradientMax = kernelInfo.gradientMax;
+
+        case 'tiled'
+            % --- Tile-by-Tile Pipeline with Bounded Memory ---
+            tStage = tic;
+            [density, tiledInfo] = tiledSlotDensity(img, slots, ...
+                'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize, ...
+                'TileSize', opts.TileSize, 'Halo', opts.Halo, ...
+                'UseParallel', opts.UseParallel, 'GradientMax', opts.GradientMax);
+            stageTimes.tiledDensity = toc(tStage);
+            reportProgress(opts, 'density', 0.95);
+            details.imageSize = tiledInfo.imageSize;
+            details.gradientMax = tiledInfo.gradientMax;
+    end
+end
+
+function reportProgress(opts, stage, fraction)
+    if ~isempty(opts.ProgressFcn)
+        opts.ProgressFcn(stage, fraction);
+    end
+end
+
+function fcn = densityProgress(opts, start)
+    % Maps the tile progress of the density stage to [START 0.95]
+    fcn = [];
+    if ~isempty(opts.ProgressFcn)
+        fcn = @(fraction) opts.ProgressFcn('density', start + (0.95 - start) * fraction);
+    end
+end
+
+function slots = cacheSlots(slots, masks)
+    % Slot layout the cache key is computed from
+    if ~isempty(masks)
+        slots = masks;
+    end
+end
+
+function params = cacheParams(opts)
+    % Every option that changes the densities; the threshold only does
+    % for 'pyramid', where it decides which slots are refined
+    params = sprintf('%s|canny=%.17g,%.17g|strel=%g,%g', opts.Preprocess, ...
+        opts.CannyThreshold, opts.StrelSize);
+    if ~strcmp(opts.Preprocess, 'full')
+        params = sprintf('%s|tile=%d|halo=%d|gradientMax=%.17g', params, ...
+            opts.TileSize, opts.Halo, opts.GradientMax);
+    end
+    if strcmp(opts.Preprocess, 'pyramid')
+        params = sprintf('%s|scale=%s|band=%.17g|threshold=%.17g', params, ...
+            mat2str(opts.PyramidScale, 17), opts.UncertaintyBand, opts.Threshold);
+    end
+end
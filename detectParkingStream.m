@@ -0,0 +1,155 @@
+function [frameTable, density, stats] = detectParkingStream(source, slots, opts)
+%DETECTPARKINGSTREAM Incremental slot detection over a video or image sequence.
+%   [FRAMETABLE, DENSITY, STATS] = DETECTPARKINGSTREAM(SOURCE, SLOTS)
+%   reads the frames of SOURCE one at a time and classifies the parking
+%   slots of each with a ParkingStreamDetector, which only re-evaluates
+%   slots whose pixels changed since they were last evaluated, or with a
+%   SlotBackgroundModel, which compares every slot with a learned
+%   empty-lot reference and only re-evaluates ambiguous ones. SOURCE is
+%   a video file readable by VideoReader, a folder of images or a list of
+%   image files (see listFrameFiles). SLOTS is an N-by-4 [x y width
+%   height] matrix or a slots .mat file (see loadSlots).
+%
+%   FRAMETABLE has one row per frame with the occupied, empty and
+%   occupancy rate summary, the number of slots re-evaluated and the
+%   frame time. DENSITY is the N-by-F matrix of slot densities. STATS
+%   reports the frame count, frames per second and the fraction of slot
+%   evaluations that were skipped; for image sequences it also has io,
+%   the ParkingFrameReader throughput table.
+%
+%   Name-value options:
+%     'Method'       'change' for ParkingStreamDetector or 'background'
+%                    for SlotBackgroundModel (default 'change')
+%     'Threshold', 'RefreshInterval', 'CannyThreshold', 'StrelSize', 'Halo'
+%                    Passed to either detector
+%     'ChangeDelta'  Passed to ParkingStreamDetector (default 4)
+%     'EmptyDelta', 'OccupiedDelta', 'LearningRate'
+%                    Passed to SlotBackgroundModel (defaults 6, 25, 0.05)
+%     'Lot'          Lot name of the frames, used for telemetry and the
+%                    exported rows (default '')
+%     'OutputFile'   Base name of a ParkingResultWriter export; each
+%                    frame's slot results are appended to it as the frame
+%                    is processed, stamped with the time it was read
+%                    (default '', no export)
+%     'Prefetch'     Image frames decoded ahead by the
+%                    ParkingFrameReader that reads image sequences
+%                    (default 0)
+%     'MaxFrames'    Stop after this many frames (default Inf)
+%     'Verbose'      Print the throughput when done (default true)
+%
+%   See also ParkingStreamDetector, SlotBackgroundModel, ParkingResultWriter,
+%   detectParkingBatch.
+
+    arguments
+        source
+        slots
+        opts.Method {mustBeMember(opts.Method, {'change', 'background'})} = 'change'
+        opts.Threshold (1,1) double = 0.07
+        opts.ChangeDelta (1,1) double {mustBeNonnegative} = 4
+        opts.EmptyDelta (1,1) double {mustBeNonnegative} = 6
+        opts.OccupiedDelta (1,1) double {mustBeNonnegative} = 25
+        opts.LearningRate (1,1) double {mustBeInRange(opts.LearningRate, 0, 1)} = 0.05
+        opts.RefreshInterval (1,1) double {mustBeNonnegative, mustBeInteger} = 0
+        opts.CannyThreshold (1,2) double = [0.1 0.2]
+        opts.StrelSize (1,2) double = [3 3]
+        opts.Halo (1,1) double {mustBeNonnegative, mustBeInteger} = 16
+        opts.Lot {mustBeTextScalar} = ''
+        opts.OutputFile {mustBeTextScalar} = ''
+        opts.Prefetch (1,1) double {mustBeNonnegative, mustBeInteger} = 0
+        opts.MaxFrames (1,1) double {mustBePositive} = Inf
+        opts.Verbose (1,1) logical = true
+    end
+
+    slots = loadSlots(slots);
+    common = {'Threshold', opts.Threshold, ...
+        'RefreshInterval', opts.RefreshInterval, ...
+        'CannyThreshold', opts.CannyThreshold, ...
+        'StrelSize', opts.StrelSize, ...
+        'Halo', opts.Halo, ...
+        'Lot', opts.Lot};
+    if strcmp(opts.Method, 'background')
+        detector = SlotBackgroundModel(slots, common{:}, ...
+            'EmptyDelta', opts.EmptyDelta, ...
+            'OccupiedDelta', opts.OccupiedDelta, ...
+            'LearningRate', opts.LearningRate);
+    else
+        detector = ParkingStreamDetector(slots, common{:}, ...
+            'ChangeDelta', opts.ChangeDelta);
+    end
+
+    writer = [];
+    if strlength(opts.OutputFile) > 0
+        writer = ParkingResultWriter(opts.OutputFile);
+    end
+
+    [hasNext, readNext, reader] = frameReader(source, opts.Prefetch);
+    nSlots = size(slots, 1);
+
+    occupied = zeros(0, 1);
+    empty = zeros(0, 1);
+    occupancyRate = zeros(0, 1);
+    slotsEvaluated = zeros(0, 1);
+    elapsed = zeros(0, 1);
+    density = zeros(nSlots, 0);
+
+    t0 = tic;
+    k = 0;
+    while k < opts.MaxFrames && hasNext()
+        k = k + 1;
+        image = readNext();
+        timestamp = datetime('now', 'TimeZone', 'UTC');
+        [results, summary, frameInfo] = step(detector, image);
+        if ~isempty(writer)
+            append(writer, results, 'Lot', opts.Lot, 'Timestamp', timestamp);
+        end
+
+        occupied(k, 1) = summary.occupied; %#ok<AGROW>
+        empty(k, 1) = summary.empty; %#ok<AGROW>
+        occupancyRate(k, 1) = summary.occupancyRate; %#ok<AGROW>
+        slotsEvaluated(k, 1) = frameInfo.slotsEvaluated; %#ok<AGROW>
+        elapsed(k, 1) = frameInfo.elapsed; %#ok<AGROW>
+        density(:, k) = detector.Density; %#ok<AGROW>
+    end
+    if ~isempty(writer)
+        close(writer);
+    end
+    totalTime = toc(t0);
+
+    frame = (1:k)';
+    frameTable = table(frame, occupied, empty, occupancyRate, slotsEvaluated, elapsed);
+
+    stats.frames = k;
+    stats.slots = nSlots;
+    stats.totalTime = totalTime;
+    stats.framesPerSecond = k / max(totalTime, eps);
+    stats.skippedFraction = 1 - detector.SlotsEvaluated / max(k * nSlots, 1);
+    if ~isempty(reader)
+        stats.io = throughput(reader);
+    end
+
+    if opts.Verbose
+        fprintf('Processed %d frames (%d slots each) in %.2f s: %.2f frames/sec, %.1f%% of slot evaluations skipped\n', ...
+            k, nSlots, totalTime, stats.framesPerSecond, 100 * stats.skippedFraction);
+    end
+end
+
+function [hasNext, readNext, reader] = frameReader(source, prefetch)
+    % Uniform frame iterator over a video file or a list of images; images
+    % are decoded straight to gray by a ParkingFrameReader
+    reader = [];
+    isText = ischar(source) || isStringScalar(source);
+    if isText && isfile(source) && ~isImageFile(source)
+        v = VideoReader(source);
+        hasNext = @() hasFrame(v);
+        readNext = @() readFrame(v);
+    else
+        reader = ParkingFrameReader(source, 'Prefetch', prefetch);
+        hasNext = @() hasFrame(reader);
+        readNext = @() read(reader);
+    end
+end
+
+function tf = isImageFile(file)
+    [~, ~, ext] = fileparts(file);
+    tf = any(strcmpi(ext, {'.jpg', '.jpeg', '.png'}));
+end
@@ -0,0 +1,24 @@
+function small = downsampleEdgeMap(edgeMap, factor)
+%DOWNSAMPLEEDGEMAP Shrink a logical edge map without losing thin edges.
+%   SMALL = DOWNSAMPLEEDGEMAP(EDGEMAP, FACTOR) reduces EDGEMAP by the
+%   integer FACTOR in both directions. A pixel of SMALL is true when any
+%   pixel of its FACTOR-by-FACTOR block is, so one-pixel-wide Canny edges
+%   stay visible at display resolution.
+%
+%   See also parkingPreprocess.
+
+    if factor <= 1
+        small = edgeMap;
+        return;
+    end
+
+    [m, n] = size(edgeMap);
+    M = ceil(m / factor) * factor;
+    N = ceil(n / factor) * factor;
+    padded = false(M, N);
+    padded(1:m, 1:n) = edgeMap;
+
+    % Reduce rows, then columns, by block-wise any
+    small = reshape(any(reshape(padded, factor, M/factor, N), 1), M/factor, N);
+    small = reshape(any(reshape(small.', factor, N/factor, M/factor), 1), N/factor, M/factor).';
+end
@@ -0,0 +1,19 @@
+function files = listFrameFiles(sources)
+%LISTFRAMEFILES Image files of a folder or frame list, in order.
+%   FILES = LISTFRAMEFILES(SOURCES) returns a cell array of image file
+%   names. SOURCES is either a folder, in which case all .jpg, .jpeg and
+%   .png files in it are returned sorted by name, or a list of file names
+%   (char, string array or cell array), returned as is.
+%
+%   See also detectParkingBatch, detectParkingStream.
+
+    if (ischar(sources) || isStringScalar(sources)) && isfolder(sources)
+        listing = [dir(fullfile(sources, '*.jpg')); ...
+                   dir(fullfile(sources, '*.jpeg')); ...
+                   dir(fullfile(sources, '*.png'))];
+        files = sort(cellfun(@fullfile, {listing.folder}, {listing.name}, ...
+            'UniformOutput', false));
+    else
+        files = cellstr(sources);
+    end
+end
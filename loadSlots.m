@@ -0,0 +1,35 @@
+function [slots, rotation] = loadSlots(slots)
+%LOADSLOTS Slot rectangles from a matrix or a saved slots file.
+%   SLOTS = LOADSLOTS(SOURCE) returns the N-by-4 [x y width height] slot
+%   matrix. SOURCE is either that matrix, returned unchanged, the name of
+%   a .mat file holding a 'slots' variable, or a .pslot slot layout file
+%   (see saveSlotLayout), as written by the Save Slots button of
+%   ParkingDetectorPro.
+%
+%   [SLOTS, ROTATION] = LOADSLOTS(SOURCE) also returns the N-by-1 slot
+%   rotation in degrees: the 'rotation' variable of a .mat file or the
+%   rotation stored in a .pslot file, and zeros when there is none.
+%
+%   See also readSlotLayout, compileSlotMasks, detectParkingBatch,
+%   detectParkingStream.
+
+    rotation = [];
+    if ischar(slots) || isStringScalar(slots)
+        [~, ~, ext] = fileparts(slots);
+        if strcmpi(ext, '.pslot')
+            layout = readSlotLayout(slots);
+            slots = layout.slots;
+            rotation = layout.rotation;
+        elseif ismember('rotation', who('-file', slots))
+            data = load(slots, 'slots', 'rotation');
+            slots = data.slots;
+            rotation = data.rotation(:);
+        else
+            data = load(slots, 'slots');
+            slots = data.slots;
+        end
+    end
+    if isempty(rotation)
+        rotation = zeros(size(slots, 1), 1);
+    end
+end
@@ -0,0 +1,23 @@
+function density = maskedSlotDensity(morphImage, masks)
+%MASKEDSLOTDENSITY Edge density of every slot from compiled slot masks.
+%   DENSITY = MASKEDSLOTDENSITY(MORPHIMAGE, MASKS) returns an N-by-1
+%   vector with the number of true pixels of MORPHIMAGE inside each slot
+%   of the compileSlotMasks MASKS, divided by the slot area.
+%
+%   All slots are scored in a single pass: the edge values at the slot
+%   pixels are gathered and accumulated with one cumulative sum, from
+%   which each slot's count is the difference at its range ends. The cost
+%   follows the number of slot pixels, not the number of slots.
+%
+%   See also compileSlotMasks, slotEdgeDensity.
+
+    if ~isequal(size(morphImage, [1 2]), masks.imageSize)
+        error('maskedSlotDensity:size', ...
+            'The slot masks were compiled for a %dx%d image, not %dx%d.', ...
+            masks.imageSize(1), masks.imageSize(2), size(morphImage, 1), size(morphImage, 2));
+    end
+
+    counts = [0; cumsum(double(morphImage(masks.pixelIdx)))];
+    white_pixels = counts(masks.slotStart(2:end)) - counts(masks.slotStart(1:end-1));
+    density = white_pixels ./ masks.area;
+end
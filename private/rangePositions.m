@@ -0,0 +1,19 @@
+function [positions, owner] = rangePositions(start, idx)
+%RANGEPOSITIONS Positions of selected ranges of a compressed list.
+%   POSITIONS = RANGEPOSITIONS(START, IDX) returns, in order, the
+%   positions START(i):START(i+1)-1 of every range i in IDX, for lists
+%   stored as one concatenated array with range i starting at START(i),
+%   like the pixel lists of compileSlotMasks or the cells of
+%   buildSlotIndex. VALUES(POSITIONS) gathers those ranges without a loop.
+%
+%   [POSITIONS, OWNER] = RANGEPOSITIONS(...) also returns the range of
+%   each position.
+
+    % Each range continues the running count 0:N-1 of all selected
+    % positions, shifted so it starts at its own START
+    idx = idx(:);
+    first = start(idx);
+    count = start(idx + 1) - first;
+    positions = repelem(first - cumsum([0; count(1:end-1)]), count) + (0:sum(count) - 1)';
+    owner = repelem(idx, count);
+end
@@ -0,0 +1,22 @@
+function [counts, cannyCore, morphCore] = tileEdgeCounts(crop, coreRows, coreCols, localBounds, cannyThreshold, gradientMax, se)
+%TILEEDGECOUNTS Closed-edge pixel counts of slot parts inside one tile.
+%   COUNTS = TILEEDGECOUNTS(CROP, COREROWS, CORECOLS, LOCALBOUNDS,
+%   CANNYTHRESHOLD, GRADIENTMAX, SE) runs Canny (thresholds relative to
+%   GRADIENTMAX) and closing with SE on the grayscale tile CROP, which
+%   includes its halo, and counts the edge pixels of the tile core
+%   CROP(COREROWS, CORECOLS) inside each [r1 r2 c1 c2] row of
+%   LOCALBOUNDS, given in core coordinates.
+%
+%   [COUNTS, CANNYCORE, MORPHCORE] = TILEEDGECOUNTS(...) also returns the
+%   edge maps of the core.
+
+    cannyCrop = cannyEdgesScaled(crop, cannyThreshold, gradientMax);
+    morphCrop = imclose(cannyCrop, se);
+
+    morphCore = morphCrop(coreRows, coreCols);
+    counts = boundsPixelSums(morphCore, localBounds);
+
+    if nargout > 1
+        cannyCore = cannyCrop(coreRows, coreCols);
+    end
+end
@@ -0,0 +1,11 @@
+function localBounds = tileLocalBounds(bounds, tile)
+%TILELOCALBOUNDS Slot pixel ranges clipped to a tile, in tile coordinates.
+%   LOCALBOUNDS = TILELOCALBOUNDS(BOUNDS, TILE) clips the [r1 r2 c1 c2]
+%   rows of BOUNDS for the slots TILE.slotIdx to the tile's rows and cols
+%   and shifts them so the tile's first pixel is (1,1).
+
+    idx = tile.slotIdx;
+    localBounds = [max(bounds(idx,1), tile.rows(1)), min(bounds(idx,2), tile.rows(2)), ...
+                   max(bounds(idx,3), tile.cols(1)), min(bounds(idx,4), tile.cols(2))];
+    localBounds = localBounds - [tile.rows(1) tile.rows(1) tile.cols(1) tile.cols(1)] + 1;
+end
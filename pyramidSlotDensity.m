@@ -0,0 +1,140 @@
+function [density, info] = pyramidSlotDensity(gray, slots, threshold, opts)
+%PYRAMIDSLOTDENSITY Slot edge density from a downscaled image, refined near the threshold.
+%   DENSITY = PYRAMIDSLOTDENSITY(GRAY, SLOTS, THRESHOLD) runs Canny and
+%   closing on GRAY downscaled by 'Scale' and scores the N-by-4
+%   [x y width height] SLOTS, scaled to match, on that coarse edge map.
+%   Edges stay about as thin in pixels while the slot area shrinks by
+%   Scale^2, so the coarse density is multiplied by Scale to estimate the
+%   full-resolution one. Slots whose estimate lies within 'Band' of
+%   THRESHOLD, where the coarse map could flip the status, and slots less
+%   than 'MinSlotSize' pixels wide or high at the coarse level are scored
+%   again at full resolution with roiSlotDensity, which only processes the
+%   tiles around them.
+%
+%   Slots far from the threshold thus keep the status they would get at
+%   full resolution, and their DENSITY is an estimate; refined slots get
+%   exactly the full-resolution density. A different threshold applied
+%   later to DENSITY (e.g. with classifySlots) only has full-resolution
+%   accuracy near THRESHOLD.
+%
+%   When slots are so small that at least 'MaxRefinedFraction' of them
+%   would be below MinSlotSize at the coarse level, e.g. when the auto
+%   scale stops at 1/2, the coarse level would only add work to a
+%   refinement of nearly every slot. The full-resolution pipeline
+%   (parkingPreprocess followed by slotEdgeDensity) then scores all slots
+%   instead, and INFO reports scale 1 with every slot refined.
+%
+%   [DENSITY, INFO] = PYRAMIDSLOTDENSITY(...) also returns INFO with the
+%   scale used, the logical N-by-1 refined mask, refinedFraction, the
+%   gradientMax the refinement used ([] if nothing was refined) and
+%   processedFraction, the share of the full-resolution image the
+%   refinement processed.
+%
+%   Name-value options:
+%     'Scale'           Pyramid scale, e.g. 0.5 or 0.25; empty picks the
+%                       smallest power of two from 1/2 to 1/8 that keeps
+%                       the median slot MinSlotSize pixels wide and high
+%                       (default [])
+%     'Band'            Half-width of the uncertainty band around
+%                       THRESHOLD, in density (default 0.02)
+%     'MinSlotSize'     Smallest coarse slot side trusted (default 16)
+%     'MaxRefinedFraction'
+%                       Share of slots below MinSlotSize at the coarse
+%                       level from which the full pipeline is run
+%                       instead (default 0.9)
+%     'CannyThreshold'  Canny [low high] thresholds (default [0.1 0.2])
+%     'StrelSize'       Closing rectangle size (default [3 3])
+%     'TileSize', 'Halo', 'GradientMax'
+%                       Passed to roiSlotDensity for the refinement; empty
+%                       GradientMax computes it from GRAY when a slot needs
+%                       refining (defaults 256, 16 and [])
+%     'ProgressFcn'     Function called as FCN(FRACTION) as the work
+%                       proceeds: 0.5 after the coarse level, then per
+%                       refined tile up to 1 (default [])
+%
+%   See also detectParkingSlots, roiSlotDensity, slotEdgeDensity.
+
+    arguments
+        gray {mustBeNumericOrLogical}
+        slots (:,4) double
+        threshold (1,1) double
+        opts.Scale double = []
+        opts.Band (1,1) double {mustBeNonnegative} = 0.02
+        opts.MinSlotSize (1,1) double {mustBePositive} = 16
+        opts.MaxRefinedFraction (1,1) double {mustBeInRange(opts.MaxRefinedFraction, 0, 1)} = 0.9
+        opts.CannyThreshold (1,2) double = [0.1 0.2]
+        opts.StrelSize (1,2) double = [3 3]
+        opts.TileSize (1,1) double {mustBePositive, mustBeInteger} = 256
+        opts.Halo (1,1) double {mustBeNonnegative, mustBeInteger} = 16
+        opts.GradientMax double = []
+        opts.ProgressFcn = []
+    end
+
+    nSlots = size(slots, 1);
+    scale = opts.Scale;
+    if isempty(scale)
+        side = median(min(slots(:,3), slots(:,4)));
+        scale = min(0.5, max(1/8, 2^ceil(log2(opts.MinSlotSize / max(side, 1)))));
+        if nSlots == 0
+            scale = 0.5;
+        end
+    end
+
+    % --- Full Pipeline When Nearly Every Slot Is Too Small ---
+    tooSmall = min(slots(:,3), slots(:,4)) * scale < opts.MinSlotSize;
+    if nSlots > 0 && nnz(tooSmall) >= opts.MaxRefinedFraction * nSlots
+        [~, ~, morphImage] = parkingPreprocess(gray, ...
+            'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize);
+        density = slotEdgeDensity(morphImage, slots);
+        reportProgress(opts.ProgressFcn, 1);
+
+        info.scale = 1;
+        info.refined = true(nSlots, 1);
+        info.refinedFraction = 1;
+        info.gradientMax = [];
+        info.processedFraction = 1;
+        return;
+    end
+
+    % --- Coarse Level ---
+    small = imresize(gray, scale);
+    [~, ~, morphSmall] = parkingPreprocess(small, ...
+        'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize);
+    % Pixel centres k map to (k - 0.5) * scale + 0.5 at the coarse level
+    coarseSlots = [(slots(:,1:2) - 0.5) * scale + 0.5, slots(:,3:4) * scale];
+    density = slotEdgeDensity(morphSmall, coarseSlots) * scale;
+    reportProgress(opts.ProgressFcn, 0.5);
+
+    % --- Full-Resolution Refinement of Uncertain Slots ---
+    refined = abs(density - threshold) <= opts.Band | ...
+        min(coarseSlots(:,3), coarseSlots(:,4)) < opts.MinSlotSize | isnan(density);
+    gradientMax = [];
+    processedFraction = 0;
+    if any(refined)
+        gradientMax = opts.GradientMax;
+        if isempty(gradientMax)
+            gradientMax = cannyGradientMax(gray);
+        end
+        tileProgress = [];
+        if ~isempty(opts.ProgressFcn)
+            tileProgress = @(fraction) opts.ProgressFcn(0.5 + 0.5 * fraction);
+        end
+        [density(refined), roiInfo] = roiSlotDensity(gray, slots(refined,:), gradientMax, ...
+            'CannyThreshold', opts.CannyThreshold, 'StrelSize', opts.StrelSize, ...
+            'TileSize', opts.TileSize, 'Halo', opts.Halo, 'ProgressFcn', tileProgress);
+        processedFraction = roiInfo.processedFraction;
+    end
+    reportProgress(opts.ProgressFcn, 1);
+
+    info.scale = scale;
+    info.refined = refined;
+    info.refinedFraction = nnz(refined) / max(nSlots, 1);
+    info.gradientMax = gradientMax;
+    info.processedFraction = processedFraction;
+end
+
+function reportProgress(fcn, fraction)
+    if ~isempty(fcn)
+        fcn(fraction);
+    end
+end
@@ -0,0 +1,43 @@
+function slotIdx = querySlotIndex(index, rows, cols)
+%QUERYSLOTINDEX Slots that intersect a pixel region.
+%   SLOTIDX = QUERYSLOTINDEX(INDEX, ROWS, COLS) returns the ascending
+%   indices of the slots of the buildSlotIndex INDEX that have at least
+%   one pixel in the region of pixel rows ROWS(1):ROWS(2) and columns
+%   COLS(1):COLS(2), such as the rows and cols of a slotTileGrid tile.
+%
+%   Only the slots listed in the grid cells the region covers are tested,
+%   so the cost depends on the region and the slot density around it,
+%   not on the total number of slots.
+%
+%   Example:
+%     index = buildSlotIndex(slots, size(img));
+%     inView = querySlotIndex(index, [1 512], [1024 1535]);
+%
+%   See also buildSlotIndex, slotTileGrid.
+
+    arguments
+        index (1,1) struct
+        rows (1,2) double
+        cols (1,2) double
+    end
+
+    rows = [max(rows(1), 1), min(rows(2), index.imageSize(1))];
+    cols = [max(cols(1), 1), min(cols(2), index.imageSize(2))];
+    if rows(1) > rows(2) || cols(1) > cols(2)
+        slotIdx = zeros(0, 1);
+        return;
+    end
+
+    % --- Candidates from the Covered Cells ---
+    cellRows = floor((rows(1) - 1) / index.cellSize) + 1 : floor((rows(2) - 1) / index.cellSize) + 1;
+    cellCols = floor((cols(1) - 1) / index.cellSize) + 1 : floor((cols(2) - 1) / index.cellSize) + 1;
+    [a, b] = ndgrid(cellRows, cellCols);
+    cells = sub2ind(index.gridSize, a(:), b(:));
+    candidates = unique(index.cellSlots(rangePositions(index.cellStart, cells)));
+
+    % --- Exact Overlap Test ---
+    bounds = index.bounds(candidates,:);
+    hit = bounds(:,1) <= rows(2) & bounds(:,2) >= rows(1) ...
+        & bounds(:,3) <= cols(2) & bounds(:,4) >= cols(1);
+    slotIdx = candidates(hit);
+end
@@ -0,0 +1,139 @@
+function [T, occupancy] = readResultRange(baseName, opts)
+%READRESULTRANGE Query slot results exported by ParkingResultWriter.
+%   T = READRESULTRANGE(BASENAME) reads every row written to BASENAME.pres
+%   and returns a table with the variables timestamp (UTC datetime), lot,
+%   slotID, status ('Occupied' or 'Empty') and density.
+%
+%   T = READRESULTRANGE(BASENAME, 'Lot', LOT, 'From', T1, 'To', T2)
+%   returns only the rows of lot LOT with T1 <= timestamp <= T2. Only the
+%   chunk index is read in full; chunks of other lots or entirely outside
+%   the time range are skipped without being read, so a query over a
+%   short window of a long run reads little more than that window.
+%
+%   [T, OCCUPANCY] = READRESULTRANGE(...) also returns a table with one
+%   row per lot and timestamp and the variables timestamp, lot, occupied,
+%   total and occupancyRate (in percent, as in classifySlots).
+%
+%   Name-value options:
+%     'Lot'   Lot name, '' for the lot written without one, or [] for all
+%             lots (default [])
+%     'From'  Earliest timestamp, a datetime (UTC if it has no time zone)
+%             or POSIX seconds (default -Inf)
+%     'To'    Latest timestamp (default Inf)
+%
+%   Example:
+%     [~, occ] = readResultRange('history/north', 'Lot', 'north', ...
+%         'From', datetime('today') - hours(1), 'To', datetime('now'));
+%     plot(occ.timestamp, occ.occupancyRate)
+%
+%   See also ParkingResultWriter.
+
+    arguments
+        baseName {mustBeTextScalar}
+        opts.Lot = []
+        opts.From = -Inf
+        opts.To = Inf
+    end
+
+    baseName = char(baseName);
+    tFrom = toPosix(opts.From);
+    tTo = toPosix(opts.To);
+
+    % --- Lot Dictionary ---
+    lots = {};
+    lotFile = [baseName '.lots'];
+    if isfile(lotFile)
+        lots = splitlines(fileread(lotFile));
+        lots = lots(1:end-1);
+    end
+
+    % --- Chunk Index ---
+    records = zeros(32, 0, 'uint8');
+    indexFile = [baseName '.pidx'];
+    if isfile(indexFile)
+        fid = fopen(indexFile, 'r', 'ieee-le');
+        if fid < 0
+            error('readResultRange:open', 'Cannot open %s.', indexFile);
+        end
+        bytes = fread(fid, Inf, '*uint8');
+        fclose(fid);
+        % A record being appended by a running writer is not complete yet
+        records = reshape(bytes(1:32 * floor(numel(bytes) / 32)), 32, []);
+    end
+    offset = double(typecast(reshape(records(1:8,:), 1, []), 'uint64'));
+    rowsAndLot = double(reshape(typecast(reshape(records(9:16,:), 1, []), 'uint32'), 2, []));
+    times = reshape(typecast(reshape(records(17:32,:), 1, []), 'double'), 2, []);
+
+    selected = times(2,:) >= tFrom & times(1,:) <= tTo;
+    if ~isnumeric(opts.Lot)
+        code = find(strcmp(lots, char(opts.Lot)), 1);
+        if isempty(code)
+            code = 0;   % Unknown lot: no chunk matches
+        end
+        selected = selected & rowsAndLot(2,:) == code;
+    end
+    chunks = find(selected);
+
+    % --- Selected Chunks ---
+    total = sum(rowsAndLot(1, chunks));
+    time = zeros(total, 1);
+    lotCode = zeros(total, 1);
+    slotID = zeros(total, 1);
+    status = zeros(total, 1, 'uint8');
+    density = zeros(total, 1);
+    if total > 0
+        fid = fopen([baseName '.pres'], 'r', 'ieee-le');
+        if fid < 0
+            error('readResultRange:open', 'Cannot open %s.pres.', baseName);
+        end
+        cleanup = onCleanup(@() fclose(fid));
+        last = 0;
+        for c = chunks
+            n = rowsAndLot(1, c);
+            rows = last + (1:n);
+            fseek(fid, offset(c), 'bof');
+            time(rows) = fread(fid, n, 'double');
+            slotID(rows) = fread(fid, n, 'uint32');
+            status(rows) = fread(fid, n, '*uint8');
+            density(rows) = fread(fid, n, 'double');
+            lotCode(rows) = rowsAndLot(2, c);
+            last = last + n;
+        end
+    end
+
+    inRange = time >= tFrom & time <= tTo;
+    time = time(inRange);
+    lotCode = lotCode(inRange);
+    slotID = slotID(inRange);
+    status = status(inRange);
+    density = density(inRange);
+
+    timestamp = toDatetime(time);
+    lot = reshape(lots(lotCode), [], 1);
+    T = table(timestamp, lot, slotID, slotStatusNames(status), density, ...
+        'VariableNames', {'timestamp', 'lot', 'slotID', 'status', 'density'});
+
+    if nargout > 1
+        % --- Occupancy per Lot and Timestamp ---
+        [group, groupTime, groupLot] = findgroups(time, lotCode);
+        occupied = accumarray(group, double(status), [numel(groupTime) 1]);
+        total = accumarray(group, 1, [numel(groupTime) 1]);
+        occupancyRate = 100 * occupied ./ max(total, 1);
+        timestamp = toDatetime(groupTime);
+        lot = reshape(lots(groupLot), [], 1);
+        occupancy = table(timestamp, lot, occupied, total, occupancyRate);
+    end
+end
+
+function t = toPosix(t)
+    if isdatetime(t)
+        if isempty(t.TimeZone)
+            t.TimeZone = 'UTC';
+        end
+        t = posixtime(t);
+    end
+end
+
+function d = toDatetime(t)
+    d = datetime(t, 'ConvertFrom', 'posixtime', 'TimeZone', 'UTC');
+end
@@ -0,0 +1,73 @@
+function layout = readSlotLayout(files)
+%READSLOTLAYOUT Read binary slot layout files.
+%   LAYOUT = READSLOTLAYOUT(FILE) reads a slot layout written by
+%   saveSlotLayout and returns a struct with fields
+%     file       The file name
+%     lotID      Lot identifier (char)
+%     imageSize  [height width] of the lot image, [0 0] when unknown
+%     slots      N-by-4 [x y width height] slot rectangles
+%     rotation   N-by-1 slot rotation in degrees, clockwise as displayed
+%     slotIDs    N-by-1 slot IDs
+%
+%   Only the 24-byte header and the lot ID are parsed with fread; the
+%   slot arrays are memory-mapped with memmapfile and copied out in one
+%   block each.
+%
+%   LAYOUT = READSLOTLAYOUT(FILES) reads every file of the cell array or
+%   string array FILES and returns a struct array, one element per file.
+%
+%   Example:
+%     layouts = readSlotLayout({'north.pslot', 'south.pslot'});
+%     index = buildSlotIndex(layouts(1).slots, layouts(1).imageSize);
+%
+%   See also saveSlotLayout, loadSlots, buildSlotIndex.
+
+    files = cellstr(files);
+    layout = repmat(struct('file', '', 'lotID', '', 'imageSize', [0 0], ...
+        'slots', zeros(0, 4), 'rotation', zeros(0, 1), 'slotIDs', zeros(0, 1)), size(files));
+    for k = 1:numel(files)
+        layout(k) = readOne(files{k});
+    end
+end
+
+function layout = readOne(file)
+    % --- Header ---
+    fid = fopen(file, 'r', 'ieee-le');
+    if fid < 0
+        error('readSlotLayout:open', 'Cannot open %s.', file);
+    end
+    cleanup = onCleanup(@() fclose(fid));
+
+    magic = fread(fid, [1 4], '*char');
+    if ~strcmp(magic, 'PSLT')
+        error('readSlotLayout:format', '%s is not a slot layout file.', file);
+    end
+    versionAndLot = fread(fid, [1 2], 'uint16');
+    if versionAndLot(1) ~= 1
+        error('readSlotLayout:version', '%s has unsupported format version %d.', file, versionAndLot(1));
+    end
+    sizes = fread(fid, [1 4], 'uint32');
+    lotID = native2unicode(fread(fid, [1 versionAndLot(2)], '*uint8'), 'UTF-8');
+    nSlots = sizes(1);
+    offset = 24 + ceil(versionAndLot(2) / 8) * 8;
+
+    layout.file = char(file);
+    layout.lotID = char(lotID);
+    layout.imageSize = sizes(2:3);
+
+    % --- Slot Arrays ---
+    if nSlots == 0
+        layout.slots = zeros(0, 4);
+        layout.rotation = zeros(0, 1);
+        layout.slotIDs = zeros(0, 1);
+        return;
+    end
+    map = memmapfile(file, 'Offset', offset, 'Repeat', 1, 'Format', { ...
+        'double', [nSlots 4], 'slots'; ...
+        'single', [nSlots 1], 'rotation'; ...
+        'uint32', [nSlots 1], 'slotIDs'});
+    data = map.Data;
+    layout.slots = data.slots;
+    layout.rotation = double(data.rotation);
+    layout.slotIDs = double(data.slotIDs);
+end
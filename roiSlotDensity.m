@@ -0,0 +1,93 @@
+function [density, info, cannyImage, morphImage] = roiSlotDensity(gray, slots, gradientMax, opts)
+%ROISLOTDENSITY Edge density of slots computed only on tiles that cover them.
+%   DENSITY = ROISLOTDENSITY(GRAY, SLOTS, GRADIENTMAX) runs Canny and
+%   closing only on the tiles of the grayscale image GRAY that overlap a
+%   slot in the N-by-4 [x y width height] matrix SLOTS, each padded by a
+%   halo, and returns the same edge density as slotEdgeDensity would.
+%   Roads, roofs and margins that contain no slot are never processed.
+%   Canny thresholds are taken relative to GRADIENTMAX, the
+%   cannyGradientMax of the whole image (see cannyEdgesScaled).
+%
+%   [DENSITY, INFO, CANNYIMAGE, MORPHIMAGE] = ROISLOTDENSITY(...) also
+%   returns INFO with the number of tiles and the fraction of the image
+%   that was processed, halos included, and full-size edge maps that are
+%   false outside the processed tiles.
+%
+%   Name-value options:
+%     'CannyThreshold'  Canny [low high] thresholds (default [0.1 0.2])
+%     'StrelSize'       Closing rectangle size (default [3 3])
+%     'TileSize'        Tile side in pixels (default 256)
+%     'Halo'            Padding in pixels around each tile (default 16)
+%     'ProgressFcn'     Function called as FCN(FRACTION) after each tile
+%                       with the fraction of tiles done (default [])
+%
+%   The halo covers the Gaussian support of the gradient, non-maximum
+%   suppression and the closing, so every pixel inside a tile sees the
+%   same neighbourhood as in the full image. The only source of
+%   difference is Canny hysteresis: a weak edge inside a tile that is
+%   connected to a strong edge only through pixels beyond the halo is
+%   dropped.
+%
+%   See also slotEdgeDensity, slotTileGrid, cannyEdgesScaled,
+%   tiledSlotDensity.
+
+    arguments
+        gray {mustBeNumericOrLogical}
+        slots (:,4) double
+        gradientMax (1,1) double
+        opts.CannyThreshold (1,2) double = [0.1 0.2]
+        opts.StrelSize (1,2) double = [3 3]
+        opts.TileSize (1,1) double {mustBePositive, mustBeInteger} = 256
+        opts.Halo (1,1) double {mustBeNonnegative, mustBeInteger} = 16
+        opts.ProgressFcn = []
+    end
+
+    [m, n] = size(gray);
+    se = strel('rectangle', opts.StrelSize);
+    bounds = slotPixelBounds(slots, [m n]);
+    tiles = slotTileGrid([m n], slots, opts.TileSize);
+
+    keepMaps = nargout > 2;
+    if keepMaps
+        cannyImage = false(m, n);
+        morphImage = false(m, n);
+    end
+
+    white_pixels = zeros(size(slots, 1), 1);
+    processedPixels = 0;
+
+    for t = 1:numel(tiles)
+        tile = tiles(t);
+
+        % --- Tile Core Plus its Halo ---
+        r1 = max(tile.rows(1) - opts.Halo, 1);
+        r2 = min(tile.rows(2) + opts.Halo, m);
+        c1 = max(tile.cols(1) - opts.Halo, 1);
+        c2 = min(tile.cols(2) + opts.Halo, n);
+        coreRows = (tile.rows(1):tile.rows(2)) - r1 + 1;
+        coreCols = (tile.cols(1):tile.cols(2)) - c1 + 1;
+        processedPixels = processedPixels + (r2 - r1 + 1) * (c2 - c1 + 1);
+
+        % --- Accumulate the Part of Each Slot Inside the Tile ---
+        localBounds = tileLocalBounds(bounds, tile);
+        if keepMaps
+            [counts, cannyCore, morphCore] = tileEdgeCounts(gray(r1:r2, c1:c2), coreRows, coreCols, ...
+                localBounds, opts.CannyThreshold, gradientMax, se);
+            cannyImage(tile.rows(1):tile.rows(2), tile.cols(1):tile.cols(2)) = cannyCore;
+            morphImage(tile.rows(1):tile.rows(2), tile.cols(1):tile.cols(2)) = morphCore;
+        else
+            counts = tileEdgeCounts(gray(r1:r2, c1:c2), coreRows, coreCols, ...
+                localBounds, opts.CannyThreshold, gradientMax, se);
+        end
+        white_pixels(tile.slotIdx) = white_pixels(tile.slotIdx) + counts;
+        if ~isempty(opts.ProgressFcn)
+            opts.ProgressFcn(t / numel(tiles));
+        end
+    end
+
+    slot_area = slots(:,3) .* slots(:,4);
+    density = white_pixels ./ slot_area;
+
+    info.tiles = numel(tiles);
+    info.processedFraction = processedPixels / (m * n);
+end
@@ -0,0 +1,281 @@
+function [resultsTable, jobTable, stats] = runParkingJobs(manifest, opts)
+%RUNPARKINGJOBS Run detection for many lots across a parallel pool.
+%   [RESULTSTABLE, JOBTABLE, STATS] = RUNPARKINGJOBS(MANIFEST) runs
+%   detectParkingSlots for every entry of MANIFEST, each with its own
+%   slot layout and threshold, spread over the workers of the current
+%   parallel pool (one is started if none is running).
+%
+%   MANIFEST is a table, or a .csv file read with readtable, with one row
+%   per lot and the variables:
+%     image      Image file, or a folder of frames (one job per frame)
+%     slots      Slots .mat or .pslot file (see loadSlots); rotated
+%                layouts are compiled with compileSlotMasks for the
+%                frame size and scored with 'Preprocess' 'full'
+%     threshold  Edge density threshold (optional, default 0.07 for
+%                the whole column or for blank entries); other values
+%                that are not finite numbers are an error
+%     lot        Lot name (optional, default the slots file name)
+%
+%   RESULTSTABLE has one row per job and slot with the lot, image, slot
+%   ID, status and density. JOBTABLE has one row per job with its state
+%   ('finished', 'failed' or 'timeout'), elapsed time, occupancy summary
+%   and error message; a folder without frames gets one 'failed' row.
+%   STATS reports the job count, total time, jobs per second and the
+%   number of workers.
+%
+%   Jobs are submitted with parfeval. At most 'MaxInFlight' jobs are
+%   queued or running at a time, so a long manifest never floods the
+%   pool queue; further jobs are submitted as earlier ones complete. A
+%   job running longer than 'Timeout' seconds is cancelled and reported
+%   as 'timeout'.
+%
+%   Name-value options:
+%     'UseParallel'   Use a parallel pool; false runs the jobs one after
+%                     another in this session, without timeouts
+%                     (default true)
+%     'MaxInFlight'   Jobs queued or running at once (default twice the
+%                     number of workers)
+%     'Timeout'       Seconds before a running job is cancelled
+%                     (default Inf)
+%     'Preprocess'    Passed to detectParkingSlots (default 'full')
+%     'Cache'         ParkingResultCache folder shared by all workers,
+%                     so rerunning a manifest only recomputes new frames
+%                     (default '', no cache)
+%     'OutputFile'    Write RESULTSTABLE to this .csv file (default none)
+%     'Verbose'       Print the throughput when done (default true)
+%
+%   Example:
+%     parpool('Processes', 8);
+%     [resultsTable, jobTable] = runParkingJobs('lots.csv', 'Timeout', 60);
+%
+%   Each job passes its lot name to detectParkingSlots, so runs recorded
+%   by ParkingTelemetry on the workers can be grouped by lot.
+%
+%   See also detectParkingSlots, detectParkingBatch, ParkingTelemetry.
+
+    arguments
+        manifest
+        opts.UseParallel (1,1) logical = true
+        opts.MaxInFlight double {mustBePositive, mustBeInteger} = []
+        opts.Timeout (1,1) double {mustBePositive} = Inf
+        opts.Preprocess {mustBeMember(opts.Preprocess, {'full', 'roi', 'tiled', 'pyramid', 'fused'})} = 'full'
+        opts.Cache {mustBeTextScalar} = ''
+        opts.OutputFile {mustBeTextScalar} = ''
+        opts.Verbose (1,1) logical = true
+    end
+
+    jobs = expandManifest(manifest);
+    nJobs = height(jobs);
+    outputs = cell(nJobs, 1);
+    message = jobs.problem;
+    state = repmat({'finished'}, nJobs, 1);
+    state(~cellfun(@isempty, message)) = {'failed'};
+    runnable = find(strcmp(state, 'finished'));
+
+    pool = [];
+    if opts.UseParallel && ~isempty(runnable) && canUseParallelPool()
+        pool = gcp();
+    end
+
+    t0 = tic;
+    if isempty(pool)
+        % --- Serial Fallback ---
+        nWorkers = 1;
+        for k = runnable'
+            outputs{k} = runParkingJob(jobs.image{k}, jobs.slots{k}, jobs.threshold(k), ...
+                opts.Preprocess, jobs.lot{k}, opts.Cache);
+        end
+    else
+        % --- Bounded Submission to the Pool ---
+        nWorkers = pool.NumWorkers;
+        maxInFlight = opts.MaxInFlight;
+        if isempty(maxInFlight)
+            maxInFlight = 2 * nWorkers;
+        end
+
+        futures = parallel.FevalFuture.empty;
+        futureJob = zeros(0, 1);
+        next = 1;
+        while next <= numel(runnable) || ~isempty(futures)
+            while next <= numel(runnable) && numel(futures) < maxInFlight
+                j = runnable(next);
+                futures(end+1) = parfeval(pool, @runParkingJob, 1, ...
+                    jobs.image{j}, jobs.slots{j}, jobs.threshold(j), opts.Preprocess, ...
+                    jobs.lot{j}, opts.Cache); %#ok<AGROW>
+                futureJob(end+1, 1) = j; %#ok<AGROW>
+                next = next + 1;
+            end
+
+            % Wait briefly for a completed job
+            try
+                [k, output] = fetchNext(futures, min(opts.Timeout, 1));
+                if ~isempty(k)
+                    outputs{futureJob(k)} = output;
+                    futures(k) = [];
+                    futureJob(k) = [];
+                end
+            catch
+                % A worker failed outside runParkingJob (e.g. it crashed)
+                failed = arrayfun(@(f) ~isempty(f.Error), futures);
+                for i = find(failed)
+                    state{futureJob(i)} = 'failed';
+                    message{futureJob(i)} = futures(i).Error.message;
+                end
+                futures(failed) = [];
+                futureJob(failed) = [];
+            end
+
+            % Cancel jobs that have been running too long
+            if isfinite(opts.Timeout)
+                expired = false(size(futures));
+                for i = 1:numel(futures)
+                    started = futures(i).StartDateTime;
+                    expired(i) = strcmp(futures(i).State, 'running') && ~isempty(started) ...
+                        && seconds(datetime('now', 'TimeZone', started.TimeZone) - started) > opts.Timeout;
+                end
+                if any(expired)
+                    cancel(futures(expired));
+                    state(futureJob(expired)) = {'timeout'};
+                    message(futureJob(expired)) = {sprintf('Cancelled after %g s', opts.Timeout)};
+                    futures(expired) = [];
+                    futureJob(expired) = [];
+                end
+            end
+        end
+    end
+    totalTime = toc(t0);
+
+    % --- Consolidate Results ---
+    elapsed = nan(nJobs, 1);
+    occupied = nan(nJobs, 1);
+    empty = nan(nJobs, 1);
+    occupancyRate = nan(nJobs, 1);
+    slotTables = cell(nJobs, 1);
+    for k = 1:nJobs
+        output = outputs{k};
+        if isempty(output)
+            continue;
+        end
+        if ~output.ok
+            state{k} = 'failed';
+            message{k} = output.message;
+            continue;
+        end
+
+        elapsed(k) = output.elapsed;
+        occupied(k) = output.summary.occupied;
+        empty(k) = output.summary.empty;
+        occupancyRate(k) = output.summary.occupancyRate;
+
+        T = slotResultsTable(output.results);
+        nSlots = height(T);
+        lot = repmat(jobs.lot(k), nSlots, 1);
+        image = repmat(jobs.image(k), nSlots, 1);
+        slotTables{k} = [table(lot, image), T];
+    end
+
+    resultsTable = vertcat(slotTables{:});
+    if isempty(resultsTable)
+        resultsTable = table(cell(0,1), cell(0,1), zeros(0,1), cell(0,1), zeros(0,1), ...
+            'VariableNames', {'lot', 'image', 'slotID', 'status', 'density'});
+    end
+
+    lot = jobs.lot;
+    image = jobs.image;
+    jobTable = table(lot, image, state, elapsed, occupied, empty, occupancyRate, message);
+
+    stats.jobs = nJobs;
+    stats.workers = nWorkers;
+    stats.totalTime = totalTime;
+    stats.jobsPerSecond = nJobs / max(totalTime, eps);
+
+    if strlength(opts.OutputFile) > 0
+        writetable(resultsTable, opts.OutputFile);
+    end
+
+    if opts.Verbose
+        fprintf('Ran %d jobs on %d workers in %.2f s: %.2f jobs/sec (%d failed, %d timed out)\n', ...
+            nJobs, nWorkers, totalTime, stats.jobsPerSecond, ...
+            nnz(strcmp(state, 'failed')), nnz(strcmp(state, 'timeout')));
+    end
+end
+
+function output = runParkingJob(image, slotsFile, threshold, preprocess, lot, cacheFolder)
+    % Runs on a worker; errors are returned rather than thrown so one bad
+    % lot does not stop the others
+    output = struct('ok', true, 'message', '', 'results', [], 'summary', [], 'elapsed', NaN);
+    try
+        [slots, rotation] = loadSlots(slotsFile);
+        if any(rotation ~= 0)
+            % Rotated bays are scored through masks compiled for the frame
+            % size, which only the full-resolution pipeline supports
+            imageInfo = imfinfo(image);
+            slots = compileSlotMasks(slots, [imageInfo(1).Height imageInfo(1).Width], ...
+                'Rotation', rotation);
+            preprocess = 'full';
+        end
+        [output.results, output.summary, info] = detectParkingSlots(image, slots, ...
+            'Threshold', threshold, 'Preprocess', preprocess, 'Lot', lot, ...
+            'Cache', cacheFolder);
+        output.elapsed = info.elapsed;
+    catch ME
+        output.ok = false;
+        output.message = ME.message;
+    end
+end
+
+function jobs = expandManifest(manifest)
+    % One row per image with char image/slots/lot, numeric threshold and
+    % the reason a row cannot run ('' if it can); string() first so
+    % numeric lot names and empty manifests convert too
+    if ~istable(manifest)
+        manifest = readtable(manifest, 'TextType', 'char', 'Delimiter', ',');
+    end
+
+    names = manifest.Properties.VariableNames;
+    image = cellstr(string(manifest.image));
+    slots = cellstr(string(manifest.slots));
+    threshold = repmat(0.07, height(manifest), 1);
+    if ismember('threshold', names)
+        % Blank cells (NaN or empty text) keep the default
+        text = strtrim(string(manifest.threshold));
+        given = ~(ismissing(text) | text == "" | strcmpi(text, "NaN"));
+        threshold(given) = str2double(text(given));
+        bad = find(given & ~isfinite(threshold), 1);
+        if ~isempty(bad)
+            error('runParkingJobs:threshold', ...
+                'Manifest row %d has threshold "%s", which is not a finite number.', bad, text(bad));
+        end
+    end
+    if ismember('lot', names)
+        lot = cellstr(string(manifest.lot));
+    else
+        [~, lot] = cellfun(@fileparts, slots, 'UniformOutput', false);
+    end
+
+    % The empty first table keeps the variables when there are no jobs
+    rows = cell(height(manifest) + 1, 1);
+    variables = {'lot', 'image', 'slots', 'threshold', 'problem'};
+    rows{1} = table(cell(0,1), cell(0,1), cell(0,1), zeros(0,1), cell(0,1), ...
+        'VariableNames', variables);
+    for k = 1:height(manifest)
+        problem = {''};
+        if isfolder(image{k})
+            frames = listFrameFiles(image{k});
+            if isempty(frames)
+                frames = image(k);
+                problem = {sprintf('No .jpg, .jpeg or .png frames in %s', image{k})};
+            end
+        else
+            frames = image(k);
+        end
+        nFrames = numel(frames);
+        rows{k+1} = table(repmat(lot(k), nFrames, 1), frames(:), repmat(slots(k), nFrames, 1), ...
+            repmat(threshold(k), nFrames, 1), repmat(problem, nFrames, 1), 'VariableNames', variables);
+    end
+    jobs = vertcat(rows{:});
+end
+
+function tf = canUseParallelPool()
+    tf = license('test', 'Distrib_Computing_Toolbox') && ~isempty(ver('parallel'));
+end
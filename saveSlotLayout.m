@@ -0,0 +1,77 @@
+function saveSlotLayout(file, slots, opts)
+%SAVESLOTLAYOUT Write slots to a binary slot layout file.
+%   SAVESLOTLAYOUT(FILE, SLOTS) writes the N-by-4 [x y width height] slot
+%   matrix SLOTS to FILE (by convention with the .pslot extension) in the
+%   compact layout format read by readSlotLayout and loadSlots.
+%
+%   The file is a little-endian 24-byte header followed by the lot ID and
+%   three column-major arrays written back to back. The lot ID padding
+%   puts the rectangles on an 8-byte boundary, and each array then starts
+%   on a multiple of its own element size, so all three can be
+%   memory-mapped in place:
+%     bytes 0-3    'PSLT'
+%     bytes 4-5    uint16 format version (1)
+%     bytes 6-7    uint16 lot ID length in bytes (UTF-8)
+%     bytes 8-11   uint32 number of slots N
+%     bytes 12-19  uint32 image height and width (0 when unknown)
+%     bytes 20-23  reserved
+%     lot ID, zero-padded to a multiple of 8 bytes
+%     double N-by-4  slot rectangles
+%     single N-by-1  slot rotation in degrees, clockwise as displayed
+%     uint32 N-by-1  slot IDs
+%
+%   Name-value options:
+%     'LotID'      Lot identifier (default '')
+%     'ImageSize'  Size of the lot image the slots were drawn on
+%                  (default [0 0], unknown)
+%     'SlotIDs'    Slot IDs (default 1:N)
+%     'Rotation'   Slot rotation about its center in degrees, as the
+%                  RotationAngle of drawrectangle (default 0 for every
+%                  slot; see compileSlotMasks)
+%
+%   Example:
+%     saveSlotLayout('north.pslot', slots, 'LotID', 'north', ...
+%         'ImageSize', size(img, [1 2]));
+%
+%   See also readSlotLayout, loadSlots, buildSlotIndex.
+
+    arguments
+        file {mustBeTextScalar}
+        slots (:,4) double
+        opts.LotID {mustBeTextScalar} = ''
+        opts.ImageSize (1,2) double {mustBeNonnegative, mustBeInteger} = [0 0]
+        opts.SlotIDs (:,1) double {mustBeNonnegative, mustBeInteger} = []
+        opts.Rotation (:,1) double = []
+    end
+
+    nSlots = size(slots, 1);
+    if isempty(opts.SlotIDs)
+        opts.SlotIDs = (1:nSlots)';
+    end
+    if isempty(opts.Rotation)
+        opts.Rotation = zeros(nSlots, 1);
+    end
+    if numel(opts.SlotIDs) ~= nSlots || numel(opts.Rotation) ~= nSlots
+        error('saveSlotLayout:size', 'SlotIDs and Rotation must have one value per slot.');
+    end
+
+    lotID = unicode2native(char(opts.LotID), 'UTF-8');
+    lotBytes = ceil(numel(lotID) / 8) * 8;
+
+    fid = fopen(file, 'w', 'ieee-le');
+    if fid < 0
+        error('saveSlotLayout:open', 'Cannot open %s for writing.', file);
+    end
+    cleanup = onCleanup(@() fclose(fid));
+
+    % --- Header ---
+    fwrite(fid, 'PSLT', 'char');
+    fwrite(fid, [1 numel(lotID)], 'uint16');
+    fwrite(fid, [nSlots opts.ImageSize 0], 'uint32');
+    fwrite(fid, [lotID, zeros(1, lotBytes - numel(lotID), 'uint8')], 'uint8');
+
+    % --- Slot Arrays ---
+    fwrite(fid, slots, 'double');
+    fwrite(fid, opts.Rotation, 'single');
+    fwrite(fid, opts.SlotIDs, 'uint32');
+end
@@ -0,0 +1,16 @@
+function density = slotEdgeDensity(morphImage, slots)
+%SLOTEDGEDENSITY Fraction of edge pixels inside each parking slot.
+%   DENSITY = SLOTEDGEDENSITY(MORPHIMAGE, SLOTS) returns an N-by-1 vector
+%   with the number of true pixels of MORPHIMAGE inside each row of the
+%   N-by-4 [x y width height] matrix SLOTS, divided by width*height.
+%
+%   The pixels of a slot are exactly those imcrop(MORPHIMAGE, rect) would
+%   return, but all slots are scored at once from a single summed-area
+%   table (see slotPixelSums).
+%
+%   See also detectParkingSlots, classifySlots, slotPixelSums.
+
+    white_pixels = slotPixelSums(morphImage, slots);
+    slot_area = slots(:,3) .* slots(:,4);
+    density = white_pixels ./ slot_area;
+end
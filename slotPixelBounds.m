@@ -0,0 +1,25 @@
+function [bounds, valid] = slotPixelBounds(slots, imageSize)
+%SLOTPIXELBOUNDS Pixel rows and columns covered by each slot rectangle.
+%   [BOUNDS, VALID] = SLOTPIXELBOUNDS(SLOTS, IMAGESIZE) converts the
+%   N-by-4 [x y width height] rectangles in SLOTS into the inclusive pixel
+%   ranges [r1 r2 c1 c2] that imcrop extracts from an image of size
+%   IMAGESIZE: r1 = round(y), r2 = round(y + height), c1 = round(x) and
+%   c2 = round(x + width), clipped to the image. VALID is false for slots
+%   that fall completely outside the image (imcrop returns []); their
+%   BOUNDS rows are set to [1 0 1 0].
+%
+%   See also slotEdgeDensity, imcrop.
+
+    m = imageSize(1);
+    n = imageSize(2);
+
+    r1 = round(slots(:,2));
+    r2 = round(slots(:,2) + slots(:,4));
+    c1 = round(slots(:,1));
+    c2 = round(slots(:,1) + slots(:,3));
+
+    valid = ~(r1 > m | r2 < 1 | c1 > n | c2 < 1);
+
+    bounds = [max(r1, 1), min(r2, m), max(c1, 1), min(c2, n)];
+    bounds(~valid,:) = repmat([1 0 1 0], nnz(~valid), 1);
+end
@@ -0,0 +1,17 @@
+function [sums, pixelCounts] = slotPixelSums(image, slots)
+%SLOTPIXELSUMS Sum of image values inside each parking slot.
+%   [SUMS, PIXELCOUNTS] = SLOTPIXELSUMS(IMAGE, SLOTS) adds up the values
+%   of the 2-D IMAGE inside each row of the N-by-4 [x y width height]
+%   matrix SLOTS and returns them as an N-by-1 vector, together with the
+%   number of pixels summed. The pixels of a slot are exactly those
+%   imcrop(IMAGE, rect) would return (see slotPixelBounds).
+%
+%   All slots are scored at once from a single summed-area table, so
+%   each slot costs four lookups regardless of its size.
+%
+%   See also slotEdgeDensity, slotPixelBounds, boundsPixelSums.
+
+    bounds = slotPixelBounds(slots, size(image));
+    sums = boundsPixelSums(image, bounds);
+    pixelCounts = (bounds(:,2) - bounds(:,1) + 1) .* (bounds(:,4) - bounds(:,3) + 1);
+end
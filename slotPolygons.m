@@ -0,0 +1,29 @@
+function polygons = slotPolygons(slots, rotation)
+%SLOTPOLYGONS Corner vertices of rotated slot rectangles.
+%   POLYGONS = SLOTPOLYGONS(SLOTS, ROTATION) returns an N-by-1 cell array
+%   with the 4-by-2 [x y] corners of each row of the N-by-4
+%   [x y width height] matrix SLOTS, turned about its center by ROTATION
+%   degrees, clockwise as displayed, like the RotationAngle of
+%   drawrectangle. The corners run top-left, top-right, bottom-right,
+%   bottom-left before rotation.
+%
+%   See also compileSlotMasks, drawrectangle.
+
+    arguments
+        slots (:,4) double
+        rotation (:,1) double = zeros(size(slots, 1), 1)
+    end
+
+    cx = slots(:,1) + slots(:,3) / 2;
+    cy = slots(:,2) + slots(:,4) / 2;
+    dx = slots(:,3) / 2 .* [-1 1 1 -1];
+    dy = slots(:,4) / 2 .* [-1 -1 1 1];
+
+    % With y pointing down this rotation is clockwise on screen
+    c = cosd(rotation);
+    s = sind(rotation);
+    x = cx + dx .* c - dy .* s;
+    y = cy + dx .* s + dy .* c;
+
+    polygons = arrayfun(@(i) [x(i,:)' y(i,:)'], (1:size(slots, 1))', 'UniformOutput', false);
+end
@@ -0,0 +1,13 @@
+function T = slotResultsTable(results)
+%SLOTRESULTSTABLE Per-slot results as a table.
+%   T = SLOTRESULTSTABLE(RESULTS) turns the classifySlots RESULTS into a
+%   table with variables slotID, status ('Occupied' or 'Empty') and
+%   density, as shown in the ParkingDetectorPro results table.
+%
+%   See also classifySlots, slotStatusNames.
+
+    slotID = (1:numel(results.density))';
+    status = slotStatusNames(results.status);
+    density = results.density;
+    T = table(slotID, status, density);
+end
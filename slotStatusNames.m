@@ -0,0 +1,11 @@
+function names = slotStatusNames(status)
+%SLOTSTATUSNAMES Status names of slot status codes.
+%   NAMES = SLOTSTATUSNAMES(STATUS) returns a cell array the size of
+%   STATUS with 'Occupied' where STATUS is 1 and 'Empty' where it is 0.
+%
+%   See also classifySlots, slotResultsTable.
+
+    labels = {'Empty', 'Occupied'};
+    names = labels(double(status) + 1);
+    names = reshape(names, size(status));
+end
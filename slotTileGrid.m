@@ -0,0 +1,47 @@
+function tiles = slotTileGrid(imageSize, slots, tileSize, opts)
+%SLOTTILEGRID Square tiles of an image and the slots that overlap them.
+%   TILES = SLOTTILEGRID(IMAGESIZE, SLOTS, TILESIZE) cuts an image of
+%   size IMAGESIZE into TILESIZE-by-TILESIZE tiles (smaller at the right
+%   and bottom edges) and returns the tiles that contain at least one
+%   pixel of a slot in the N-by-4 [x y width height] matrix SLOTS.
+%
+%   TILES is a struct array with fields rows and cols, the inclusive
+%   [first last] pixel range of the tile, and slotIdx, the indices of the
+%   slots whose pixels (see slotPixelBounds) overlap the tile.
+%
+%   TILES = SLOTTILEGRID(..., 'AllTiles', true) also returns the tiles
+%   that contain no slot.
+%
+%   See also roiSlotDensity, slotPixelBounds, buildSlotIndex.
+
+    arguments
+        imageSize (1,:) double
+        slots (:,4) double
+        tileSize (1,1) double {mustBePositive, mustBeInteger}
+        opts.AllTiles (1,1) logical = false
+    end
+
+    m = imageSize(1);
+    n = imageSize(2);
+
+    % --- Assign Slots to the Tiles They Overlap ---
+    % A grid index with tile-sized cells lists the slots of every tile
+    index = buildSlotIndex(slots, [m n], tileSize);
+    counts = diff(index.cellStart);
+
+    % --- Collect Tiles ---
+    if opts.AllTiles
+        keep = true(index.gridSize);
+    else
+        keep = reshape(counts > 0, index.gridSize);
+    end
+    [a, b] = find(keep);
+    cells = sub2ind(index.gridSize, a, b);
+
+    tiles = repmat(struct('rows', [], 'cols', [], 'slotIdx', []), numel(a), 1);
+    for k = 1:numel(a)
+        tiles(k).rows = [(a(k) - 1) * tileSize + 1, min(a(k) * tileSize, m)];
+        tiles(k).cols = [(b(k) - 1) * tileSize + 1, min(b(k) * tileSize, n)];
+        tiles(k).slotIdx = index.cellSlots(index.cellStart(cells(k)) : index.cellStart(cells(k) + 1) - 1);
+    end
+end
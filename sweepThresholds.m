@@ -0,0 +1,64 @@
+function curves = sweepThresholds(density, occupied, thresholds)
+%SWEEPTHRESHOLDS Classification quality of many thresholds at once.
+%   CURVES = SWEEPTHRESHOLDS(DENSITY, OCCUPIED) scores every candidate
+%   threshold in linspace(0, 0.2, 401), the range of the app's threshold
+%   slider, against the ground truth OCCUPIED. DENSITY and OCCUPIED are
+%   arrays of the same size, typically N slots by F frames; a slot counts
+%   as predicted Occupied when its density is above the threshold, as in
+%   classifySlots. Entries where OCCUPIED or DENSITY is NaN are ignored,
+%   so partially labelled frames can be used.
+%
+%   CURVES = SWEEPTHRESHOLDS(DENSITY, OCCUPIED, THRESHOLDS) uses the given
+%   candidate thresholds.
+%
+%   CURVES is a table with one row per threshold and the variables
+%   threshold, tp, fp, tn, fn, accuracy, precision, recall and f1.
+%   Precision is NaN for thresholds that predict no Occupied slot.
+%
+%   The densities and thresholds are sorted together once, so each
+%   threshold's counts come from a cumulative sum rather than from
+%   comparing it with every density: the sweep costs O((D + T) log(D + T))
+%   for D densities and T thresholds.
+%
+%   See also calibrateThreshold, classifySlots.
+
+    arguments
+        density double
+        occupied
+        thresholds (1,:) double = linspace(0, 0.2, 401)
+    end
+
+    if ~isequal(size(density), size(occupied))
+        error('sweepThresholds:size', 'DENSITY and OCCUPIED must have the same size.');
+    end
+
+    labelled = ~isnan(double(occupied)) & ~isnan(density);
+    d = density(labelled);
+    y = logical(occupied(labelled));
+    threshold = thresholds(:);
+
+    nPos = nnz(y);
+    nNeg = numel(y) - nPos;
+    tp = nPos - countAtMost(d(y), threshold);
+    fp = nNeg - countAtMost(d(~y), threshold);
+    fn = nPos - tp;
+    tn = nNeg - fp;
+
+    accuracy = (tp + tn) / max(numel(y), 1);
+    precision = tp ./ (tp + fp);
+    recall = tp / max(nPos, 1);
+    f1 = 2 * tp ./ max(2 * tp + fp + fn, 1);
+
+    curves = table(threshold, tp, fp, tn, fn, accuracy, precision, recall, f1);
+end
+
+function count = countAtMost(values, thresholds)
+    % Number of VALUES <= each threshold. The stable sort keeps a value
+    % ahead of an equal threshold, so it is counted.
+    nValues = numel(values);
+    [~, order] = sort([values(:); thresholds]);
+    isValue = order <= nValues;
+    atMost = cumsum(isValue);
+    count = zeros(numel(thresholds), 1);
+    count(order(~isValue) - nValues) = atMost(~isValue);
+end
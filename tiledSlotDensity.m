@@ -0,0 +1,140 @@
+function [density, info] = tiledSlotDensity(source, slots, opts)
+%TILEDSLOTDENSITY Slot edge density of very large images, tile by tile.
+%   DENSITY = TILEDSLOTDENSITY(SOURCE, SLOTS) computes the same per-slot
+%   edge density as slotEdgeDensity for the image SOURCE without ever
+%   holding a full-size grayscale, gradient or edge map. SOURCE is an
+%   image array or an image file name. TIFF and JPEG 2000 files
+%   (.tif, .tiff, .jp2, .j2c, .j2k) are read one tile at a time with
+%   imread's 'PixelRegion', so peak memory is bounded by the tile size
+%   times the number of workers; other formats are read whole first.
+%
+%   The image is processed in two passes over TileSize-by-TileSize tiles
+%   padded by a halo:
+%     1. The Canny gradient magnitude of every tile core is computed and
+%        its maximum taken, giving the same global scale edge() would
+%        use on the whole image (skipped if 'GradientMax' is given).
+%     2. Canny, with thresholds relative to that scale, and closing run
+%        on the tiles that overlap a slot, and the edge pixels of each
+%        slot are summed over the tile cores.
+%   Both passes run in parallel with parfor when 'UseParallel' is true.
+%
+%   [DENSITY, INFO] = TILEDSLOTDENSITY(...) also returns INFO with the
+%   image size, the gradient scale and the number of tiles in each pass.
+%
+%   Name-value options:
+%     'CannyThreshold'  Canny [low high] thresholds (default [0.1 0.2])
+%     'StrelSize'       Closing rectangle size (default [3 3])
+%     'TileSize'        Tile side in pixels (default 1024)
+%     'Halo'            Padding in pixels around each tile (default 16)
+%     'UseParallel'     Spread the tiles over the current parallel pool
+%                       (default false). A process pool suits file
+%                       sources; for in-memory arrays use a thread pool,
+%                       parpool('Threads'), so the image is not copied
+%                       to every worker.
+%     'GradientMax'     Known Canny gradient scale, skips pass 1
+%                       (default [])
+%
+%   As with roiSlotDensity, the only difference from the untiled run is
+%   a Canny hysteresis chain that reaches beyond the halo.
+%
+%   Example:
+%     density = tiledSlotDensity('orthomosaic.tif', slots, 'UseParallel', true);
+%
+%   See also roiSlotDensity, detectParkingSlots, cannyGradientMax.
+
+    arguments
+        source
+        slots (:,4) double
+        opts.CannyThreshold (1,2) double = [0.1 0.2]
+        opts.StrelSize (1,2) double = [3 3]
+        opts.TileSize (1,1) double {mustBePositive, mustBeInteger} = 1024
+        opts.Halo (1,1) double {mustBeNonnegative, mustBeInteger} = 16
+        opts.UseParallel (1,1) logical = false
+        opts.GradientMax double = []
+    end
+
+    [readRegion, imageSize] = regionReader(source);
+    m = imageSize(1);
+    n = imageSize(2);
+
+    % parfor runs as a plain loop when no workers are requested
+    if opts.UseParallel
+        nWorkers = Inf;
+    else
+        nWorkers = 0;
+    end
+    halo = opts.Halo;
+    cannyThreshold = opts.CannyThreshold;
+    se = strel('rectangle', opts.StrelSize);
+
+    % --- Pass 1: Global Canny Gradient Scale ---
+    gradientMax = opts.GradientMax;
+    nGradientTiles = 0;
+    if isempty(gradientMax)
+        allTiles = slotTileGrid([m n], slots, opts.TileSize, 'AllTiles', true);
+        nGradientTiles = numel(allTiles);
+        tileMax = zeros(nGradientTiles, 1);
+        parfor (t = 1:nGradientTiles, nWorkers)
+            [crop, coreRows, coreCols] = haloCrop(readRegion, allTiles(t), halo, [m n]);
+            [~, magnitude] = cannyGradientMax(crop);
+            tileMax(t) = max(magnitude(coreRows, coreCols), [], 'all');
+        end
+        gradientMax = double(max(tileMax));
+    end
+
+    % --- Pass 2: Edges and Slot Counts on the Tiles Covering the Slots ---
+    bounds = slotPixelBounds(slots, [m n]);
+    tiles = slotTileGrid([m n], slots, opts.TileSize);
+    tileCounts = cell(numel(tiles), 1);
+    parfor (t = 1:numel(tiles), nWorkers)
+        tile = tiles(t);
+        [crop, coreRows, coreCols] = haloCrop(readRegion, tile, halo, [m n]);
+        tileCounts{t} = tileEdgeCounts(crop, coreRows, coreCols, ...
+            tileLocalBounds(bounds, tile), cannyThreshold, gradientMax, se);
+    end
+
+    % --- Stitch Per-Slot Counts ---
+    white_pixels = zeros(size(slots, 1), 1);
+    for t = 1:numel(tiles)
+        white_pixels(tiles(t).slotIdx) = white_pixels(tiles(t).slotIdx) + tileCounts{t};
+    end
+
+    slot_area = slots(:,3) .* slots(:,4);
+    density = white_pixels ./ slot_area;
+
+    info.imageSize = imageSize;
+    info.gradientMax = gradientMax;
+    info.gradientTiles = nGradientTiles;
+    info.slotTiles = numel(tiles);
+end
+
+function [readRegion, imageSize] = regionReader(source)
+    % Function handle reading the [r1 r2], [c1 c2] region of the image
+    if ischar(source) || isStringScalar(source)
+        [~, ~, ext] = fileparts(source);
+        if any(strcmpi(ext, {'.tif', '.tiff', '.jp2', '.j2c', '.j2k'}))
+            imageInfo = imfinfo(source);
+            imageSize = [imageInfo(1).Height imageInfo(1).Width];
+            file = char(source);
+            readRegion = @(rows, cols) imread(file, 'PixelRegion', {rows, cols});
+            return;
+        end
+        source = imread(source);
+    end
+    imageSize = [size(source, 1) size(source, 2)];
+    readRegion = @(rows, cols) source(rows(1):rows(2), cols(1):cols(2), :);
+end
+
+function [crop, coreRows, coreCols] = haloCrop(readRegion, tile, halo, imageSize)
+    % Grayscale tile padded by the halo, and the core's place inside it
+    rows = [max(tile.rows(1) - halo, 1), min(tile.rows(2) + halo, imageSize(1))];
+    cols = [max(tile.cols(1) - halo, 1), min(tile.cols(2) + halo, imageSize(2))];
+
+    crop = readRegion(rows, cols);
+    if size(crop, 3) == 3
+        crop = rgb2gray(crop);
+    end
+
+    coreRows = (tile.rows(1):tile.rows(2)) - rows(1) + 1;
+    coreCols = (tile.cols(1):tile.cols(2)) - cols(1) + 1;
+end